@@ -0,0 +1,93 @@
+"""
+Extraction Benchmark
+Compares cold-load time of the layout-driven extractor with the legacy
+read-everything path (pd.read_excel on 'Table 3', then discard the frame)
+Run with: python benchmark_extraction.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+import statistics
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EXCEL_FILE = os.path.join(HERE, "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx")
+
+# Each snippet runs in a fresh interpreter so import and parse costs are both counted
+LEGACY_SNIPPET = """
+import time
+start = time.perf_counter()
+import pandas as pd
+df = pd.read_excel({path!r}, sheet_name='Table 3', header=None)
+print(time.perf_counter() - start)
+"""
+
+LAYOUT_SNIPPET = """
+import time
+start = time.perf_counter()
+from data_extractor import FinancialDataExtractor
+FinancialDataExtractor({path!r}).extract_all_data()
+print(time.perf_counter() - start)
+"""
+
+
+def time_cold(snippet: str, runs: int) -> list:
+    """Run a snippet in `runs` fresh interpreters and collect the elapsed seconds"""
+    code = snippet.format(path=EXCEL_FILE)
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def time_warm(func, runs: int) -> list:
+    """Time repeated in-process calls after one warm-up (the per-upload cost)"""
+    func()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, timings: list) -> float:
+    """Print summary statistics for one variant and return its median"""
+    median = statistics.median(timings)
+    print(f"  {label:<32} median {median * 1000:8.1f} ms | "
+          f"min {min(timings) * 1000:8.1f} ms | max {max(timings) * 1000:8.1f} ms")
+    return median
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("=" * 80)
+    print(f"COLD-LOAD EXTRACTION BENCHMARK ({runs} fresh interpreters per variant)")
+    print("=" * 80)
+
+    legacy = report("pd.read_excel (legacy path)", time_cold(LEGACY_SNIPPET, runs))
+    layout = report("layout-driven extractor", time_cold(LAYOUT_SNIPPET, runs))
+
+    print("-" * 80)
+    print(f"  Speed-up: {legacy / layout:.2f}x")
+
+    print("\n" + "=" * 80)
+    print(f"WARM IN-PROCESS PARSE ({runs * 4} calls per variant)")
+    print("=" * 80)
+
+    import pandas as pd
+    from data_extractor import FinancialDataExtractor
+
+    legacy = report("pd.read_excel (legacy path)", time_warm(
+        lambda: pd.read_excel(EXCEL_FILE, sheet_name='Table 3', header=None), runs * 4))
+    layout = report("streaming range reader", time_warm(
+        lambda: FinancialDataExtractor(EXCEL_FILE).extract_all_data(), runs * 4))
+
+    print("-" * 80)
+    print(f"  Speed-up: {legacy / layout:.2f}x")
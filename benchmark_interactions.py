@@ -0,0 +1,185 @@
+"""
+Interaction Benchmark
+Per-interaction rerun latency of the dashboard on a headless Streamlit
+server, driven over its websocket protocol the way the browser drives it.
+Each interaction is timed twice: as a full-script rerun (how every widget
+change ran before the controls were scoped to fragments) and as the
+fragment rerun the browser sends for a widget inside an @st.fragment.
+Needs the websockets package (12+).
+Run with: python benchmark_interactions.py [runs] [app path]
+"""
+
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+from websockets.sync.client import connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(HERE, "financial_dashboard.py")
+
+# (name, widget label, the two values alternated between runs)
+INTERACTIONS = (
+    ("What-if slider", "Raw material cost change (%)", (10.0, 20.0)),
+    ("Show Forecasts toggle", "Show Forecasts", (False, True)),
+    ("Show AI Narratives toggle", "Show AI Narratives", (False, True)),
+    ("Section switch", "Section", (1, 0)),
+    ("Primary Year", "Primary Year", (-2, -1))
+)
+
+SERVER_START_TIMEOUT = 120
+
+# Seconds to wait for any one rerun to finish
+RUN_TIMEOUT = 60
+
+
+class Widget:
+    """A widget seen in the app's output: its element proto and enclosing fragment"""
+
+    def __init__(self, kind: str, element, fragment_id: str):
+        self.kind = kind
+        self.element = element
+        self.fragment_id = fragment_id
+
+    def state(self, value) -> WidgetState:
+        """Widget state the browser would send for a new value (option positions for pickers)"""
+        state = WidgetState(id=self.element.id)
+        if self.kind == 'slider':
+            state.double_array_value.data.append(float(value))
+        elif self.kind == 'checkbox':
+            state.bool_value = bool(value)
+        elif 'raw_value' in self.element.DESCRIPTOR.fields_by_name:
+            # Newer servers take the formatted option itself
+            state.string_value = self.element.options[value]
+        else:
+            state.int_value = value % len(self.element.options)
+        return state
+
+
+class DashboardSession:
+    """One browser session against a running server"""
+
+    def __init__(self, websocket):
+        self.socket = websocket
+        self.widgets: Dict[str, Widget] = {}
+        self.states: Dict[str, WidgetState] = {}
+        self.errors: List[str] = []
+
+    def rerun(self, fragment_id: str = '') -> Tuple[float, str]:
+        """Send one rerun and wait for its script_finished; returns (seconds, finish status)"""
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        message.rerun_script.widget_states.widgets.extend(self.states.values())
+        message.rerun_script.fragment_id = fragment_id
+        start = time.perf_counter()
+        self.socket.send(message.SerializeToString())
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(self.socket.recv(timeout=RUN_TIMEOUT))
+            kind = reply.WhichOneof('type')
+            if kind == 'delta' and reply.delta.WhichOneof('type') == 'new_element':
+                self._record(reply.delta.new_element, reply.delta.fragment_id)
+            elif kind == 'script_finished':
+                status = ForwardMsg.ScriptFinishedStatus.Name(reply.script_finished)
+                if status != 'FINISHED_EARLY_FOR_RERUN':
+                    return time.perf_counter() - start, status
+
+    def _record(self, element, fragment_id: str) -> None:
+        kind = element.WhichOneof('type')
+        if kind == 'exception':
+            self.errors.append(element.exception.message)
+        elif kind in ('slider', 'checkbox', 'radio', 'selectbox'):
+            # Like the browser, keep the latest sighting: a nested fragment gets a new
+            # id whenever its parent reruns, and the server drops reruns of stale ids
+            widget = getattr(element, kind)
+            self.widgets[widget.label] = Widget(kind, widget, fragment_id)
+
+    def interact(self, label: str, value, scoped: bool) -> Tuple[float, str]:
+        """Change one widget and rerun the script, or only its fragment when `scoped`"""
+        widget = self.widgets[label]
+        state = widget.state(value)
+        self.states[state.id] = state
+        return self.rerun(widget.fragment_id if scoped else '')
+
+
+def start_server(app: str) -> Tuple[subprocess.Popen, int]:
+    """Launch a headless server for the app on a free port and wait until it is healthy"""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app, "--server.headless", "true",
+         "--server.port", str(port), "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        cwd=os.path.dirname(os.path.abspath(app)), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + SERVER_START_TIMEOUT
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server, port
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"Streamlit did not start within {SERVER_START_TIMEOUT}s")
+
+
+def measure(session: DashboardSession, label: str, values: tuple, scoped: bool,
+            runs: int) -> Optional[List[float]]:
+    """Median-ready timings for one interaction, alternating between its two values"""
+    widget = session.widgets.get(label)
+    if widget is None or (scoped and not widget.fragment_id):
+        return None
+    timings = []
+    for run in range(runs + 1):
+        elapsed, status = session.interact(label, values[run % 2], scoped)
+        if status not in ('FINISHED_SUCCESSFULLY', 'FINISHED_FRAGMENT_RUN_SUCCESSFULLY'):
+            raise RuntimeError(f"{label}: run finished with {status}")
+        # The first run warms the caches for the new value
+        if run:
+            timings.append(elapsed)
+    return timings
+
+
+if __name__ == "__main__":
+    import streamlit
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    app = sys.argv[2] if len(sys.argv) > 2 else APP
+
+    server, port = start_server(app)
+    try:
+        with connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_size=None) as websocket:
+            session = DashboardSession(websocket)
+            cold, _ = session.rerun()
+
+            print("=" * 80)
+            print(f"PER-INTERACTION LATENCY (Streamlit {streamlit.__version__}, median of {runs} runs)")
+            print("=" * 80)
+            print(f"  First page load: {cold * 1000:.0f} ms")
+            print(f"  {'Interaction':<28}{'full rerun':>14}{'fragment rerun':>18}{'speed-up':>12}")
+            for name, label, values in INTERACTIONS:
+                full = measure(session, label, values, False, runs)
+                scoped = measure(session, label, values, True, runs)
+                if full is None:
+                    print(f"  {name:<28}{'(not found)':>14}")
+                    continue
+                full_ms = statistics.median(full) * 1000
+                if scoped is None:
+                    print(f"  {name:<28}{full_ms:>11.1f} ms{'(not in a fragment)':>24}")
+                    continue
+                scoped_ms = statistics.median(scoped) * 1000
+                print(f"  {name:<28}{full_ms:>11.1f} ms{scoped_ms:>15.1f} ms{full_ms / scoped_ms:>11.1f}x")
+            print("-" * 80)
+            print(f"  Script errors: {session.errors or 'none'}")
+    finally:
+        server.terminate()
+        server.wait()
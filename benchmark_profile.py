@@ -0,0 +1,197 @@
+"""
+Benchmark Profiles
+Compiled ratio grading thresholds and health-score benchmarks, per sector
+"""
+
+import numpy as np
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+# Grade labels and colors, indexed by grade code (0 = A ... 4 = F, 5 = N/A)
+GRADES = ('A', 'B', 'C', 'D', 'F', 'N/A')
+GRADE_COLORS = {
+    'A': '#28A745',  # Green
+    'B': '#5CB85C',  # Light Green
+    'C': '#FFC107',  # Yellow
+    'D': '#FF8C00',  # Orange
+    'F': '#DC3545',  # Red
+    'N/A': '#6C757D'  # Gray
+}
+NA_CODE = GRADES.index('N/A')
+
+_GRADE_LABELS = np.array(GRADES, dtype=object)
+_COLOR_LABELS = np.array([GRADE_COLORS[g] for g in GRADES], dtype=object)
+_GRADE_CODES = MappingProxyType({g: i for i, g in enumerate(GRADES)})
+
+
+class BenchmarkProfile:
+    """
+    Immutable, precompiled set of benchmarks for one sector
+
+    Each graded ratio's A-D thresholds are stored as one sorted edge array,
+    so grading any array of values is a single np.searchsorted call.
+    """
+
+    def __init__(self, name: str,
+                 thresholds: Mapping[str, Mapping[str, float]],
+                 lower_is_better: Iterable[str] = (),
+                 health: Optional[Mapping[str, float]] = None):
+        self.name = name
+        self.lower_is_better = frozenset(lower_is_better)
+        self.thresholds = MappingProxyType({
+            ratio: MappingProxyType(dict(levels)) for ratio, levels in thresholds.items()
+        })
+        self.health = MappingProxyType(dict(health or {}))
+
+        # ratio -> (ascending edges, searchsorted side, grade code per bucket)
+        self._compiled: Dict[str, Tuple[np.ndarray, str, np.ndarray]] = {}
+        for ratio, levels in self.thresholds.items():
+            edges = np.array([levels[g] for g in 'ABCD'], dtype=np.float64)
+            if ratio in self.lower_is_better:
+                # value <= A -> A, ..., value > D -> F
+                if np.any(np.diff(edges) < 0):
+                    raise ValueError(f"{name}: {ratio} thresholds must rise from A to D")
+                self._compiled[ratio] = (edges, 'left', np.arange(5))
+            else:
+                # value >= A -> A, ..., value < D -> F
+                if np.any(np.diff(edges) > 0):
+                    raise ValueError(f"{name}: {ratio} thresholds must fall from A to D")
+                self._compiled[ratio] = (edges[::-1].copy(), 'right', np.arange(5)[::-1].copy())
+
+    def grade_codes(self, ratio_name: str, values) -> np.ndarray:
+        """Integer grade codes (index into GRADES) for an array of values; NaN -> N/A"""
+        values = np.asarray(values, dtype=np.float64)
+        if ratio_name not in self._compiled:
+            return np.full(values.shape, NA_CODE)
+        edges, side, codes = self._compiled[ratio_name]
+        graded = codes[np.searchsorted(edges, values, side=side)]
+        return np.where(np.isnan(values), NA_CODE, graded)
+
+    def grade(self, ratio_name: str, values) -> Union[str, np.ndarray]:
+        """A-F grade of a value, or an object array of grades for an array"""
+        codes = self.grade_codes(ratio_name, values)
+        return _GRADE_LABELS[codes] if codes.ndim else GRADES[int(codes)]
+
+    @staticmethod
+    def color(grades) -> Union[str, np.ndarray]:
+        """Hex color of a grade, or an object array of colors for an array of grades"""
+        if isinstance(grades, str):
+            return GRADE_COLORS.get(grades, GRADE_COLORS['N/A'])
+        codes = np.array([_GRADE_CODES.get(g, NA_CODE) for g in np.ravel(grades)], dtype=int)
+        return _COLOR_LABELS[codes].reshape(np.shape(grades))
+
+    def with_overrides(self, name: str,
+                       thresholds: Optional[Mapping[str, Mapping[str, float]]] = None,
+                       health: Optional[Mapping[str, float]] = None) -> 'BenchmarkProfile':
+        """New profile with some ratios' thresholds or health benchmarks replaced"""
+        merged = {ratio: dict(levels) for ratio, levels in self.thresholds.items()}
+        merged.update({ratio: dict(levels) for ratio, levels in (thresholds or {}).items()})
+        return BenchmarkProfile(name, merged, self.lower_is_better, {**self.health, **(health or {})})
+
+    def __repr__(self) -> str:
+        return f"BenchmarkProfile({self.name!r}, ratios={len(self.thresholds)})"
+
+
+# General industry benchmarks
+DEFAULT_PROFILE = BenchmarkProfile(
+    'general',
+    thresholds={
+        'current_ratio': {'A': 2.0, 'B': 1.5, 'C': 1.2, 'D': 1.0},
+        'quick_ratio': {'A': 1.5, 'B': 1.0, 'C': 0.8, 'D': 0.5},
+        'debt_to_equity': {'A': 0.3, 'B': 0.5, 'C': 0.8, 'D': 1.2},  # Lower is better
+        'times_interest_earned': {'A': 10, 'B': 5, 'C': 3, 'D': 2},
+        'gross_profit_margin': {'A': 30, 'B': 20, 'C': 15, 'D': 10},
+        'operating_profit_margin': {'A': 20, 'B': 15, 'C': 10, 'D': 5},
+        'net_profit_margin': {'A': 15, 'B': 10, 'C': 5, 'D': 2},
+        'return_on_assets': {'A': 15, 'B': 10, 'C': 5, 'D': 2},
+        'inventory_turnover': {'A': 6, 'B': 4, 'C': 2, 'D': 1},
+        'receivables_turnover': {'A': 12, 'B': 8, 'C': 5, 'D': 3},
+        'asset_turnover': {'A': 2, 'B': 1.5, 'C': 1.0, 'D': 0.5}
+    },
+    lower_is_better=('debt_to_equity', 'debt_ratio'),
+    health={
+        'current_ratio': 2.0,
+        'quick_ratio': 1.0,
+        'debt_to_equity': 0.5,
+        'times_interest_earned': 5.0,
+        'net_profit_margin': 15.0,
+        'return_on_assets': 10.0,
+        'asset_turnover': 1.5
+    }
+)
+
+# Electronics manufacturing services: thin margins, fast-moving working capital
+EMS_PROFILE = DEFAULT_PROFILE.with_overrides(
+    'ems',
+    thresholds={
+        'gross_profit_margin': {'A': 25, 'B': 18, 'C': 12, 'D': 8},
+        'operating_profit_margin': {'A': 12, 'B': 9, 'C': 6, 'D': 4},
+        'net_profit_margin': {'A': 8, 'B': 6, 'C': 4, 'D': 2},
+        'inventory_turnover': {'A': 5, 'B': 3.5, 'C': 2.5, 'D': 1.5}
+    },
+    health={'net_profit_margin': 8.0, 'return_on_assets': 8.0}
+)
+
+# Defense electronics: long contract cycles, advance-funded working capital
+DEFENSE_PROFILE = DEFAULT_PROFILE.with_overrides(
+    'defense',
+    thresholds={
+        'current_ratio': {'A': 1.5, 'B': 1.2, 'C': 1.0, 'D': 0.8},
+        'quick_ratio': {'A': 1.0, 'B': 0.8, 'C': 0.6, 'D': 0.4},
+        'inventory_turnover': {'A': 3, 'B': 2, 'C': 1.5, 'D': 1},
+        'receivables_turnover': {'A': 5, 'B': 3.5, 'C': 2.5, 'D': 1.5},
+        'asset_turnover': {'A': 1.0, 'B': 0.75, 'C': 0.5, 'D': 0.3}
+    },
+    health={'current_ratio': 1.5, 'quick_ratio': 0.8, 'asset_turnover': 0.75}
+)
+
+PROFILES = MappingProxyType({
+    profile.name: profile for profile in (DEFAULT_PROFILE, EMS_PROFILE, DEFENSE_PROFILE)
+})
+
+# Workbook sector labels -> profile
+SECTOR_PROFILES = MappingProxyType({
+    'Electronics Manufacturing': EMS_PROFILE,
+    'Defense Electronics': DEFENSE_PROFILE
+})
+
+
+def profile_for_sector(sector: Optional[str]) -> BenchmarkProfile:
+    """Precompiled profile for a company's sector, falling back to the general one"""
+    return SECTOR_PROFILES.get(sector, DEFAULT_PROFILE)
+
+
+def profiles_for_panel(panel: Any) -> Tuple[BenchmarkProfile, ...]:
+    """Sector profile of every company of a FinancialPanel, in company order"""
+    return tuple(profile_for_sector(panel.info[company].get('sector')) for company in panel.companies)
+
+
+def grade_by_company(ratio_name: str, values, profiles: Sequence[BenchmarkProfile]) -> np.ndarray:
+    """
+    Object array of grades for (..., company, year) values
+
+    Each company (second-to-last axis) is graded on its own profile, one
+    searchsorted call per distinct profile.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.full(values.shape, NA_CODE)
+    for profile in dict.fromkeys(profiles):
+        rows = np.array([p is profile for p in profiles])
+        codes[..., rows, :] = profile.grade_codes(ratio_name, values[..., rows, :])
+    return _GRADE_LABELS[codes]
+
+
+def ladder_grade(thresholds: Mapping[str, float], values, lower_is_better: bool = False) -> Union[str, np.ndarray]:
+    """
+    A-F grade from walking the A..D thresholds in order (first one met wins)
+
+    The uncompiled form of BenchmarkProfile.grade: it also accepts thresholds
+    that are not monotone, e.g. an ad-hoc dict passed to grade_ratio.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.full(values.shape, GRADES.index('F'))
+    for code in range(3, -1, -1):
+        edge = thresholds['ABCD'[code]]
+        codes = np.where(values <= edge if lower_is_better else values >= edge, code, codes)
+    codes = np.where(np.isnan(values), NA_CODE, codes)
+    return _GRADE_LABELS[codes] if codes.ndim else GRADES[int(codes)]
@@ -8,7 +8,13 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, List, Dict, Tuple, Optional
+from forecasting import Forecast, forecast, forecast_panel
 
 # Color scheme
 KAYNES_BLUE = '#007BFF'
@@ -18,10 +24,141 @@ DANGER_RED = '#DC3545'
 NEUTRAL_GRAY = '#6C757D'
 SUCCESS_GREEN = '#28A745'
 
+# Panel company key -> trace color
+COMPANY_COLORS = {'kaynes': KAYNES_BLUE, 'bel': BEL_GREEN}
+
+# Figures kept by the chart cache (a full dashboard run builds about 25)
+FIGURE_CACHE_SIZE = 256
+
+
+class _Unhashable(Exception):
+    """Raised for arguments the fingerprint does not know how to hash"""
+
+
+def _feed(hasher: Any, value: Any) -> None:
+    """Add one argument to a fingerprint: arrays by bytes, containers recursively"""
+    if value is None or isinstance(value, (bool, int, float, str, np.generic)):
+        hasher.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, np.ndarray):
+        if value.dtype == object:
+            hasher.update(b"object-array:")
+            _feed(hasher, value.tolist())
+        else:
+            hasher.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+            hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f"{type(value).__name__}[{len(value)}]:".encode())
+        for item in value:
+            _feed(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f"dict[{len(value)}]:".encode())
+        for key in value:
+            _feed(hasher, key)
+            _feed(hasher, value[key])
+    elif isinstance(value, pd.DataFrame):
+        hasher.update(b"frame:")
+        _feed(hasher, list(value.columns))
+        _feed(hasher, list(value.index))
+        hasher.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+    elif hasattr(value, 'digest') and isinstance(getattr(value, 'digest'), str):
+        # FinancialPanel and anything else carrying a content hash
+        hasher.update(f"digest:{value.digest};".encode())
+    else:
+        raise _Unhashable(type(value).__name__)
+
+
+class FigureCache:
+    """
+    Bounded LRU of Plotly figures keyed on a fingerprint of the chart arguments
+
+    The fingerprint hashes array bytes, containers, titles and flags, so a
+    rerun with identical inputs gets the figure built last time. Cached
+    figures are shared: callers must not mutate them (st.plotly_chart does not).
+
+    Sessions run on separate threads: lookups, recency updates, counters,
+    inserts and evictions all happen under a lock. Only a miss builds its
+    figure, outside the lock; when two threads miss on one key, the first
+    insert wins and both get that figure. Entries are evicted least
+    recently used first.
+    """
+
+    def __init__(self, maxsize: int = FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._figures: 'OrderedDict[str, go.Figure]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    def wrap(self, func: Callable[..., go.Figure]) -> Callable[..., go.Figure]:
+        """Decorate a chart builder so it is served from the cache"""
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> go.Figure:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            hasher = hashlib.blake2b(func.__qualname__.encode(), digest_size=16)
+            try:
+                for name, value in bound.arguments.items():
+                    hasher.update(f"{name}=".encode())
+                    _feed(hasher, value)
+            except _Unhashable:
+                with self._lock:
+                    self.uncacheable += 1
+                return func(*args, **kwargs)
+
+            key = hasher.hexdigest()
+            with self._lock:
+                figure = self._figures.get(key)
+                if figure is not None:
+                    self._figures.move_to_end(key)
+                    self.hits += 1
+                    return figure
+                self.misses += 1
+            figure = func(*args, **kwargs)
+            with self._lock:
+                figure = self._figures.setdefault(key, figure)
+                self._figures.move_to_end(key)
+                while len(self._figures) > self.maxsize:
+                    self._figures.popitem(last=False)
+            return figure
+
+        return wrapper
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits, misses, size and hit rate since the last clear()"""
+        with self._lock:
+            hits, misses, uncacheable, size = self.hits, self.misses, self.uncacheable, len(self._figures)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'uncacheable': uncacheable,
+            'size': size,
+            'hit_rate': hits / lookups if lookups else 0.0
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._figures.clear()
+            self.hits = self.misses = self.uncacheable = 0
+
+
+_figure_cache = FigureCache()
+
 class DashboardCharts:
-    """Reusable chart components for the dashboard"""
+    """
+    Reusable chart components for the dashboard
+    
+    Every create_* builder is memoized in `figure_cache` (shared by all
+    instances), so reruns with unchanged inputs reuse the previous figure.
+    """
+    
+    figure_cache = _figure_cache
     
     @staticmethod
+    @_figure_cache.wrap
     def create_kpi_card(title: str, value: float, prefix: str = "", suffix: str = "",
                        delta: Optional[float] = None, format_str: str = ".2f") -> go.Figure:
         """Create an animated KPI card with sparkline"""
@@ -58,10 +195,17 @@ class DashboardCharts:
         return fig
     
     @staticmethod
+    @_figure_cache.wrap
     def create_trend_line(years: List[int], kaynes_values: List[float], 
                          bel_values: List[float], title: str,
-                         yaxis_title: str, show_forecast: bool = False) -> go.Figure:
-        """Create multi-line trend chart with optional forecast"""
+                         yaxis_title: str, show_forecast: bool = False,
+                         forecast_result: Optional[Forecast] = None) -> go.Figure:
+        """
+        Create multi-line trend chart with optional forecast
+        
+        `forecast_result` (rows: Kaynes, BEL) lets callers share one cached
+        forecast between charts and tables; otherwise it is fitted here.
+        """
         
         fig = go.Figure()
         
@@ -89,39 +233,45 @@ class DashboardCharts:
         
         # Add forecast if requested
         if show_forecast and len(kaynes_values) > 0 and len(bel_values) > 0:
-            # Simple linear forecast
-            from scipy import stats
+            # Both series on the years axis; a shorter one is NaN-padded at the end
+            series = np.full((2, len(years)), np.nan)
+            for row, values in enumerate((kaynes_values, bel_values)):
+                values = np.asarray(values, dtype=np.float64)[:len(years)]
+                series[row, :len(values)] = values
             
-            # Kaynes forecast
-            x_k = np.arange(len(kaynes_values))
-            slope_k, intercept_k = np.polyfit(x_k, kaynes_values, 1)
-            forecast_k = slope_k * len(kaynes_values) + intercept_k
+            # One batched linear fit for both series (NaN gaps are skipped)
+            if forecast_result is None:
+                forecast_result = forecast(series)
             
-            # BEL forecast
-            x_b = np.arange(len(bel_values))
-            slope_b, intercept_b = np.polyfit(x_b, bel_values, 1)
-            forecast_b = slope_b * len(bel_values) + intercept_b
-            
-            # Add forecast points
+            # Add forecast points, with the prediction interval as an error bar
             forecast_year = years[-1] + 1
             
-            fig.add_trace(go.Scatter(
-                x=[years[-1], forecast_year],
-                y=[kaynes_values[-1], forecast_k],
-                name='Kaynes Forecast',
-                mode='lines',
-                line=dict(color=KAYNES_BLUE, width=2, dash='dash'),
-                showlegend=False
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=[years[-1], forecast_year],
-                y=[bel_values[-1], forecast_b],
-                name='BEL Forecast',
-                mode='lines',
-                line=dict(color=BEL_GREEN, width=2, dash='dash'),
-                showlegend=False
-            ))
+            for row, (name, color) in enumerate([
+                ('Kaynes Forecast', KAYNES_BLUE),
+                ('BEL Forecast', BEL_GREEN)
+            ]):
+                reported = np.flatnonzero(~np.isnan(series[row]))
+                point = forecast_result.point[row, 0]
+                if len(reported) == 0 or np.isnan(point):
+                    continue
+                # The dashed segment starts at the series' last reported year
+                last = reported[-1]
+                fig.add_trace(go.Scatter(
+                    x=[years[last], forecast_year],
+                    y=[series[row, last], point],
+                    name=name,
+                    mode='lines',
+                    line=dict(color=color, width=2, dash='dash'),
+                    error_y=dict(
+                        type='data',
+                        symmetric=False,
+                        array=[0, forecast_result.upper[row, 0] - point],
+                        arrayminus=[0, point - forecast_result.lower[row, 0]],
+                        color=color,
+                        thickness=1
+                    ),
+                    showlegend=False
+                ))
         
         fig.update_layout(
             title=dict(text=title, font=dict(size=20, weight='bold')),
@@ -143,6 +293,131 @@ class DashboardCharts:
         return fig
     
     @staticmethod
+    @_figure_cache.wrap
+    def create_panel_trend_line(panel, metric: str, title: str, yaxis_title: str,
+                                companies: Optional[List[str]] = None,
+                                show_forecast: bool = False,
+                                years: Optional[List[int]] = None,
+                                model: str = 'linear') -> go.Figure:
+        """
+        Create trend chart for one metric straight from a FinancialPanel
+        
+        `years` limits the plotted columns (default: every panel year) and must
+        end at the panel's last year when forecasting: the dashed segment is
+        the cached forecast_panel result, fitted on the full history and shared
+        with any table that shows the same metric and model.
+        """
+        
+        if companies is None:
+            companies = list(panel.companies)
+        if years is None:
+            years = list(panel.years)
+        columns = [panel.year_column(y) for y in years]
+        
+        # Two-company panels reuse the standard Kaynes vs BEL styling
+        if companies == ['kaynes', 'bel']:
+            forecast_result = None
+            if show_forecast:
+                if years[-1] != panel.years[-1]:
+                    raise ValueError(f"Forecasts extend the panel's last year {panel.years[-1]}, "
+                                     f"not {years[-1]}")
+                forecast_result = forecast_panel(panel, metric, model=model).take(
+                    panel.company_index[c] for c in companies
+                )
+            return DashboardCharts.create_trend_line(
+                list(years),
+                panel.series('kaynes', metric)[columns],
+                panel.series('bel', metric)[columns],
+                title,
+                yaxis_title,
+                show_forecast=show_forecast,
+                forecast_result=forecast_result
+            )
+        
+        fig = go.Figure()
+        palette = px.colors.qualitative.Plotly
+        
+        for i, company in enumerate(companies):
+            name = panel.info[company].get('company', company)
+            fig.add_trace(go.Scatter(
+                x=list(years),
+                y=panel.series(company, metric)[columns],
+                name=name,
+                mode='lines+markers',
+                line=dict(color=COMPANY_COLORS.get(company, palette[i % len(palette)]), width=3),
+                marker=dict(size=8),
+                hovertemplate=f'<b>{name}</b><br>Year: %{{x}}<br>Value: %{{y:.2f}}<extra></extra>'
+            ))
+        
+        fig.update_layout(
+            title=dict(text=title, font=dict(size=20, weight='bold')),
+            xaxis_title="Year",
+            yaxis_title=yaxis_title,
+            hovermode='x unified',
+            template='plotly_white',
+            height=400,
+            showlegend=True
+        )
+        
+        return fig
+    
+    @staticmethod
+    @_figure_cache.wrap
+    def create_fan_chart(years: List[int], values: List[float], forecast_years: List[int],
+                         bands: np.ndarray, title: str, yaxis_title: str,
+                         name: str, color: str = KAYNES_BLUE) -> go.Figure:
+        """Create history line plus a P5-P95 simulated band around the P50 path"""
+        
+        fig = go.Figure()
+        low, median, high = bands
+        
+        # Band polygon: P95 forward, then P5 back
+        fig.add_trace(go.Scatter(
+            x=list(forecast_years) + list(forecast_years)[::-1],
+            y=list(high) + list(low)[::-1],
+            fill='toself',
+            fillcolor=color,
+            opacity=0.2,
+            line=dict(width=0),
+            name='P5-P95 range',
+            hoverinfo='skip'
+        ))
+        
+        fig.add_trace(go.Scatter(
+            x=years,
+            y=values,
+            name=name,
+            mode='lines+markers',
+            line=dict(color=color, width=3),
+            marker=dict(size=8),
+            hovertemplate=f'<b>{name}</b><br>Year: %{{x}}<br>Value: %{{y:,.2f}}<extra></extra>'
+        ))
+        
+        # Median path continues from the last actual value
+        fig.add_trace(go.Scatter(
+            x=[years[-1]] + list(forecast_years),
+            y=[values[-1]] + list(median),
+            name='Median (P50)',
+            mode='lines+markers',
+            line=dict(color=color, width=2, dash='dash'),
+            customdata=np.column_stack([[np.nan] + list(low), [np.nan] + list(high)]),
+            hovertemplate='Year: %{x}<br>P50: %{y:,.2f}<br>P5-P95: %{customdata[0]:,.2f} - %{customdata[1]:,.2f}<extra></extra>'
+        ))
+        
+        fig.update_layout(
+            title=dict(text=title, font=dict(size=20, weight='bold')),
+            xaxis_title="Year",
+            yaxis_title=yaxis_title,
+            hovermode='x unified',
+            template='plotly_white',
+            height=400,
+            showlegend=True
+        )
+        
+        return fig
+    
+    @staticmethod
+    @_figure_cache.wrap
     def create_comparison_bars(categories: List[str], kaynes_values: List[float],
                               bel_values: List[float], title: str,
                               yaxis_title: str) -> go.Figure:
@@ -190,6 +465,7 @@ class DashboardCharts:
         return fig
     
     @staticmethod
+    @_figure_cache.wrap
     def create_heatmap(data: pd.DataFrame, title: str,
                       x_label: str = "Year", y_label: str = "Ratio") -> go.Figure:
         """Create heatmap for multi-dimensional comparison"""
@@ -216,6 +492,7 @@ class DashboardCharts:
         return fig
     
     @staticmethod
+    @_figure_cache.wrap
     def create_waterfall(categories: List[str], values: List[float],
                         title: str, measure: List[str] = None) -> go.Figure:
         """Create waterfall chart for breakdown analysis"""
@@ -247,6 +524,7 @@ class DashboardCharts:
         return fig
     
     @staticmethod
+    @_figure_cache.wrap
     def create_radar_chart(categories: List[str], kaynes_values: List[float],
                           bel_values: List[float], title: str) -> go.Figure:
         """Create radar/spider chart for multi-dimensional comparison"""
@@ -296,6 +574,7 @@ class DashboardCharts:
         return fig
     
     @staticmethod
+    @_figure_cache.wrap
     def create_gauge(value: float, title: str, 
                     range_vals: Tuple[float, float, float] = (0, 50, 100),
                     color_ranges: List[str] = None) -> go.Figure:
@@ -338,6 +617,7 @@ class DashboardCharts:
         return fig
     
     @staticmethod
+    @_figure_cache.wrap
     def create_scatter_comparison(kaynes_values: List[float], bel_values: List[float],
                                  years: List[int], title: str,
                                  x_label: str, y_label: str) -> go.Figure:
@@ -384,6 +664,7 @@ class DashboardCharts:
         return fig
     
     @staticmethod
+    @_figure_cache.wrap
     def create_dupont_waterfall(components: Dict[str, float], title: str) -> go.Figure:
         """Create DuPont decomposition waterfall"""
         
@@ -10,6 +10,7 @@ from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 from data_extractor import FinancialDataExtractor
+from dataset_cache import DatasetCache
 from financial_calculator import FinancialCalculator
 import warnings
 warnings.filterwarnings('ignore')
@@ -219,7 +220,7 @@ st.markdown("""
 def load_data():
     """Load and cache financial data"""
     file_path = r"c:\Users\Govin\Desktop\finance\Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
-    extractor = FinancialDataExtractor(file_path)
+    extractor = FinancialDataExtractor(file_path, cache=DatasetCache())
     kaynes_data, bel_data = extractor.extract_all_data()
     return kaynes_data, bel_data, extractor
 
@@ -0,0 +1,217 @@
+"""
+Parsed Dataset Cache
+Content-hash keyed on-disk cache of extracted workbooks, stored as compressed NPZ
+Shared by the dashboard, the CLI scripts and any replica pointed at the same directory
+Run with: python dataset_cache.py [--clear]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import zipfile
+import numpy as np
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+# Override with FINANCE_CACHE_DIR, e.g. a volume shared by container replicas
+DEFAULT_CACHE_DIR = os.environ.get(
+    'FINANCE_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'kaynes_finance')
+)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_META_KEY = '__meta__'
+_ENTRY_SUFFIX = '.npz'
+
+
+def workbook_digest(source: Union[str, BinaryIO]) -> str:
+    """
+    SHA-256 of a workbook's bytes (path or seekable binary file object)
+
+    File objects are hashed from offset 0 whatever their current position,
+    which is restored afterwards.
+    """
+    hasher = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as stream:
+            for chunk in iter(lambda: stream.read(1 << 20), b''):
+                hasher.update(chunk)
+    else:
+        position = source.tell()
+        source.seek(0)
+        try:
+            for chunk in iter(lambda: source.read(1 << 20), b''):
+                hasher.update(chunk)
+        finally:
+            source.seek(position)
+    return hasher.hexdigest()
+
+
+def _encode_dataset(dataset: Dict[str, Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Flatten {company: {statement: {metric: list}}} into NPZ-ready arrays"""
+    arrays = {}
+    meta = {}
+    for company_key, company_data in dataset.items():
+        entry = {'fields': {}, 'statements': {}}
+        for field, value in company_data.items():
+            if not isinstance(value, dict):
+                entry['fields'][field] = value
+                continue
+            entry['statements'][field] = list(value.keys())
+            for metric, values in value.items():
+                arrays[f"{company_key}/{field}/{metric}"] = np.array(
+                    [np.nan if v is None else v for v in values], dtype=np.float64
+                )
+        meta[company_key] = entry
+
+    arrays[_META_KEY] = np.array(json.dumps(meta))
+    return arrays
+
+
+def _decode_dataset(npz: Any) -> Dict[str, Dict[str, Any]]:
+    """Rebuild the dict-of-lists dataset, restoring None for missing values"""
+    meta = json.loads(str(npz[_META_KEY]))
+    dataset = {}
+    for company_key, entry in meta.items():
+        company_data = dict(entry['fields'])
+        for statement, metrics in entry['statements'].items():
+            values = {}
+            for metric in metrics:
+                array = npz[f"{company_key}/{statement}/{metric}"]
+                if metric == 'years':
+                    values[metric] = [int(v) for v in array]
+                else:
+                    values[metric] = [None if np.isnan(v) else float(v) for v in array]
+            company_data[statement] = values
+        dataset[company_key] = company_data
+    return dataset
+
+
+class DatasetCache:
+    """Size-bounded LRU cache of parsed datasets keyed by workbook hash + layout"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(source: Union[str, BinaryIO], layout_id: str) -> str:
+        """Cache key: workbook SHA-256 plus the extractor layout fingerprint"""
+        return f"{workbook_digest(source)}-{layout_id}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Return the cached dataset for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                dataset = _decode_dataset(npz)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # Truncated or stale entry: drop it and re-parse
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction is least-recently-used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return dataset
+
+    def put(self, key: str, dataset: Dict[str, Dict[str, Any]]) -> None:
+        """Store a dataset atomically, then evict old entries beyond max_bytes"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as stream:
+                    np.savez_compressed(stream, **_encode_dataset(dataset))
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                self._remove(tmp_path)
+                raise
+        except OSError:
+            # Caching is best-effort; a read-only filesystem must not break loading
+            return
+
+        self._evict(keep=key)
+
+    def _entries(self) -> list:
+        """(mtime, size, path) for every cache entry, oldest first"""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        keep_path = self._path(keep) if keep else None
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            if self._remove(path):
+                self.evictions += 1
+                total -= size
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def clear(self) -> None:
+        """Delete every cached dataset"""
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the on-disk footprint"""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'cache_dir': self.cache_dir
+        }
+
+
+if __name__ == "__main__":
+    cache = DatasetCache()
+    if '--clear' in sys.argv:
+        cache.clear()
+        print(f"✅ Cleared dataset cache at {cache.cache_dir}")
+
+    for name, value in cache.stats().items():
+        print(f"{name:>10}: {value}")
@@ -0,0 +1,78 @@
+"""
+DuPont Engine
+3- and 5-point ROE decomposition for every company and year, from statements
+"""
+
+import numpy as np
+from types import MappingProxyType
+from typing import Dict
+from financial_panel import FinancialPanel, cached_by_digest
+from ratio_engine import safe_divide, statement_lines
+
+# Factors multiplied together in each decomposition
+DUPONT_3POINT = ('net_margin', 'asset_turnover', 'equity_multiplier')
+DUPONT_5POINT = ('tax_burden', 'interest_burden', 'ebit_margin', 'asset_turnover', 'equity_multiplier')
+
+# Waterfall labels, as used by DashboardCharts.create_dupont_waterfall
+FACTOR_LABELS = {
+    'net_margin': 'Net Margin',
+    'tax_burden': 'Tax Burden',
+    'interest_burden': 'Interest Burden',
+    'ebit_margin': 'EBIT Margin',
+    'asset_turnover': 'Asset Turnover',
+    'equity_multiplier': 'Equity Multiplier',
+    'roe': 'ROE'
+}
+
+
+class DupontAnalysis:
+    """
+    Read-only (company, year) arrays of every DuPont factor, as fractions
+
+    All factors come from one statement_lines pass with period-end
+    balances, so both decompositions multiply back to net profit / equity.
+    """
+
+    def __init__(self, panel: FinancialPanel):
+        lines = statement_lines(panel)
+        sales, ebit = lines['sales'], lines['ebit']
+        pbt, net_profit = lines['profit_before_tax'], lines['net_profit']
+        total_assets, equity = lines['total_assets'], lines['equity']
+
+        factors = {
+            'net_margin': safe_divide(net_profit, sales),
+            'tax_burden': safe_divide(net_profit, pbt),
+            'interest_burden': safe_divide(pbt, ebit),
+            'ebit_margin': safe_divide(ebit, sales),
+            'asset_turnover': safe_divide(sales, total_assets),
+            'equity_multiplier': safe_divide(total_assets, equity),
+            'roe': safe_divide(net_profit, equity)
+        }
+        for values in factors.values():
+            values[~panel.mask] = np.nan
+            values.setflags(write=False)
+
+        self.panel = panel
+        self.factors = MappingProxyType(factors)
+
+    def factor(self, name: str, company: str, year: int) -> float:
+        """One factor for one company and fiscal year"""
+        return float(self.factors[name][self.panel.company_index[company], self.panel.year_index[year]])
+
+    def components(self, company: str, year: int, points: int = 3) -> Dict[str, float]:
+        """Labelled factors followed by ROE, ready for create_dupont_waterfall"""
+        if points not in (3, 5):
+            raise ValueError(f"DuPont decomposition has 3 or 5 points, not {points}")
+        names = DUPONT_3POINT if points == 3 else DUPONT_5POINT
+        return {FACTOR_LABELS[name]: self.factor(name, company, year) for name in names + ('roe',)}
+
+    def roe(self, points: int = 3) -> np.ndarray:
+        """(company, year) ROE rebuilt as the product of the chosen decomposition's factors"""
+        names = DUPONT_3POINT if points == 3 else DUPONT_5POINT
+        return np.prod([self.factors[name] for name in names], axis=0)
+
+
+@cached_by_digest()
+def dupont_analysis(panel: FinancialPanel) -> DupontAnalysis:
+    """DupontAnalysis cached per dataset content hash"""
+    return DupontAnalysis(panel)
@@ -0,0 +1,216 @@
+"""
+Earnings Quality
+Batch Piotroski F-score and Beneish M-score for every company and year
+"""
+
+import numpy as np
+from types import MappingProxyType
+from typing import Dict
+from financial_panel import FinancialPanel, cached_by_digest
+from ratio_engine import safe_divide, statement_lines
+
+# Piotroski's nine binary signals, in score order
+PIOTROSKI_SIGNALS = (
+    'roa_positive', 'cfo_positive', 'roa_improving', 'accruals',
+    'leverage_falling', 'current_ratio_rising', 'no_dilution',
+    'gross_margin_rising', 'asset_turnover_rising'
+)
+
+# Beneish's eight-index model: M = intercept + sum(weight * index)
+BENEISH_INDICES = ('dsri', 'gmi', 'aqi', 'sgi', 'depi', 'sgai', 'lvgi', 'tata')
+BENEISH_WEIGHTS = MappingProxyType({
+    'dsri': 0.920, 'gmi': 0.528, 'aqi': 0.404, 'sgi': 0.892,
+    'depi': 0.115, 'sgai': -0.172, 'lvgi': -0.327, 'tata': 4.679
+})
+BENEISH_INTERCEPT = -4.84
+
+# M-scores above this suggest likely earnings manipulation
+BENEISH_THRESHOLD = -1.78
+
+# F-scores at or above / at or below these are the classic strong / weak buckets
+FSCORE_STRONG = 8
+FSCORE_WEAK = 2
+
+# Indices built from lines some companies do not report; missing ones count as neutral (1.0)
+_NEUTRAL_WHEN_MISSING = ('aqi', 'depi', 'sgai')
+
+
+def _lag(values: np.ndarray) -> np.ndarray:
+    """Previous year's value along the year axis (NaN in the first year)"""
+    out = np.full(values.shape, np.nan)
+    out[:, 1:] = values[:, :-1]
+    return out
+
+
+def _signal(condition: np.ndarray, *inputs: np.ndarray) -> np.ndarray:
+    """1.0 / 0.0 for a condition, NaN where any of its inputs is missing"""
+    missing = np.any([np.isnan(x) for x in inputs], axis=0)
+    return np.where(missing, np.nan, condition.astype(np.float64))
+
+
+def piotroski_signals(panel: FinancialPanel) -> np.ndarray:
+    """
+    (9, company, year) array of Piotroski signals (1 pass, 0 fail, NaN unknown)
+
+    Returns, leverage and turnover follow Piotroski in using opening total
+    assets; leverage is debt / total assets and dilution compares share counts.
+    """
+    lines = statement_lines(panel)
+
+    def line(metric: str) -> np.ndarray:
+        return panel.metric(metric) if metric in panel.metric_index else np.full(panel.mask.shape, np.nan)
+
+    sales, net_profit, total_assets = lines['sales'], lines['net_profit'], lines['total_assets']
+    cfo, shares = line('operating_cash_flow'), line('shares_lakhs')
+    opening_assets = _lag(total_assets)
+
+    roa = safe_divide(net_profit, opening_assets)
+    leverage = safe_divide(lines['debt'], total_assets)
+    current_ratio = safe_divide(lines['current_assets'], lines['current_liabilities'])
+    gross_margin = safe_divide(sales - lines['cost_of_sales'], sales)
+    turnover = safe_divide(sales, opening_assets)
+
+    signals = {
+        'roa_positive': _signal(roa > 0, roa),
+        'cfo_positive': _signal(cfo > 0, cfo),
+        'roa_improving': _signal(roa > _lag(roa), roa, _lag(roa)),
+        'accruals': _signal(cfo > net_profit, cfo, net_profit),
+        'leverage_falling': _signal(leverage < _lag(leverage), leverage, _lag(leverage)),
+        'current_ratio_rising': _signal(current_ratio > _lag(current_ratio), current_ratio, _lag(current_ratio)),
+        'no_dilution': _signal(shares <= _lag(shares), shares, _lag(shares)),
+        'gross_margin_rising': _signal(gross_margin > _lag(gross_margin), gross_margin, _lag(gross_margin)),
+        'asset_turnover_rising': _signal(turnover > _lag(turnover), turnover, _lag(turnover))
+    }
+    return np.stack([signals[name] for name in PIOTROSKI_SIGNALS])
+
+
+def beneish_indices(panel: FinancialPanel) -> Dict[str, np.ndarray]:
+    """
+    Beneish's eight year-over-year indices as (company, year) arrays
+
+    Property, plant and equipment is net block; long-term debt is the
+    capital-employed identity's debt; total accruals use operating cash flow.
+    """
+    lines = statement_lines(panel)
+
+    def line(metric: str) -> np.ndarray:
+        return panel.metric(metric) if metric in panel.metric_index else np.full(panel.mask.shape, np.nan)
+
+    def index(current: np.ndarray) -> np.ndarray:
+        return safe_divide(current, _lag(current))
+
+    sales, total_assets = lines['sales'], lines['total_assets']
+    net_block, depreciation = line('net_block'), line('depreciation')
+    gross_margin = safe_divide(sales - lines['cost_of_sales'], sales)
+    hard_assets = lines['current_assets'] + net_block + np.nan_to_num(line('investments'))
+
+    indices = {
+        'dsri': index(safe_divide(lines['receivables'], sales)),
+        'gmi': safe_divide(_lag(gross_margin), gross_margin),
+        'aqi': index(1 - safe_divide(hard_assets, total_assets)),
+        'sgi': index(sales),
+        'depi': safe_divide(1, index(safe_divide(depreciation, depreciation + net_block))),
+        'sgai': index(safe_divide(line('selling_admin'), sales)),
+        'lvgi': index(safe_divide(lines['current_liabilities'] + lines['debt'], total_assets)),
+        'tata': safe_divide(lines['net_profit'] - line('operating_cash_flow'), total_assets)
+    }
+    has_history = ~np.isnan(_lag(sales))
+    for name in _NEUTRAL_WHEN_MISSING:
+        indices[name] = np.where(has_history & np.isnan(indices[name]), 1.0, indices[name])
+    return indices
+
+
+class EarningsQuality:
+    """
+    Read-only (company, year) Piotroski and Beneish results for a whole panel
+
+    A company's first reported year has no comparison year, so both scores
+    are NaN there. The F-score is only given when all nine signals are known.
+    """
+
+    def __init__(self, panel: FinancialPanel):
+        signals = piotroski_signals(panel)
+        signals[:, ~panel.mask] = np.nan
+        fscore = signals.sum(axis=0)
+
+        indices = beneish_indices(panel)
+        mscore = BENEISH_INTERCEPT + sum(BENEISH_WEIGHTS[name] * indices[name] for name in BENEISH_INDICES)
+        for values in indices.values():
+            values[~panel.mask] = np.nan
+            values.setflags(write=False)
+        mscore[~panel.mask] = np.nan
+
+        flagged = mscore > BENEISH_THRESHOLD
+        for values in (signals, fscore, mscore, flagged):
+            values.setflags(write=False)
+
+        self.panel = panel
+        self.signals = signals
+        self.fscore = fscore
+        self.indices = MappingProxyType(indices)
+        self.mscore = mscore
+        self.flagged = flagged
+
+    def summary(self, company: str, year: int) -> Dict[str, object]:
+        """F-score, M-score and red-flag status for one company and fiscal year"""
+        c, y = self.panel.company_index[company], self.panel.year_index[year]
+        fscore, mscore = self.fscore[c, y], self.mscore[c, y]
+        if np.isnan(fscore):
+            strength = 'N/A'
+        else:
+            strength = 'strong' if fscore >= FSCORE_STRONG else 'weak' if fscore <= FSCORE_WEAK else 'neutral'
+        return {
+            'fscore': float(fscore),
+            'strength': strength,
+            'mscore': float(mscore),
+            'manipulation_risk': 'N/A' if np.isnan(mscore) else 'high' if self.flagged[c, y] else 'low'
+        }
+
+
+@cached_by_digest()
+def earnings_quality(panel: FinancialPanel) -> EarningsQuality:
+    """
+    EarningsQuality cached per dataset content hash
+
+    Keyed on panel.digest rather than panel identity, so copies of the same
+    dataset (e.g. from st.cache_data) share one computation.
+    """
+    return EarningsQuality(panel)
+
+
+if __name__ == "__main__":
+    import copy
+    import time
+    from data_extractor import FinancialDataExtractor
+
+    panel = FinancialDataExtractor("Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx").extract_panel()
+    quality = earnings_quality(panel)
+
+    print("=" * 60)
+    print("EARNINGS QUALITY")
+    print("=" * 60)
+    for company in panel.companies:
+        print(f"\n{company}:")
+        for year in panel.company_years(company):
+            s = quality.summary(company, year)
+            print(f"   FY{year}: F = {s['fscore']:4.0f} ({s['strength']:7s})   "
+                  f"M = {s['mscore']:6.2f} ({s['manipulation_risk']} risk)")
+
+    start = time.perf_counter()
+    assert earnings_quality(copy.deepcopy(panel)) is quality
+    print(f"\nCopy of the same dataset served from cache in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    # Universe screen: tile the panel out to 2,000 issuers
+    reps = 1000
+    universe = FinancialPanel(np.tile(panel.values, (reps, 1, 1)),
+                              [f"{c}_{i}" for i in range(reps) for c in panel.companies],
+                              panel.metrics, panel.years,
+                              {s: (panel.metrics.index(panel.statement_metrics(s)[0]),
+                                   panel.metrics.index(panel.statement_metrics(s)[-1]) + 1)
+                               for s in panel.statements},
+                              mask=np.tile(panel.mask, (reps, 1)))
+    start = time.perf_counter()
+    result = EarningsQuality(universe)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Screened {len(universe.companies):,} issuers x {len(universe.years)} years in {elapsed:.1f} ms "
+          f"({int(result.flagged.sum())} M-score red flags)")
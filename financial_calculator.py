@@ -5,8 +5,34 @@ Provides health scores, forecasts, benchmarks, and additional calculations
 
 import numpy as np
 import pandas as pd
-from scipy import stats
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Mapping, Tuple, Optional, Sequence, Union
+from benchmark_profile import DEFAULT_PROFILE, BenchmarkProfile, ladder_grade
+from forecasting import forecast
+from narrative_engine import render
+from rolling_analytics import trend_direction
+
+# Series may be extractor lists (None for missing) or FinancialPanel arrays (NaN for missing)
+Series = Union[Sequence[Optional[float]], np.ndarray]
+
+# Sub-scores making up the health score, each weighted 25%
+HEALTH_COMPONENTS = ('liquidity', 'solvency', 'profitability', 'efficiency')
+
+
+def _is_missing(value: Optional[float]) -> bool:
+    """True for None or NaN"""
+    return value is None or bool(np.isnan(value))
+
+
+def _round(value, digits: int):
+    """round() for scalars (returning a float), np.round for arrays"""
+    return round(float(value), digits) if np.ndim(value) == 0 else np.round(value, digits)
+
+
+def _valid_values(values: Series) -> np.ndarray:
+    """Float array of the series with None/NaN entries dropped"""
+    array = np.asarray(values, dtype=np.float64)
+    return array[~np.isnan(array)]
+
 
 class FinancialCalculator:
     """Advanced financial calculations and metrics"""
@@ -14,7 +40,8 @@ class FinancialCalculator:
     @staticmethod
     def calculate_health_score(ratios: Dict[str, List[float]], 
                                year_idx: int = 0,
-                               benchmarks: Optional[Dict[str, float]] = None) -> float:
+                               benchmarks: Optional[Dict[str, float]] = None,
+                               profile: BenchmarkProfile = DEFAULT_PROFILE) -> float:
         """
         Calculate composite health score (0-100) based on financial ratios
         
@@ -23,19 +50,12 @@ class FinancialCalculator:
         - Solvency: 25%
         - Profitability: 25%
         - Efficiency: 25%
+        
+        Benchmarks default to the profile's health benchmarks.
         """
         
         if benchmarks is None:
-            # Industry average benchmarks
-            benchmarks = {
-                'current_ratio': 2.0,
-                'quick_ratio': 1.0,
-                'debt_to_equity': 0.5,
-                'times_interest_earned': 5.0,
-                'net_profit_margin': 15.0,
-                'return_on_assets': 10.0,
-                'asset_turnover': 1.5
-            }
+            benchmarks = profile.health
         
         scores = []
         
@@ -89,7 +109,7 @@ class FinancialCalculator:
         
         # Efficiency Score (25%)
         efficiency_score = 0
-        if ratios['asset_turnover'][year_idx] is not None:
+        if not _is_missing(ratios['asset_turnover'][year_idx]):
             at = ratios['asset_turnover'][year_idx]
             if at >= benchmarks['asset_turnover']:
                 efficiency_score += 100
@@ -105,15 +125,102 @@ class FinancialCalculator:
         return round(health_score, 2)
     
     @staticmethod
-    def calculate_yoy_change(values: List[float], year_idx: int = 0) -> float:
+    def calculate_health_scores(ratios: Union[Mapping[str, np.ndarray], Any],
+                                benchmarks: Optional[Dict[str, float]] = None,
+                                mask: Optional[np.ndarray] = None,
+                                profile: BenchmarkProfile = DEFAULT_PROFILE,
+                                profiles: Optional[Sequence[BenchmarkProfile]] = None) -> Dict[str, np.ndarray]:
+        """
+        Batched health score for every company x year at once
+        
+        `ratios` is a FinancialPanel (its ratios and mask are used) or a mapping
+        of ratio name -> (company, year) array. Returns 'health' plus the four
+        HEALTH_COMPONENTS sub-scores as unrounded (company, year) arrays.
+        
+        Same scoring as calculate_health_score, but a missing ratio only drops
+        its own half of a sub-score (the other half is doubled), and a missing
+        asset turnover falls back to 75. Cells with no data, or outside `mask`,
+        score NaN.
+        
+        `profiles` (one per company, e.g. profiles_for_panel(panel)) scores
+        each company on its own benchmarks; the company axis is the
+        second-to-last one, so (..., company, year) arrays work too.
+        """
+        if profiles is not None:
+            result: Dict[str, np.ndarray] = {}
+            for distinct in dict.fromkeys(profiles):
+                rows = np.array([p is distinct for p in profiles])
+                scores = FinancialCalculator.calculate_health_scores(ratios, benchmarks, mask, distinct)
+                for name, values in scores.items():
+                    target = result.setdefault(name, np.full(values.shape, np.nan))
+                    target[..., rows, :] = values[..., rows, :]
+            return result
+        
+        if benchmarks is None:
+            benchmarks = profile.health
+        
+        if hasattr(ratios, 'metric'):
+            if mask is None:
+                mask = ratios.mask
+            ratios = {name: ratios.metric(name) for name in benchmarks
+                      if name in ratios.metric_index}
+        
+        shape = np.shape(next(iter(ratios.values())))
+        
+        def ratio(name: str) -> np.ndarray:
+            return np.asarray(ratios[name], dtype=np.float64) if name in ratios else np.full(shape, np.nan)
+        
+        def at_least(name: str, points: float) -> np.ndarray:
+            # Full points at or above the benchmark, pro rata below it
+            return np.minimum(ratio(name) / benchmarks[name], 1.0) * points
+        
+        def combine(*halves: np.ndarray) -> np.ndarray:
+            # Sum of the available halves, rescaled to the full 100
+            stacked = np.stack(halves)
+            present = (~np.isnan(stacked)).sum(axis=0)
+            total = np.nansum(stacked, axis=0) * len(halves) / np.maximum(present, 1)
+            return np.where(present > 0, np.minimum(total, 100.0), np.nan)
+        
+        debt_to_equity = ratio('debt_to_equity')
+        excess_leverage = np.maximum(debt_to_equity - benchmarks['debt_to_equity'], 0.0)
+        leverage_points = np.maximum(0.0, 50 - excess_leverage * 20)
+        leverage_points[np.isnan(debt_to_equity)] = np.nan
+        
+        efficiency = at_least('asset_turnover', 100)
+        efficiency = np.where(np.isnan(efficiency), 75.0, efficiency)
+        
+        scores = {
+            'liquidity': combine(at_least('current_ratio', 50), at_least('quick_ratio', 50)),
+            'solvency': combine(leverage_points, at_least('times_interest_earned', 50)),
+            'profitability': combine(at_least('net_profit_margin', 50), at_least('return_on_assets', 50)),
+            'efficiency': np.minimum(efficiency, 100.0)
+        }
+        
+        # A cell with no liquidity, solvency or profitability data has no score at all
+        has_data = ~(np.isnan(scores['liquidity']) & np.isnan(scores['solvency'])
+                     & np.isnan(scores['profitability']))
+        if mask is not None:
+            has_data &= np.asarray(mask, dtype=bool)
+        for name in HEALTH_COMPONENTS:
+            scores[name] = np.where(has_data, scores[name], np.nan)
+        
+        stacked = np.stack([scores[name] for name in HEALTH_COMPONENTS])
+        scores['health'] = np.where(has_data, np.nanmean(np.where(has_data, stacked, 0.0), axis=0), np.nan)
+        return scores
+    
+    @staticmethod
+    def calculate_yoy_change(values: Series, year_idx: int = 0) -> float:
         """Calculate year-over-year percentage change"""
-        if year_idx + 1 < len(values) and values[year_idx + 1] != 0:
+        if (year_idx + 1 < len(values)
+                and not _is_missing(values[year_idx]) and not _is_missing(values[year_idx + 1])
+                and values[year_idx + 1] != 0):
             return round(((values[year_idx] - values[year_idx + 1]) / abs(values[year_idx + 1])) * 100, 2)
         return 0.0
     
     @staticmethod
-    def calculate_cagr(values: List[float], years: int = None) -> float:
+    def calculate_cagr(values: Series, years: int = None) -> float:
         """Calculate Compound Annual Growth Rate"""
+        values = _valid_values(values)
         if len(values) < 2:
             return 0.0
         
@@ -130,34 +237,21 @@ class FinancialCalculator:
         return round(cagr, 2)
     
     @staticmethod
-    def forecast_linear(values: List[float], years_ahead: int = 1) -> List[float]:
+    def forecast_linear(values: Series, years_ahead: int = 1) -> List[float]:
         """Simple linear regression forecast"""
-        if len(values) < 2:
-            return [values[0]] * years_ahead if values else [0] * years_ahead
-        
-        # Remove None values
-        clean_values = [v for v in values if v is not None]
+        # Remove None/NaN values
+        clean_values = _valid_values(values).tolist()
         if len(clean_values) < 2:
             return [clean_values[0]] * years_ahead if clean_values else [0] * years_ahead
         
-        x = np.arange(len(clean_values))
-        y = np.array(clean_values)
-        
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
-        
-        forecasts = []
-        for i in range(1, years_ahead + 1):
-            forecast = slope * (len(clean_values) + i - 1) + intercept
-            forecasts.append(round(forecast, 2))
-        
-        return forecasts
+        return np.round(forecast(clean_values, years_ahead).point[0], 2).tolist()
     
     @staticmethod
     def calculate_dupont_3point(net_profit_margin: float, 
                                  asset_turnover: float, 
                                  equity_multiplier: float) -> float:
-        """Calculate 3-point DuPont ROE"""
-        return round(net_profit_margin * asset_turnover * equity_multiplier, 4)
+        """Calculate 3-point DuPont ROE (scalars, or arrays elementwise)"""
+        return _round(np.multiply(np.multiply(net_profit_margin, asset_turnover), equity_multiplier), 4)
     
     @staticmethod
     def calculate_dupont_5point(tax_burden: float,
@@ -165,8 +259,9 @@ class FinancialCalculator:
                                 ebit_margin: float,
                                 asset_turnover: float,
                                 equity_multiplier: float) -> float:
-        """Calculate 5-point DuPont ROE"""
-        return round(tax_burden * interest_burden * ebit_margin * asset_turnover * equity_multiplier, 4)
+        """Calculate 5-point DuPont ROE (scalars, or arrays elementwise)"""
+        return _round(np.prod(np.broadcast_arrays(tax_burden, interest_burden, ebit_margin,
+                                                  asset_turnover, equity_multiplier), axis=0), 4)
     
     @staticmethod
     def calculate_z_score(current_assets: float,
@@ -182,6 +277,8 @@ class FinancialCalculator:
         Z > 2.99: Safe zone
         1.81 < Z < 2.99: Grey zone
         Z < 1.81: Distress zone
+        
+        Arguments may be arrays; altman_engine scores a whole panel at once.
         """
         
         working_capital = current_assets - current_liabilities
@@ -194,95 +291,42 @@ class FinancialCalculator:
         
         z_score = 1.2 * x1 + 1.4 * x2 + 3.3 * x3 + 0.6 * x4 + 1.0 * x5
         
-        return round(z_score, 2)
+        return _round(z_score, 2)
     
     @staticmethod
-    def grade_ratio(ratio_name: str, value: float, benchmarks: Optional[Dict[str, Dict]] = None) -> str:
+    def grade_ratio(ratio_name: str, value: Union[float, np.ndarray],
+                    benchmarks: Optional[Dict[str, Dict]] = None,
+                    profile: BenchmarkProfile = DEFAULT_PROFILE) -> Union[str, np.ndarray]:
         """
         Grade a ratio A-F based on industry benchmarks
         
-        Returns: Grade (A, B, C, D, F) and color
+        Uses the precompiled profile (swap in a sector profile as needed);
+        an explicit `benchmarks` dict is compiled on the fly instead, or,
+        when its thresholds are not monotone, walked in A-D order as before.
+        Arrays are graded in one pass and return an array of grades.
+        
+        Returns: Grade (A, B, C, D, F, or N/A for unknown ratios/missing values)
         """
         
-        if benchmarks is None:
-            benchmarks = {
-                'current_ratio': {'A': 2.0, 'B': 1.5, 'C': 1.2, 'D': 1.0},
-                'quick_ratio': {'A': 1.5, 'B': 1.0, 'C': 0.8, 'D': 0.5},
-                'debt_to_equity': {'A': 0.3, 'B': 0.5, 'C': 0.8, 'D': 1.2},  # Lower is better
-                'times_interest_earned': {'A': 10, 'B': 5, 'C': 3, 'D': 2},
-                'gross_profit_margin': {'A': 30, 'B': 20, 'C': 15, 'D': 10},
-                'operating_profit_margin': {'A': 20, 'B': 15, 'C': 10, 'D': 5},
-                'net_profit_margin': {'A': 15, 'B': 10, 'C': 5, 'D': 2},
-                'return_on_assets': {'A': 15, 'B': 10, 'C': 5, 'D': 2},
-                'inventory_turnover': {'A': 6, 'B': 4, 'C': 2, 'D': 1},
-                'receivables_turnover': {'A': 12, 'B': 8, 'C': 5, 'D': 3},
-                'asset_turnover': {'A': 2, 'B': 1.5, 'C': 1.0, 'D': 0.5}
-            }
-        
-        if ratio_name not in benchmarks:
-            return 'N/A'
-        
-        thresholds = benchmarks[ratio_name]
-        
-        # For ratios where lower is better (debt ratios)
-        if ratio_name in ['debt_to_equity', 'debt_ratio']:
-            if value <= thresholds['A']:
-                return 'A'
-            elif value <= thresholds['B']:
-                return 'B'
-            elif value <= thresholds['C']:
-                return 'C'
-            elif value <= thresholds['D']:
-                return 'D'
-            else:
-                return 'F'
-        else:
-            # For ratios where higher is better
-            if value >= thresholds['A']:
-                return 'A'
-            elif value >= thresholds['B']:
-                return 'B'
-            elif value >= thresholds['C']:
-                return 'C'
-            elif value >= thresholds['D']:
-                return 'D'
-            else:
-                return 'F'
+        if benchmarks is not None:
+            try:
+                profile = BenchmarkProfile('custom', benchmarks, profile.lower_is_better)
+            except ValueError:
+                if ratio_name not in benchmarks:
+                    return 'N/A'
+                return ladder_grade(benchmarks[ratio_name], value, ratio_name in profile.lower_is_better)
+        return profile.grade(ratio_name, value)
     
     @staticmethod
-    def get_grade_color(grade: str) -> str:
-        """Get color for grade"""
-        colors = {
-            'A': '#28A745',  # Green
-            'B': '#5CB85C',  # Light Green
-            'C': '#FFC107',  # Yellow
-            'D': '#FF8C00',  # Orange
-            'F': '#DC3545',  # Red
-            'N/A': '#6C757D'  # Gray
-        }
-        return colors.get(grade, '#6C757D')
+    def get_grade_color(grade: Union[str, np.ndarray]) -> Union[str, np.ndarray]:
+        """Get color for grade (or an array of colors for an array of grades)"""
+        return BenchmarkProfile.color(grade)
     
     @staticmethod
-    def calculate_trend_direction(values: List[float]) -> str:
+    def calculate_trend_direction(values: Series) -> str:
         """Calculate overall trend direction"""
-        if len(values) < 2:
-            return 'stable'
-        
-        clean_values = [v for v in values if v is not None]
-        if len(clean_values) < 2:
-            return 'stable'
-        
-        # Calculate slope
-        x = np.arange(len(clean_values))
-        y = np.array(clean_values)
-        slope, _, _, _, _ = stats.linregress(x, y)
-        
-        if slope > 0.05:
-            return 'improving'
-        elif slope < -0.05:
-            return 'declining'
-        else:
-            return 'stable'
+        # Closed-form slope over the non-missing points (no per-call linregress)
+        return str(trend_direction(_valid_values(values)))
     
     @staticmethod
     def generate_narrative(metric_name: str, 
@@ -290,26 +334,10 @@ class FinancialCalculator:
                            previous_value: float,
                            trend: str,
                            company: str) -> str:
-        """Generate AI-style narrative for metrics"""
+        """Generate AI-style narrative for metrics (see narrative_engine for bulk rendering)"""
         
         yoy_change = ((current_value - previous_value) / abs(previous_value)) * 100 if previous_value != 0 else 0
-        
-        direction = "increased" if yoy_change > 0 else "decreased"
-        performance = "strong" if trend == "improving" else "weak" if trend == "declining" else "stable"
-        
-        narratives = {
-            'liquidity': f"{company}'s liquidity position has {direction} by {abs(yoy_change):.1f}% YoY, showing {performance} short-term financial health.",
-            'solvency': f"{company} demonstrates {performance} long-term financial stability with debt metrics {direction} by {abs(yoy_change):.1f}%.",
-            'profitability': f"{company}'s profitability has {direction} by {abs(yoy_change):.1f}%, indicating {performance} operational efficiency.",
-            'efficiency': f"Asset utilization at {company} has {direction} by {abs(yoy_change):.1f}%, reflecting {performance} resource management."
-        }
-        
-        # Return appropriate narrative
-        for key in narratives:
-            if key in metric_name.lower():
-                return narratives[key]
-        
-        return f"{company}'s {metric_name} has {direction} by {abs(yoy_change):.1f}% year-over-year."
+        return render(metric_name, company, yoy_change, trend)
 
 
 if __name__ == "__main__":
@@ -10,9 +10,20 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+import time
 from data_extractor import FinancialDataExtractor
+from dataset_cache import DatasetCache
 from financial_calculator import FinancialCalculator
-from chart_components import DashboardCharts
+from chart_components import COMPANY_COLORS, DashboardCharts
+from forecasting import MODEL_LABELS, forecast_panel
+from scenario_simulator import run_scenarios
+from dupont_engine import dupont_analysis
+from altman_engine import MODELS, altman_analysis
+from earnings_quality import BENEISH_THRESHOLD, earnings_quality
+from peer_search import MIN_PEER_COMPANIES, peer_index
+from whatif_engine import DRIVER_SPECS, whatif_engine
+from rolling_analytics import max_drawdown, rolling_cagr, rolling_std
+from view_models import SCORECARD_ROWS, dashboard_views
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -20,6 +31,8 @@ warnings.filterwarnings('ignore')
 # PAGE CONFIGURATION
 # ============================================================================
 
+script_start = time.perf_counter()
+
 st.set_page_config(
     page_title="Kaynes vs BEL Financial Dashboard",
     page_icon="📊",
@@ -31,20 +44,35 @@ st.set_page_config(
 # LOAD DATA
 # ============================================================================
 
-@st.cache_data
+@st.cache_resource
 def load_data():
-    """Load and cache financial data"""
+    """
+    Parse the workbook once per process into an immutable FinancialPanel
+    
+    The panel is shared by every session and thread without pickling or
+    copying; its arrays are read-only and its attributes cannot be rebound.
+    """
     import os
     file_path = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
     if not os.path.exists(file_path):
         st.error(f"Excel file not found: {file_path}")
         st.stop()
-    extractor = FinancialDataExtractor(file_path)
-    kaynes_data, bel_data = extractor.extract_all_data()
-    return kaynes_data, bel_data, extractor
+    return FinancialDataExtractor(file_path, cache=DatasetCache()).build_panel()
+
+@st.cache_data(show_spinner="Simulating scenarios...")
+def simulate_scenarios(_panel, digest: str, company: str, horizon: int = 3, n_paths: int = 20000):
+    """
+    Monte Carlo percentile bands for one company of the load_data panel
+    
+    The panel itself is not hashed; its content digest keys the cache, so a
+    changed workbook gets fresh bands.
+    """
+    return run_scenarios(_panel, company, n_paths=n_paths, horizon=horizon)
 
 try:
-    kaynes_data, bel_data, extractor = load_data()
+    panel = load_data()
+    # Every (year, company) display bundle, built once per dataset and shared by all sessions
+    views = dashboard_views(panel)
     calc = FinancialCalculator()
     charts = DashboardCharts()
 except Exception as e:
@@ -82,20 +110,6 @@ st.markdown("""
         padding-bottom: 0.5rem;
         border-bottom: 3px solid #007BFF;
     }
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 1rem;
-    }
-    .stTabs [data-baseweb="tab"] {
-        height: 50px;
-        padding: 0 1.5rem;
-        background-color: #f8f9fa;
-        border-radius: 5px 5px 0 0;
-        font-weight: 600;
-    }
-    .stTabs [aria-selected="true"] {
-        background-color: #007BFF;
-        color: white !important;
-    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -111,6 +125,70 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# ============================================================================
+# FRAGMENTS
+# ============================================================================
+# Each fragment owns the controls it depends on, so interacting with them
+# reruns only that fragment instead of the whole script:
+# - render_whatif: what-if sliders (sidebar)
+# - render_active_section: section picker, forecast / benchmark toggles
+# - narrative_block: "Show AI Narratives"
+# The year selector stays a full rerun because the sidebar stats and every
+# section depend on it; unchanged charts are then figure-cache hits.
+
+@st.fragment
+def render_whatif():
+    """What-if sliders and their effect on health and ROE for the selected year"""
+    st.subheader("🧪 What-If Scenario")
+    with st.expander("Shock the drivers", expanded=False):
+        shocks = {
+            driver: st.slider(label, min_value=low, max_value=high, value=0.0, step=step, key=f"whatif_{driver}")
+            for driver, (label, (low, high, step)) in DRIVER_SPECS.items()
+        }
+    
+    if any(shocks.values()):
+        whatif = whatif_engine(panel)
+        base_case = whatif.scenario()
+        shocked = whatif.scenario(**shocks)
+        year_col = panel.year_column(selected_year)
+        
+        for company, name in [('kaynes', "Kaynes"), ('bel', "BEL")]:
+            c = panel.company_index[company]
+            health_now = shocked['health_score'][c, year_col]
+            roe_now = shocked['roe'][c, year_col]
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric(f"{name} Health", f"{health_now:.1f}",
+                          f"{health_now - base_case['health_score'][c, year_col]:+.1f}")
+            with col2:
+                st.metric(f"{name} ROE", f"{roe_now * 100:.2f}%",
+                          f"{(roe_now - base_case['roe'][c, year_col]) * 100:+.2f} pp")
+            st.caption(
+                f"NPM {shocked['net_profit_margin'][c, year_col]:.2f}% · "
+                f"TIE {shocked['times_interest_earned'][c, year_col]:.2f}x · "
+                f"D/E {shocked['debt_to_equity'][c, year_col]:.2f}"
+            )
+    else:
+        st.caption("Move a slider to see its effect on health and ROE.")
+
+
+@st.fragment
+def narrative_block(render):
+    """Narrative with its own toggle; flipping it reruns only this block"""
+    if st.toggle("Show AI Narratives", value=True, key="show_narratives"):
+        render()
+
+
+def view_option(key: str) -> bool:
+    """Current value of a section toolbar toggle (on until the user turns it off)"""
+    return st.session_state.get(key, True)
+
+
+def forecast_model() -> str:
+    """Forecast model picked in the section toolbar (linear until changed)"""
+    return st.session_state.get('forecast_model', 'linear')
+
+
 # ============================================================================
 # SIDEBAR
 # ============================================================================
@@ -121,30 +199,26 @@ with st.sidebar:
     
     # Year selection
     st.subheader("📅 Time Period")
-    kaynes_years_list = [2022, 2023, 2024, 2025]
+    # Only offer years every company reported
+    trend_years = list(panel.common_years)
     selected_year = st.selectbox(
         "Primary Year",
-        kaynes_years_list,
-        index=3
+        trend_years,
+        index=len(trend_years) - 1
     )
     
-    # Get year index
-    year_idx = kaynes_years_list[::-1].index(selected_year)
-    
-    # Filter options
-    st.subheader("🔍 View Options")
-    show_forecast = st.checkbox("Show Forecasts", value=True)
-    show_benchmark = st.checkbox("Show Industry Benchmarks", value=True)
-    show_narratives = st.checkbox("Show AI Narratives", value=True)
+    # Precomputed KPIs, grades, deltas and narratives for the selected year (dict lookups)
+    kaynes_view = views.get(selected_year, 'kaynes')
+    bel_view = views.get(selected_year, 'bel')
+    trend_cols = [panel.year_column(y) for y in trend_years]
     
     st.markdown("---")
     
     # Quick stats
     st.subheader("📊 Quick Stats")
     
-    # Calculate health scores
-    kaynes_health = calc.calculate_health_score(kaynes_data['ratios'], year_idx)
-    bel_health = calc.calculate_health_score(bel_data['ratios'], year_idx)
+    kaynes_health = kaynes_view.health
+    bel_health = bel_view.health
     
     col1, col2 = st.columns(2)
     with col1:
@@ -153,8 +227,8 @@ with st.sidebar:
         st.metric("BEL Health", f"{bel_health}/100")
     
     # Revenue CAGR
-    kaynes_revenue_cagr = calc.calculate_cagr(kaynes_data['income_statement']['sales_turnover'][::-1])
-    bel_revenue_cagr = calc.calculate_cagr(bel_data['income_statement']['sales_turnover'][::-1])
+    kaynes_revenue_cagr = calc.calculate_cagr(panel.series('kaynes', 'sales_turnover')[::-1])
+    bel_revenue_cagr = calc.calculate_cagr(panel.series('bel', 'sales_turnover')[::-1])
     
     col1, col2 = st.columns(2)
     with col1:
@@ -162,36 +236,43 @@ with st.sidebar:
     with col2:
         st.metric("BEL CAGR", f"{bel_revenue_cagr}%")
     
+    st.markdown("---")
+    
+    # What-if sensitivity (slider moves rerun only this fragment)
+    render_whatif()
+    
     st.markdown("---")
     st.info("💡 **Tip:** Hover over charts for detailed values. Click legend items to toggle visibility.")
 
 # ============================================================================
-# MAIN TABS
+# MAIN SECTIONS (rendered on demand, see SECTION NAVIGATION)
 # ============================================================================
 
-tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-    "📈 Executive Summary",
-    "💧 Liquidity",
-    "🏦 Solvency",
-    "💰 Profitability",
-    "⚡ Efficiency",
-    "🎯 DuPont Analysis",
-    "📊 Comparative Scorecard"
-])
-
 # ============================================================================
-# TAB 1: EXECUTIVE SUMMARY
+# SECTION 1: EXECUTIVE SUMMARY
 # ============================================================================
 
-with tab1:
+# Panel metrics in the executive summary's forecast table
+FORECAST_TABLE_METRICS = {
+    'sales_turnover': "Revenue (₹ Cr)",
+    'net_profit': "Net Profit (₹ Cr)",
+    'eps': "EPS (₹)",
+    'net_profit_margin': "Net Profit Margin (%)",
+    'return_on_assets': "ROA (%)",
+    'current_ratio': "Current Ratio",
+    'debt_to_equity': "Debt-to-Equity"
+}
+
+def render_executive_summary():
+    """Executive Summary section"""
     st.markdown('<p class="section-header">Executive Summary & Key Performance Indicators</p>', unsafe_allow_html=True)
     
     # KPI Cards Row 1
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        kaynes_revenue = kaynes_data['income_statement']['sales_turnover'][year_idx]
-        kaynes_revenue_yoy = calc.calculate_yoy_change(kaynes_data['income_statement']['sales_turnover'], year_idx)
+        kaynes_revenue = kaynes_view.values['sales_turnover']
+        kaynes_revenue_yoy = kaynes_view.deltas['sales_turnover']
         st.metric(
             "Kaynes Revenue",
             f"₹{kaynes_revenue:,.2f} Cr",
@@ -200,8 +281,8 @@ with tab1:
         )
     
     with col2:
-        bel_revenue = bel_data['income_statement']['sales_turnover'][year_idx]
-        bel_revenue_yoy = calc.calculate_yoy_change(bel_data['income_statement']['sales_turnover'], year_idx)
+        bel_revenue = bel_view.values['sales_turnover']
+        bel_revenue_yoy = bel_view.deltas['sales_turnover']
         st.metric(
             "BEL Revenue",
             f"₹{bel_revenue:,.2f} Cr",
@@ -210,8 +291,8 @@ with tab1:
         )
     
     with col3:
-        kaynes_net_profit = kaynes_data['income_statement']['net_profit'][year_idx]
-        kaynes_np_yoy = calc.calculate_yoy_change(kaynes_data['income_statement']['net_profit'], year_idx)
+        kaynes_net_profit = kaynes_view.values['net_profit']
+        kaynes_np_yoy = kaynes_view.deltas['net_profit']
         st.metric(
             "Kaynes Net Profit",
             f"₹{kaynes_net_profit:,.2f} Cr",
@@ -220,8 +301,8 @@ with tab1:
         )
     
     with col4:
-        bel_net_profit = bel_data['income_statement']['net_profit'][year_idx]
-        bel_np_yoy = calc.calculate_yoy_change(bel_data['income_statement']['net_profit'], year_idx)
+        bel_net_profit = bel_view.values['net_profit']
+        bel_np_yoy = bel_view.deltas['net_profit']
         st.metric(
             "BEL Net Profit",
             f"₹{bel_net_profit:,.2f} Cr",
@@ -256,31 +337,26 @@ with tab1:
     col1, col2 = st.columns(2)
     
     with col1:
-        years = kaynes_years_list
-        kaynes_rev = kaynes_data['income_statement']['sales_turnover'][::-1]
-        bel_rev = bel_data['income_statement']['sales_turnover'][-4:][::-1]
-        
-        fig_revenue = charts.create_trend_line(
-            years,
-            kaynes_rev,
-            bel_rev,
+        fig_revenue = charts.create_panel_trend_line(
+            panel,
+            'sales_turnover',
             "Sales Turnover Trend",
             "Revenue (₹ Crores)",
-            show_forecast=show_forecast
+            show_forecast=view_option('show_forecast'),
+            years=trend_years,
+            model=forecast_model()
         )
         st.plotly_chart(fig_revenue, use_container_width=True)
     
     with col2:
-        kaynes_profit = kaynes_data['income_statement']['net_profit'][::-1]
-        bel_profit = bel_data['income_statement']['net_profit'][-4:][::-1]
-        
-        fig_profit = charts.create_trend_line(
-            years,
-            kaynes_profit,
-            bel_profit,
+        fig_profit = charts.create_panel_trend_line(
+            panel,
+            'net_profit',
             "Net Profit Trend",
             "Net Profit (₹ Crores)",
-            show_forecast=show_forecast
+            show_forecast=view_option('show_forecast'),
+            years=trend_years,
+            model=forecast_model()
         )
         st.plotly_chart(fig_profit, use_container_width=True)
     
@@ -290,11 +366,11 @@ with tab1:
     col1, col2 = st.columns(2)
     
     with col1:
-        kaynes_eps = kaynes_data['per_share']['eps'][::-1]
-        bel_eps = bel_data['per_share']['eps'][-4:][::-1]
+        kaynes_eps = panel.series('kaynes', 'eps')[trend_cols]
+        bel_eps = panel.series('bel', 'eps')[trend_cols]
         
         fig_eps = charts.create_comparison_bars(
-            [str(y) for y in years],
+            [str(y) for y in trend_years],
             kaynes_eps,
             bel_eps,
             "Earnings Per Share (EPS) Comparison",
@@ -303,11 +379,11 @@ with tab1:
         st.plotly_chart(fig_eps, use_container_width=True)
     
     with col2:
-        kaynes_bv = kaynes_data['per_share']['book_value'][::-1]
-        bel_bv = bel_data['per_share']['book_value'][-4:][::-1]
+        kaynes_bv = panel.series('kaynes', 'book_value')[trend_cols]
+        bel_bv = panel.series('bel', 'book_value')[trend_cols]
         
         fig_bv = charts.create_comparison_bars(
-            [str(y) for y in years],
+            [str(y) for y in trend_years],
             kaynes_bv,
             bel_bv,
             "Book Value Per Share Comparison",
@@ -315,8 +391,71 @@ with tab1:
         )
         st.plotly_chart(fig_bv, use_container_width=True)
     
+    if view_option('show_forecast'):
+        # Next-year forecasts: the same cached results the dashed trend segments plot
+        model = forecast_model()
+        forecast_year = panel.years[-1] + 1
+        st.markdown(f"### 🔮 FY{forecast_year} Forecasts ({MODEL_LABELS[model]})")
+        
+        forecast_rows = []
+        for metric, label in FORECAST_TABLE_METRICS.items():
+            result = forecast_panel(panel, metric, model=model)
+            row = {'Metric': label}
+            for company, name in (('kaynes', "Kaynes"), ('bel', "BEL")):
+                i = panel.company_index[company]
+                point, lower, upper = result.point[i, 0], result.lower[i, 0], result.upper[i, 0]
+                row[name] = "N/A" if np.isnan(point) else f"{point:,.2f}"
+                row[f"{name} {result.level:.0%} Interval"] = (
+                    "N/A" if np.isnan(lower) else f"{lower:,.2f} – {upper:,.2f}"
+                )
+            forecast_rows.append(row)
+        st.markdown(pd.DataFrame(forecast_rows).to_html(index=False, escape=False), unsafe_allow_html=True)
+        st.caption("Fitted on every reported year; each company's interval is its own prediction interval.")
+        
+        # Scenario Simulation
+        st.markdown("### 🎲 Scenario Simulation")
+        
+        scenario_metrics = {
+            'revenue': ("Revenue", 'sales_turnover', "Revenue (₹ Crores)"),
+            'net_profit': ("Net Profit", 'net_profit', "Net Profit (₹ Crores)"),
+            'eps': ("EPS", 'eps', "EPS (₹)"),
+            'health_score': ("Health Score", None, "Health Score (0-100)")
+        }
+        scenario_metric = st.selectbox(
+            "Simulated metric",
+            list(scenario_metrics),
+            format_func=lambda m: scenario_metrics[m][0]
+        )
+        label, panel_metric, axis_title = scenario_metrics[scenario_metric]
+        health_history = views.health
+        
+        col1, col2 = st.columns(2)
+        for col, company, name in [(col1, 'kaynes', "Kaynes"), (col2, 'bel', "BEL")]:
+            with col:
+                scenarios = simulate_scenarios(panel, panel.digest, company)
+                history_years = list(panel.company_years(company))
+                history_cols = [panel.year_column(y) for y in history_years]
+                if panel_metric is None:
+                    history = health_history[panel.company_index[company], history_cols]
+                else:
+                    history = panel.series(company, panel_metric)[history_cols]
+                
+                fig_scenario = charts.create_fan_chart(
+                    history_years,
+                    history,
+                    scenarios.years,
+                    scenarios.bands[scenario_metric],
+                    f"{name} {label}: {scenarios.paths:,} Simulated Paths",
+                    axis_title,
+                    name,
+                    color=COMPANY_COLORS[company]
+                )
+                st.plotly_chart(fig_scenario, use_container_width=True)
+        
+        st.caption("Shaded band: 5th-95th percentile of simulated growth and margin paths; dashed line: median.")
+    
     # AI Narrative
-    if show_narratives:
+    def narrative():
         st.info(f"""
         **📝 AI Analysis for {selected_year}:**
         
@@ -325,12 +464,20 @@ with tab1:
         - **BEL** maintains stable operations with {bel_revenue_yoy:+.1f}% revenue growth, reflecting its position as an established industry leader.
         - Kaynes demonstrates higher volatility but stronger growth trajectory, while BEL offers stability with consistent performance.
         """)
+        
+        # Per-metric sentences, pre-rendered once per dataset
+        for view in (kaynes_view, bel_view):
+            if view.narratives:
+                st.markdown("\n".join(f"- {text}" for text in view.narratives))
+    
+    narrative_block(narrative)
 
 # ============================================================================
-# TAB 2: LIQUIDITY ANALYSIS
+# SECTION 2: LIQUIDITY ANALYSIS
 # ============================================================================
 
-with tab2:
+def render_liquidity():
+    """Liquidity section"""
     st.markdown('<p class="section-header">Liquidity Ratios Analysis</p>', unsafe_allow_html=True)
     
     st.info("""
@@ -344,33 +491,33 @@ with tab2:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        kaynes_cr = kaynes_data['ratios']['current_ratio'][year_idx]
-        grade_cr_k = calc.grade_ratio('current_ratio', kaynes_cr)
+        kaynes_cr = kaynes_view.values['current_ratio']
+        grade_cr_k = kaynes_view.grades['current_ratio']
         st.metric("Kaynes Current Ratio", f"{kaynes_cr:.2f}", f"Grade: {grade_cr_k}")
     
     with col2:
-        kaynes_qr = kaynes_data['ratios']['quick_ratio'][year_idx]
-        grade_qr_k = calc.grade_ratio('quick_ratio', kaynes_qr)
+        kaynes_qr = kaynes_view.values['quick_ratio']
+        grade_qr_k = kaynes_view.grades['quick_ratio']
         st.metric("Kaynes Quick Ratio", f"{kaynes_qr:.2f}", f"Grade: {grade_qr_k}")
     
     with col3:
-        kaynes_cashr = kaynes_data['ratios']['cash_ratio'][year_idx]
+        kaynes_cashr = kaynes_view.values['cash_ratio']
         st.metric("Kaynes Cash Ratio", f"{kaynes_cashr:.2f}")
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        bel_cr = bel_data['ratios']['current_ratio'][year_idx]
-        grade_cr_b = calc.grade_ratio('current_ratio', bel_cr)
+        bel_cr = bel_view.values['current_ratio']
+        grade_cr_b = bel_view.grades['current_ratio']
         st.metric("BEL Current Ratio", f"{bel_cr:.2f}", f"Grade: {grade_cr_b}")
     
     with col2:
-        bel_qr = bel_data['ratios']['quick_ratio'][year_idx]
-        grade_qr_b = calc.grade_ratio('quick_ratio', bel_qr)
+        bel_qr = bel_view.values['quick_ratio']
+        grade_qr_b = bel_view.grades['quick_ratio']
         st.metric("BEL Quick Ratio", f"{bel_qr:.2f}", f"Grade: {grade_qr_b}")
     
     with col3:
-        bel_cashr = bel_data['ratios']['cash_ratio'][year_idx]
+        bel_cashr = bel_view.values['cash_ratio']
         st.metric("BEL Cash Ratio", f"{bel_cashr:.2f}")
     
     st.markdown("---")
@@ -379,30 +526,26 @@ with tab2:
     col1, col2 = st.columns(2)
     
     with col1:
-        kaynes_cr_trend = kaynes_data['ratios']['current_ratio'][::-1]
-        bel_cr_trend = bel_data['ratios']['current_ratio'][-4:][::-1]
-        
-        fig_cr_trend = charts.create_trend_line(
-            years,
-            kaynes_cr_trend,
-            bel_cr_trend,
+        fig_cr_trend = charts.create_panel_trend_line(
+            panel,
+            'current_ratio',
             "Current Ratio Trend",
             "Current Ratio",
-            show_forecast=show_forecast
+            show_forecast=view_option('show_forecast'),
+            years=trend_years,
+            model=forecast_model()
         )
         st.plotly_chart(fig_cr_trend, use_container_width=True)
     
     with col2:
-        kaynes_qr_trend = kaynes_data['ratios']['quick_ratio'][::-1]
-        bel_qr_trend = bel_data['ratios']['quick_ratio'][-4:][::-1]
-        
-        fig_qr_trend = charts.create_trend_line(
-            years,
-            kaynes_qr_trend,
-            bel_qr_trend,
+        fig_qr_trend = charts.create_panel_trend_line(
+            panel,
+            'quick_ratio',
             "Quick Ratio Trend",
             "Quick Ratio",
-            show_forecast=show_forecast
+            show_forecast=view_option('show_forecast'),
+            years=trend_years,
+            model=forecast_model()
         )
         st.plotly_chart(fig_qr_trend, use_container_width=True)
     
@@ -419,7 +562,7 @@ with tab2:
     )
     st.plotly_chart(fig_radar, use_container_width=True)
     
-    if show_narratives:
+    def narrative():
         kaynes_strength = "strong" if kaynes_cr > 2 else ("adequate" if kaynes_cr > 1.5 else "weak")
         bel_strength = "healthy" if bel_cr > 1.5 else "moderate"
         better_quick = "Kaynes" if kaynes_qr > bel_qr else "BEL"
@@ -429,12 +572,15 @@ with tab2:
         - BEL's Current Ratio of {bel_cr:.2f} indicates {bel_strength} short-term financial strength.
         - {better_quick} demonstrates superior quick liquidity with better ability to meet immediate obligations.
         """)
+    
+    narrative_block(narrative)
 
 # ============================================================================
-# TAB 3: SOLVENCY ANALYSIS
+# SECTION 3: SOLVENCY ANALYSIS
 # ============================================================================
 
-with tab3:
+def render_solvency():
+    """Solvency section"""
     st.markdown('<p class="section-header">Solvency Ratios Analysis</p>', unsafe_allow_html=True)
     
     st.info("""
@@ -448,32 +594,32 @@ with tab3:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        kaynes_de = kaynes_data['ratios']['debt_to_equity'][year_idx]
-        grade_de_k = calc.grade_ratio('debt_to_equity', kaynes_de)
+        kaynes_de = kaynes_view.values['debt_to_equity']
+        grade_de_k = kaynes_view.grades['debt_to_equity']
         st.metric("Kaynes D/E Ratio", f"{kaynes_de:.2f}", f"Grade: {grade_de_k}")
     
     with col2:
-        kaynes_tie = kaynes_data['ratios']['times_interest_earned'][year_idx]
-        grade_tie_k = calc.grade_ratio('times_interest_earned', kaynes_tie)
+        kaynes_tie = kaynes_view.values['times_interest_earned']
+        grade_tie_k = kaynes_view.grades['times_interest_earned']
         st.metric("Kaynes TIE", f"{kaynes_tie:.2f}x", f"Grade: {grade_tie_k}")
     
     with col3:
-        st.metric("Kaynes Debt Ratio", f"{kaynes_data['ratios']['debt_ratio'][year_idx]:.2f}")
+        st.metric("Kaynes Debt Ratio", f"{kaynes_view.values['debt_ratio']:.2f}")
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        bel_de = bel_data['ratios']['debt_to_equity'][year_idx]
-        grade_de_b = calc.grade_ratio('debt_to_equity', bel_de)
+        bel_de = bel_view.values['debt_to_equity']
+        grade_de_b = bel_view.grades['debt_to_equity']
         st.metric("BEL D/E Ratio", f"{bel_de:.2f}", f"Grade: {grade_de_b}")
     
     with col2:
-        bel_tie = bel_data['ratios']['times_interest_earned'][year_idx]
-        grade_tie_b = calc.grade_ratio('times_interest_earned', bel_tie)
+        bel_tie = bel_view.values['times_interest_earned']
+        grade_tie_b = bel_view.grades['times_interest_earned']
         st.metric("BEL TIE", f"{bel_tie:.2f}x", f"Grade: {grade_tie_b}")
     
     with col3:
-        st.metric("BEL Debt Ratio", f"{bel_data['ratios']['debt_ratio'][year_idx]:.2f}")
+        st.metric("BEL Debt Ratio", f"{bel_view.values['debt_ratio']:.2f}")
     
     st.markdown("---")
     
@@ -481,34 +627,53 @@ with tab3:
     col1, col2 = st.columns(2)
     
     with col1:
-        kaynes_de_trend = kaynes_data['ratios']['debt_to_equity'][::-1]
-        bel_de_trend = bel_data['ratios']['debt_to_equity'][-4:][::-1]
+        kaynes_de_trend = panel.series('kaynes', 'debt_to_equity')[trend_cols]
         
-        fig_de = charts.create_trend_line(
-            years,
-            kaynes_de_trend,
-            bel_de_trend,
+        fig_de = charts.create_panel_trend_line(
+            panel,
+            'debt_to_equity',
             "Debt-to-Equity Trend",
             "D/E Ratio",
-            show_forecast=show_forecast
+            show_forecast=view_option('show_forecast'),
+            years=trend_years,
+            model=forecast_model()
         )
         st.plotly_chart(fig_de, use_container_width=True)
     
     with col2:
-        kaynes_tie_trend = kaynes_data['ratios']['times_interest_earned'][::-1]
-        bel_tie_trend = bel_data['ratios']['times_interest_earned'][-4:][::-1]
-        
-        fig_tie = charts.create_trend_line(
-            years,
-            kaynes_tie_trend,
-            bel_tie_trend,
+        fig_tie = charts.create_panel_trend_line(
+            panel,
+            'times_interest_earned',
             "Times Interest Earned Trend",
             "TIE (times)",
-            show_forecast=show_forecast
+            show_forecast=view_option('show_forecast'),
+            years=trend_years,
+            model=forecast_model()
         )
         st.plotly_chart(fig_tie, use_container_width=True)
+
+    # Altman Z-score (every company x year in one pass)
+    st.markdown("### 🚦 Altman Z-Score")
+    altman = altman_analysis(panel)
+    z_cols = st.columns(len(panel.companies))
+    for col, (company, name) in zip(z_cols, [('kaynes', "Kaynes"), ('bel', "BEL")]):
+        with col:
+            z_score = altman.score(company, selected_year)
+            st.metric(f"{name} {MODELS[altman.model(company)].name}",
+                      "N/A" if np.isnan(z_score) else f"{z_score:.2f}",
+                      f"Zone: {altman.zone(company, selected_year).title()}",
+                      delta_color="off")
+
+    fig_z = charts.create_trend_line(
+        trend_years,
+        altman.scores['score'][panel.company_index['kaynes'], trend_cols],
+        altman.scores['score'][panel.company_index['bel'], trend_cols],
+        "Altman Z-Score Trend (book-value equity)",
+        "Z-Score"
+    )
+    st.plotly_chart(fig_z, use_container_width=True)
     
-    if show_narratives:
+    def narrative():
         better_de = "Kaynes" if kaynes_de < bel_de else "BEL"
         better_tie = "Kaynes" if kaynes_tie > bel_tie else "BEL"
         st.success(f"""
@@ -517,12 +682,15 @@ with tab3:
         - {better_tie} demonstrates stronger interest coverage capability.
         - {"Kaynes has reduced debt" if len(kaynes_de_trend) > 1 and kaynes_de_trend[-1] < kaynes_de_trend[0] else "Kaynes maintains stable debt"} over the period.
         """)
+    
+    narrative_block(narrative)
 
 # ============================================================================
-# TAB 4: PROFITABILITY ANALYSIS
+# SECTION 4: PROFITABILITY ANALYSIS
 # ============================================================================
 
-with tab4:
+def render_profitability():
+    """Profitability section"""
     st.markdown('<p class="section-header">Profitability Ratios Analysis</p>', unsafe_allow_html=True)
     
     st.info("""
@@ -537,38 +705,38 @@ with tab4:
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        kaynes_gpm = kaynes_data['ratios']['gross_profit_margin'][year_idx]
-        st.metric("Kaynes GPM", f"{kaynes_gpm:.2f}%", calc.grade_ratio('gross_profit_margin', kaynes_gpm))
+        kaynes_gpm = kaynes_view.values['gross_profit_margin']
+        st.metric("Kaynes GPM", f"{kaynes_gpm:.2f}%", kaynes_view.grades['gross_profit_margin'])
     
     with col2:
-        kaynes_opm = kaynes_data['ratios']['operating_profit_margin'][year_idx]
-        st.metric("Kaynes OPM", f"{kaynes_opm:.2f}%", calc.grade_ratio('operating_profit_margin', kaynes_opm))
+        kaynes_opm = kaynes_view.values['operating_profit_margin']
+        st.metric("Kaynes OPM", f"{kaynes_opm:.2f}%", kaynes_view.grades['operating_profit_margin'])
     
     with col3:
-        kaynes_npm = kaynes_data['ratios']['net_profit_margin'][year_idx]
-        st.metric("Kaynes NPM", f"{kaynes_npm:.2f}%", calc.grade_ratio('net_profit_margin', kaynes_npm))
+        kaynes_npm = kaynes_view.values['net_profit_margin']
+        st.metric("Kaynes NPM", f"{kaynes_npm:.2f}%", kaynes_view.grades['net_profit_margin'])
     
     with col4:
-        kaynes_roa = kaynes_data['ratios']['return_on_assets'][year_idx]
-        st.metric("Kaynes ROA", f"{kaynes_roa:.2f}%", calc.grade_ratio('return_on_assets', kaynes_roa))
+        kaynes_roa = kaynes_view.values['return_on_assets']
+        st.metric("Kaynes ROA", f"{kaynes_roa:.2f}%", kaynes_view.grades['return_on_assets'])
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        bel_gpm = bel_data['ratios']['gross_profit_margin'][year_idx]
-        st.metric("BEL GPM", f"{bel_gpm:.2f}%", calc.grade_ratio('gross_profit_margin', bel_gpm))
+        bel_gpm = bel_view.values['gross_profit_margin']
+        st.metric("BEL GPM", f"{bel_gpm:.2f}%", bel_view.grades['gross_profit_margin'])
     
     with col2:
-        bel_opm = bel_data['ratios']['operating_profit_margin'][year_idx]
-        st.metric("BEL OPM", f"{bel_opm:.2f}%", calc.grade_ratio('operating_profit_margin', bel_opm))
+        bel_opm = bel_view.values['operating_profit_margin']
+        st.metric("BEL OPM", f"{bel_opm:.2f}%", bel_view.grades['operating_profit_margin'])
     
     with col3:
-        bel_npm = bel_data['ratios']['net_profit_margin'][year_idx]
-        st.metric("BEL NPM", f"{bel_npm:.2f}%", calc.grade_ratio('net_profit_margin', bel_npm))
+        bel_npm = bel_view.values['net_profit_margin']
+        st.metric("BEL NPM", f"{bel_npm:.2f}%", bel_view.grades['net_profit_margin'])
     
     with col4:
-        bel_roa = bel_data['ratios']['return_on_assets'][year_idx]
-        st.metric("BEL ROA", f"{bel_roa:.2f}%", calc.grade_ratio('return_on_assets', bel_roa))
+        bel_roa = bel_view.values['return_on_assets']
+        st.metric("BEL ROA", f"{bel_roa:.2f}%", bel_view.grades['return_on_assets'])
     
     st.markdown("---")
     
@@ -607,34 +775,66 @@ with tab4:
     col1, col2 = st.columns(2)
     
     with col1:
-        kaynes_npm_trend = kaynes_data['ratios']['net_profit_margin'][::-1]
-        bel_npm_trend = bel_data['ratios']['net_profit_margin'][-4:][::-1]
+        kaynes_npm_trend = panel.series('kaynes', 'net_profit_margin')[trend_cols]
         
-        fig_npm = charts.create_trend_line(
-            years,
-            kaynes_npm_trend,
-            bel_npm_trend,
+        fig_npm = charts.create_panel_trend_line(
+            panel,
+            'net_profit_margin',
             "Net Profit Margin Trend",
             "NPM (%)",
-            show_forecast=show_forecast
+            show_forecast=view_option('show_forecast'),
+            years=trend_years,
+            model=forecast_model()
         )
         st.plotly_chart(fig_npm, use_container_width=True)
     
     with col2:
-        kaynes_roa_trend = kaynes_data['ratios']['return_on_assets'][::-1]
-        bel_roa_trend = bel_data['ratios']['return_on_assets'][-4:][::-1]
-        
-        fig_roa = charts.create_trend_line(
-            years,
-            kaynes_roa_trend,
-            bel_roa_trend,
+        fig_roa = charts.create_panel_trend_line(
+            panel,
+            'return_on_assets',
             "Return on Assets Trend",
             "ROA (%)",
-            show_forecast=show_forecast
+            show_forecast=view_option('show_forecast'),
+            years=trend_years,
+            model=forecast_model()
         )
         st.plotly_chart(fig_roa, use_container_width=True)
-    
-    if show_narratives:
+
+    # Rolling analytics (one sliding-window pass over every company)
+    st.markdown("### 📉 Rolling Analytics")
+    sales_cagr = rolling_cagr(panel.metric('sales_turnover'), 2)
+    npm_volatility = rolling_std(panel.metric('net_profit_margin'), 3, min_periods=2)
+    profit_drawdown = max_drawdown(np.where(panel.mask, panel.metric('net_profit'), np.nan))
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig_cagr = charts.create_trend_line(
+            trend_years,
+            sales_cagr[panel.company_index['kaynes'], trend_cols],
+            sales_cagr[panel.company_index['bel'], trend_cols],
+            "Rolling 2-Year Revenue CAGR",
+            "CAGR (%)"
+        )
+        st.plotly_chart(fig_cagr, use_container_width=True)
+
+    with col2:
+        fig_vol = charts.create_trend_line(
+            trend_years,
+            npm_volatility[panel.company_index['kaynes'], trend_cols],
+            npm_volatility[panel.company_index['bel'], trend_cols],
+            "Net Margin Volatility (3-Year Rolling Std)",
+            "Std Dev (pp)"
+        )
+        st.plotly_chart(fig_vol, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Kaynes Max Profit Drawdown", f"{profit_drawdown[panel.company_index['kaynes']]:.1%}")
+    with col2:
+        st.metric("BEL Max Profit Drawdown", f"{profit_drawdown[panel.company_index['bel']]:.1%}")
+
+    def narrative():
         better_npm = "Kaynes" if kaynes_npm > bel_npm else "BEL"
         better_roa = "Kaynes" if kaynes_roa > bel_roa else "BEL"
         st.success(f"""
@@ -643,12 +843,15 @@ with tab4:
         - {better_roa} demonstrates superior asset utilization with {kaynes_roa if better_roa == "Kaynes" else bel_roa:.2f}% ROA.
         - Both companies show {"improving" if kaynes_npm_trend[-1] > kaynes_npm_trend[0] else "stable"} profitability trends.
         """)
+    
+    narrative_block(narrative)
 
 # ============================================================================
-# TAB 5: EFFICIENCY ANALYSIS
+# SECTION 5: EFFICIENCY ANALYSIS
 # ============================================================================
 
-with tab5:
+def render_efficiency():
+    """Efficiency section"""
     st.markdown('<p class="section-header">Efficiency Ratios Analysis</p>', unsafe_allow_html=True)
     
     st.info("""
@@ -662,22 +865,22 @@ with tab5:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        kaynes_it = kaynes_data['ratios']['inventory_turnover'][year_idx]
-        if kaynes_it:
+        kaynes_it = kaynes_view.values['inventory_turnover']
+        if not np.isnan(kaynes_it):
             st.metric("Kaynes Inv. Turnover", f"{kaynes_it:.2f}x")
         else:
             st.metric("Kaynes Inv. Turnover", "N/A")
     
     with col2:
-        kaynes_rt = kaynes_data['ratios']['receivables_turnover'][year_idx]
-        if kaynes_rt:
+        kaynes_rt = kaynes_view.values['receivables_turnover']
+        if not np.isnan(kaynes_rt):
             st.metric("Kaynes Recv. Turnover", f"{kaynes_rt:.2f}x")
         else:
             st.metric("Kaynes Recv. Turnover", "N/A")
     
     with col3:
-        kaynes_at = kaynes_data['ratios']['asset_turnover'][year_idx]
-        if kaynes_at:
+        kaynes_at = kaynes_view.values['asset_turnover']
+        if not np.isnan(kaynes_at):
             st.metric("Kaynes Asset Turnover", f"{kaynes_at:.2f}x")
         else:
             st.metric("Kaynes Asset Turnover", "N/A")
@@ -685,22 +888,22 @@ with tab5:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        bel_it = bel_data['ratios']['inventory_turnover'][year_idx]
-        if bel_it:
+        bel_it = bel_view.values['inventory_turnover']
+        if not np.isnan(bel_it):
             st.metric("BEL Inv. Turnover", f"{bel_it:.2f}x")
         else:
             st.metric("BEL Inv. Turnover", "N/A")
     
     with col2:
-        bel_rt = bel_data['ratios']['receivables_turnover'][year_idx]
-        if bel_rt:
+        bel_rt = bel_view.values['receivables_turnover']
+        if not np.isnan(bel_rt):
             st.metric("BEL Recv. Turnover", f"{bel_rt:.2f}x")
         else:
             st.metric("BEL Recv. Turnover", "N/A")
     
     with col3:
-        bel_at = bel_data['ratios']['asset_turnover'][year_idx]
-        if bel_at:
+        bel_at = bel_view.values['asset_turnover']
+        if not np.isnan(bel_at):
             st.metric("BEL Asset Turnover", f"{bel_at:.2f}x")
         else:
             st.metric("BEL Asset Turnover", "N/A")
@@ -709,8 +912,8 @@ with tab5:
     
     # Radar chart for efficiency
     efficiency_cats = ['Inventory Turnover', 'Receivables Turnover', 'Asset Turnover']
-    kaynes_eff = [kaynes_it or 0, kaynes_rt or 0, kaynes_at or 0]
-    bel_eff = [bel_it or 0, bel_rt or 0, bel_at or 0]
+    kaynes_eff = list(np.nan_to_num([kaynes_it, kaynes_rt, kaynes_at]))
+    bel_eff = list(np.nan_to_num([bel_it, bel_rt, bel_at]))
     
     fig_eff_radar = charts.create_radar_chart(
         efficiency_cats,
@@ -721,10 +924,11 @@ with tab5:
     st.plotly_chart(fig_eff_radar, use_container_width=True)
 
 # ============================================================================
-# TAB 6: DUPONT ANALYSIS
+# SECTION 6: DUPONT ANALYSIS
 # ============================================================================
 
-with tab6:
+def render_dupont():
+    """DuPont Analysis section"""
     st.markdown('<p class="section-header">DuPont Framework Analysis</p>', unsafe_allow_html=True)
     
     st.info("""
@@ -733,20 +937,17 @@ with tab6:
     - **5-Point DuPont**: ROE = Tax Burden × Interest Burden × EBIT Margin × Asset Turnover × Equity Multiplier
     """)
     
+    # Every factor for every company and year, derived once per dataset
+    dupont = dupont_analysis(panel)
+    
     # 3-Point DuPont for Kaynes
     st.markdown("### 📊 3-Point DuPont - Kaynes Technology")
     
-    kaynes_npm_dupont = kaynes_data['ratios']['net_profit_margin'][year_idx] / 100
-    kaynes_at_dupont = kaynes_data['ratios']['asset_turnover'][year_idx] or 0.64
-    kaynes_em = 1.0  # Assuming equity multiplier
-    kaynes_roe_3pt = kaynes_npm_dupont * kaynes_at_dupont * kaynes_em
-    
-    kaynes_dupont_3pt = {
-        'Net Margin': kaynes_npm_dupont,
-        'Asset Turnover': kaynes_at_dupont,
-        'Equity Multiplier': kaynes_em,
-        'ROE': kaynes_roe_3pt
-    }
+    kaynes_dupont_3pt = dupont.components('kaynes', selected_year)
+    kaynes_npm_dupont = kaynes_dupont_3pt['Net Margin']
+    kaynes_at_dupont = kaynes_dupont_3pt['Asset Turnover']
+    kaynes_em = kaynes_dupont_3pt['Equity Multiplier']
+    kaynes_roe_3pt = kaynes_dupont_3pt['ROE']
     
     fig_dupont_k = charts.create_dupont_waterfall(kaynes_dupont_3pt, "Kaynes 3-Point DuPont Decomposition")
     st.plotly_chart(fig_dupont_k, use_container_width=True)
@@ -754,21 +955,32 @@ with tab6:
     # 3-Point DuPont for BEL
     st.markdown("### 📊 3-Point DuPont - BEL")
     
-    bel_npm_dupont = bel_data['ratios']['net_profit_margin'][year_idx] / 100
-    bel_at_dupont = bel_data['ratios']['asset_turnover'][year_idx] or 1.32
-    bel_em = bel_data['ratios'].get('equity_multiplier', [1.0])[year_idx]
-    bel_roe_3pt = bel_npm_dupont * bel_at_dupont * bel_em
-    
-    bel_dupont_3pt = {
-        'Net Margin': bel_npm_dupont,
-        'Asset Turnover': bel_at_dupont,
-        'Equity Multiplier': bel_em,
-        'ROE': bel_roe_3pt
-    }
+    bel_dupont_3pt = dupont.components('bel', selected_year)
+    bel_npm_dupont = bel_dupont_3pt['Net Margin']
+    bel_at_dupont = bel_dupont_3pt['Asset Turnover']
+    bel_em = bel_dupont_3pt['Equity Multiplier']
+    bel_roe_3pt = bel_dupont_3pt['ROE']
     
     fig_dupont_b = charts.create_dupont_waterfall(bel_dupont_3pt, "BEL 3-Point DuPont Decomposition")
     st.plotly_chart(fig_dupont_b, use_container_width=True)
     
+    # 5-Point DuPont for both companies
+    st.markdown("### 🔬 5-Point DuPont Decomposition")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig_dupont5_k = charts.create_dupont_waterfall(
+            dupont.components('kaynes', selected_year, points=5), "Kaynes 5-Point DuPont"
+        )
+        st.plotly_chart(fig_dupont5_k, use_container_width=True)
+    
+    with col2:
+        fig_dupont5_b = charts.create_dupont_waterfall(
+            dupont.components('bel', selected_year, points=5), "BEL 5-Point DuPont"
+        )
+        st.plotly_chart(fig_dupont5_b, use_container_width=True)
+    
     # Component comparison
     st.markdown("### 📈 DuPont Components Comparison")
     
@@ -800,7 +1012,7 @@ with tab6:
         st.metric("Financial Leverage", f"{bel_em:.2f}x")
         st.caption("Equity Multiplier")
     
-    if show_narratives:
+    def narrative():
         better_roe = "Kaynes" if kaynes_roe_3pt > bel_roe_3pt else "BEL"
         st.success(f"""
         **🎯 DuPont Analysis Insights:**
@@ -808,64 +1020,68 @@ with tab6:
         - BEL's higher profit margins ({bel_npm_dupont*100:.2f}% vs {kaynes_npm_dupont*100:.2f}%) reflect operational maturity.
         - Kaynes shows potential for ROE improvement through margin expansion and asset optimization.
         """)
+    
+    narrative_block(narrative)
 
 # ============================================================================
-# TAB 7: COMPARATIVE SCORECARD
+# SECTION 7: COMPARATIVE SCORECARD
 # ============================================================================
 
-with tab7:
+def render_scorecard():
+    """Comparative Scorecard section"""
     st.markdown('<p class="section-header">Comparative Financial Scorecard</p>', unsafe_allow_html=True)
     
-    # Create comprehensive scorecard
+    # Create comprehensive scorecard (cells pre-formatted per company and year)
     scorecard_data = {
-        'Metric': [
-            'Current Ratio',
-            'Quick Ratio',
-            'Debt-to-Equity',
-            'Times Interest Earned',
-            'Gross Profit Margin (%)',
-            'Net Profit Margin (%)',
-            'Return on Assets (%)',
-            'Asset Turnover',
-            'Revenue (₹ Cr)',
-            'Net Profit (₹ Cr)',
-            'EPS (₹)',
-            'Book Value (₹)'
-        ],
-        'Kaynes Value': [
-            f"{kaynes_data['ratios']['current_ratio'][year_idx]:.2f}",
-            f"{kaynes_data['ratios']['quick_ratio'][year_idx]:.2f}",
-            f"{kaynes_data['ratios']['debt_to_equity'][year_idx]:.2f}",
-            f"{kaynes_data['ratios']['times_interest_earned'][year_idx]:.2f}",
-            f"{kaynes_data['ratios']['gross_profit_margin'][year_idx]:.2f}",
-            f"{kaynes_data['ratios']['net_profit_margin'][year_idx]:.2f}",
-            f"{kaynes_data['ratios']['return_on_assets'][year_idx]:.2f}",
-            f"{kaynes_data['ratios']['asset_turnover'][year_idx] or 'N/A'}",
-            f"{kaynes_data['income_statement']['sales_turnover'][year_idx]:,.2f}",
-            f"{kaynes_data['income_statement']['net_profit'][year_idx]:,.2f}",
-            f"{kaynes_data['per_share']['eps'][year_idx]:.2f}",
-            f"{kaynes_data['per_share']['book_value'][year_idx]:.2f}"
-        ],
-        'BEL Value': [
-            f"{bel_data['ratios']['current_ratio'][year_idx]:.2f}",
-            f"{bel_data['ratios']['quick_ratio'][year_idx]:.2f}",
-            f"{bel_data['ratios']['debt_to_equity'][year_idx]:.2f}",
-            f"{bel_data['ratios']['times_interest_earned'][year_idx]:.2f}",
-            f"{bel_data['ratios']['gross_profit_margin'][year_idx]:.2f}",
-            f"{bel_data['ratios']['net_profit_margin'][year_idx]:.2f}",
-            f"{bel_data['ratios']['return_on_assets'][year_idx]:.2f}",
-            f"{bel_data['ratios']['asset_turnover'][year_idx] or 'N/A'}",
-            f"{bel_data['income_statement']['sales_turnover'][year_idx]:,.2f}",
-            f"{bel_data['income_statement']['net_profit'][year_idx]:,.2f}",
-            f"{bel_data['per_share']['eps'][year_idx]:.2f}",
-            f"{bel_data['per_share']['book_value'][year_idx]:.2f}"
-        ]
+        'Metric': [label for label, _, _ in SCORECARD_ROWS],
+        'Kaynes Value': kaynes_view.scorecard,
+        'BEL Value': bel_view.scorecard
     }
     
     scorecard_df = pd.DataFrame(scorecard_data)
     
     # Display as HTML table (doesn't require PyArrow)
     st.markdown(scorecard_df.to_html(index=False, escape=False), unsafe_allow_html=True)
+
+    # Earnings quality (Piotroski / Beneish for every company x year, cached per dataset)
+    st.markdown("### 🔍 Earnings Quality")
+    quality = earnings_quality(panel)
+    quality_rows = []
+    for company, name in [('kaynes', "Kaynes"), ('bel', "BEL")]:
+        summary = quality.summary(company, selected_year)
+        quality_rows.append({
+            'Company': name,
+            'Piotroski F-Score': "N/A" if np.isnan(summary['fscore']) else f"{summary['fscore']:.0f} / 9 ({summary['strength']})",
+            'Beneish M-Score': "N/A" if np.isnan(summary['mscore']) else f"{summary['mscore']:.2f}",
+            'Manipulation Risk': summary['manipulation_risk'].title()
+        })
+    st.markdown(pd.DataFrame(quality_rows).to_html(index=False, escape=False), unsafe_allow_html=True)
+    st.caption(f"F-Score needs two prior years of statements; M-Score above {BENEISH_THRESHOLD} flags likely earnings manipulation.")
+
+    # Peer discovery on normalized ratio vectors
+    st.markdown("### 🧭 Peer Similarity")
+    peers = peer_index(panel)
+    if not peers.comparable(selected_year):
+        # Median/IQR scaling over two companies puts every ratio at +-1, so distances say nothing
+        st.info(f"Peer similarity needs ≥{MIN_PEER_COMPANIES} reporting companies; "
+                f"{peers.reporting_count(selected_year)} reported FY{selected_year}.")
+    else:
+        year_col = panel.year_column(selected_year)
+        peer_company = st.selectbox(
+            "Find peers for",
+            [c for c in panel.companies if panel.mask[panel.company_index[c], year_col]],
+            format_func=lambda c: panel.info[c].get('company', c),
+            key="peer_company"
+        )
+        nearest_peers = peers.nearest(peer_company, selected_year, k=5)
+        peer_rows = []
+        for peer, distance in nearest_peers:
+            row = {'Peer': panel.info[peer].get('company', peer), 'Distance': f"{distance:.2f}"}
+            row.update({pillar.title(): f"{gap:.2f}"
+                        for pillar, gap in peers.pillar_gaps(peer_company, peer, selected_year).items()})
+            peer_rows.append(row)
+        st.markdown(pd.DataFrame(peer_rows).to_html(index=False, escape=False), unsafe_allow_html=True)
+        st.caption("Distance over median/IQR-scaled liquidity, solvency, profitability, efficiency and growth ratios; lower is more similar.")
     
     # Winner analysis
     st.markdown("### 🏆 Performance Winners")
@@ -890,6 +1106,65 @@ with tab7:
         - ✅ Exceptional interest coverage
         """)
 
+# ============================================================================
+# SECTION NAVIGATION
+# ============================================================================
+
+# Only the active section runs, so a rerun pays for one section, not seven
+SECTIONS = {
+    "📈 Executive Summary": render_executive_summary,
+    "💧 Liquidity": render_liquidity,
+    "🏦 Solvency": render_solvency,
+    "💰 Profitability": render_profitability,
+    "⚡ Efficiency": render_efficiency,
+    "🎯 DuPont Analysis": render_dupont,
+    "📊 Comparative Scorecard": render_scorecard
+}
+
+@st.fragment
+def render_active_section():
+    """
+    Section picker, view toggles and the active section
+    
+    Changing any of them reruns only this fragment; the CSS, data load,
+    sidebar stats and what-if panel are left as they are.
+    """
+    active_section = st.radio(
+        "Section",
+        list(SECTIONS),
+        horizontal=True,
+        key="active_section",
+        label_visibility="collapsed"
+    )
+    toggle_cols = st.columns(3)
+    with toggle_cols[0]:
+        st.toggle("Show Forecasts", value=True, key="show_forecast")
+    with toggle_cols[1]:
+        st.toggle("Show Industry Benchmarks", value=True, key="show_benchmark")
+    with toggle_cols[2]:
+        st.selectbox(
+            "Forecast Model",
+            list(MODEL_LABELS),
+            format_func=lambda m: MODEL_LABELS[m],
+            key="forecast_model"
+        )
+    
+    section_start = time.perf_counter()
+    SECTIONS[active_section]()
+    section_ms = (time.perf_counter() - section_start) * 1000
+    
+    # Last measured render time of every section visited this session
+    section_timings = st.session_state.setdefault('section_timings', {})
+    section_timings[active_section] = section_ms
+    st.caption(
+        f"⏱️ {active_section} rendered in {section_ms:.0f} ms"
+        + (f" (all {len(SECTIONS)} sections eagerly: ~{sum(section_timings.values()):.0f} ms from "
+           f"{len(section_timings)} measured)" if len(section_timings) > 1 else "")
+    )
+
+
+render_active_section()
+
 # ============================================================================
 # FOOTER
 # ============================================================================
@@ -903,6 +1178,13 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+figure_stats = charts.figure_cache.stats()
+st.caption(
+    f"Figure cache: {figure_stats['hits']} hits / {figure_stats['misses']} builds "
+    f"({figure_stats['hit_rate']:.0%} hit rate, {figure_stats['size']} figures cached) · "
+    f"full rerun {(time.perf_counter() - script_start) * 1000:.0f} ms"
+)
+
 # ============================================================================
 # RUN INSTRUCTIONS
 # ============================================================================
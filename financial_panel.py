@@ -0,0 +1,314 @@
+"""
+Financial Panel
+NumPy-backed company x metric x year store for extracted statements
+"""
+
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from functools import wraps
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Statement blocks in the order they are laid out along the metric axis
+STATEMENTS = ('income_statement', 'balance_sheet', 'cash_flow', 'per_share', 'ratios')
+
+# Non-statement fields carried over from the extractor's company dicts
+INFO_FIELDS = ('company', 'ticker', 'sector', 'currency')
+
+
+class FinancialPanel:
+    """
+    Read-only float64 panel of shape (company, metric, year)
+
+    Panels are immutable so one instance can be shared by every session and
+    thread: arrays cannot be written (or made writable again) and
+    attributes cannot be rebound.
+
+    Years run oldest -> newest along the last axis and missing values are NaN.
+    Metrics are grouped by statement so each statement is a contiguous,
+    zero-copy slice of the metric axis.
+
+    All companies share one fiscal-year axis; `mask[c, y]` records whether
+    company c reported year y at all, so a NaN inside a reported year is a
+    missing value while a NaN outside it is simply no history.
+    """
+
+    def __init__(self, values: np.ndarray,
+                 companies: Sequence[str],
+                 metrics: Sequence[str],
+                 years: Sequence[int],
+                 statements: Mapping[str, Tuple[int, int]],
+                 info: Optional[Mapping[str, Mapping[str, Any]]] = None,
+                 mask: Optional[np.ndarray] = None):
+        values = np.array(values, dtype=np.float64)
+        expected = (len(companies), len(metrics), len(years))
+        if values.shape != expected:
+            raise ValueError(f"Panel values have shape {values.shape}, expected {expected}")
+        values.setflags(write=False)
+
+        # Without an explicit mask, a year counts as reported if any metric has a value
+        if mask is None:
+            mask = ~np.isnan(values).all(axis=1)
+        mask = np.array(mask, dtype=bool)
+        if mask.shape != (len(companies), len(years)):
+            raise ValueError(f"Panel mask has shape {mask.shape}, expected {(len(companies), len(years))}")
+        mask.setflags(write=False)
+
+        # Expose views of the read-only buffers: unlike an owning array, a view's
+        # write flag cannot be switched back on, so the data stays immutable
+        self.values = values.view()
+        self.mask = mask.view()
+        self.companies = tuple(companies)
+        self.metrics = tuple(metrics)
+        self.years = tuple(int(y) for y in years)
+
+        self.company_index = MappingProxyType({c: i for i, c in enumerate(self.companies)})
+        self.metric_index = MappingProxyType({m: i for i, m in enumerate(self.metrics)})
+        self.year_index = MappingProxyType({y: i for i, y in enumerate(self.years)})
+        if len(self.metric_index) != len(self.metrics):
+            raise ValueError("Metric names must be unique across statements")
+
+        self._bounds = {name: (int(start), int(stop)) for name, (start, stop) in statements.items()}
+        self._statements = MappingProxyType({name: slice(*bounds) for name, bounds in self._bounds.items()})
+        self.metric_statement = MappingProxyType({
+            metric: name
+            for name, block in self._statements.items()
+            for metric in self.metrics[block]
+        })
+        self.info = MappingProxyType({
+            company: MappingProxyType(dict((info or {}).get(company, {})))
+            for company in self.companies
+        })
+        self._digest: Optional[str] = None
+        self._frozen = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Panels are shared across sessions and threads; catch accidental rebinding
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"FinancialPanel is immutable; cannot set {name!r}")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"FinancialPanel is immutable; cannot delete {name!r}")
+
+    @classmethod
+    def from_company_data(cls, datasets: Mapping[str, Mapping[str, Any]]) -> 'FinancialPanel':
+        """
+        Build a panel from extractor dicts: {company_key: {statement: {metric: [newest, ...]}}}
+
+        Each statement's 'years' list (newest first) places its values on a
+        shared, ascending fiscal-year axis; years a company did not report stay NaN.
+        """
+        companies = list(datasets.keys())
+
+        years = set()
+        metrics: List[str] = []
+        statements: Dict[str, Tuple[int, int]] = {}
+        names = _statement_names(datasets)
+        for statement in names:
+            start = len(metrics)
+            seen = set()
+            for company_data in datasets.values():
+                block = company_data.get(statement, {})
+                years.update(block.get('years', []))
+                for metric in block:
+                    if metric != 'years' and metric not in seen:
+                        seen.add(metric)
+                        metrics.append(metric)
+            statements[statement] = (start, len(metrics))
+
+        years = sorted(years)
+        year_pos = {y: i for i, y in enumerate(years)}
+        metric_pos = {m: i for i, m in enumerate(metrics)}
+
+        values = np.full((len(companies), len(metrics), len(years)), np.nan)
+        mask = np.zeros((len(companies), len(years)), dtype=bool)
+        for c, company_data in enumerate(datasets.values()):
+            for statement in names:
+                block = company_data.get(statement, {})
+                columns = [year_pos[y] for y in block.get('years', [])]
+                mask[c, columns] = True
+                for metric, series in block.items():
+                    if metric == 'years':
+                        continue
+                    row = np.array(series, dtype=np.float64)
+                    values[c, metric_pos[metric], columns[:len(row)]] = row[:len(columns)]
+
+        info = {
+            key: {field: company_data[field] for field in INFO_FIELDS if field in company_data}
+            for key, company_data in datasets.items()
+        }
+        return cls(values, companies, metrics, years, statements, info, mask)
+
+    def __reduce__(self):
+        # Mapping proxies are not picklable; rebuild from the raw components
+        info = {company: dict(fields) for company, fields in self.info.items()}
+        return (self.__class__, (self.values, self.companies, self.metrics, self.years,
+                                 self._bounds, info, self.mask))
+
+    @property
+    def digest(self) -> str:
+        """
+        SHA-256 of the panel's contents (values, mask, labels and info)
+
+        Equal for copies and unpickled panels of the same dataset, so it can
+        key caches that must survive Streamlit handing out fresh copies.
+        """
+        if self._digest is None:
+            hasher = hashlib.sha256()
+            hasher.update(self.values.tobytes())
+            hasher.update(self.mask.tobytes())
+            hasher.update(repr((self.companies, self.metrics, self.years, sorted(self._bounds.items()),
+                                {c: sorted(f.items()) for c, f in self.info.items()})).encode())
+            # The only lazily filled field: a pure function of the frozen contents
+            object.__setattr__(self, '_digest', hasher.hexdigest())
+        return self._digest
+
+    @property
+    def statements(self) -> Tuple[str, ...]:
+        """Statement names in metric-axis order"""
+        return tuple(self._statements.keys())
+
+    def statement(self, name: str) -> np.ndarray:
+        """Read-only (company, metric, year) view of one statement"""
+        return self.values[:, self._statements[name], :]
+
+    def statement_metrics(self, name: str) -> Tuple[str, ...]:
+        """Metric labels of one statement, in view order"""
+        return self.metrics[self._statements[name]]
+
+    def metric(self, metric: str) -> np.ndarray:
+        """Read-only (company, year) view of one metric across all companies"""
+        return self.values[:, self.metric_index[metric], :]
+
+    def series(self, company: str, metric: str) -> np.ndarray:
+        """Read-only chronological series of one metric for one company"""
+        return self.values[self.company_index[company], self.metric_index[metric], :]
+
+    def year_column(self, year: int, newest_first: bool = False) -> int:
+        """O(1) fiscal year -> position on the year axis (or on its reverse)"""
+        column = self.year_index[year]
+        return len(self.years) - 1 - column if newest_first else column
+
+    def for_year(self, year: int) -> np.ndarray:
+        """Read-only (company, metric) slice of every company for one fiscal year"""
+        return self.values[:, :, self.year_index[year]]
+
+    @property
+    def valid(self) -> np.ndarray:
+        """(company, metric, year) mask of values that are reported and present"""
+        return self.mask[:, None, :] & ~np.isnan(self.values)
+
+    @property
+    def common_years(self) -> Tuple[int, ...]:
+        """Fiscal years reported by every company"""
+        return tuple(y for y, ok in zip(self.years, self.mask.all(axis=0)) if ok)
+
+    def company_years(self, company: str) -> Tuple[int, ...]:
+        """Fiscal years one company reported, oldest first"""
+        row = self.mask[self.company_index[company]]
+        return tuple(y for y, ok in zip(self.years, row) if ok)
+
+    def take(self, metrics: Iterable[str]) -> np.ndarray:
+        """(company, len(metrics), year) array for an arbitrary metric selection"""
+        return self.values[:, [self.metric_index[m] for m in metrics], :]
+
+    def company_view(self, company: str, statement: str,
+                     newest_first: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Metric -> series mapping for one company and statement
+
+        With newest_first=True the views are reversed (still zero-copy) so
+        year_idx=0 is the latest year, matching the extractor's list layout.
+        """
+        block = self.values[self.company_index[company], self._statements[statement], :]
+        if newest_first:
+            block = block[:, ::-1]
+        return {metric: block[i] for i, metric in enumerate(self.statement_metrics(statement))}
+
+    def company_data(self, company: str, newest_first: bool = True) -> Dict[str, Any]:
+        """
+        Extractor-shaped dict ({statement: {metric: series}} plus info fields)
+        backed by panel views on the shared year axis
+
+        Every company gets the same 'years' list, so one positional year
+        index (see year_column) selects the same fiscal year for all of them.
+        """
+        years = list(self.years[::-1] if newest_first else self.years)
+        data: Dict[str, Any] = dict(self.info[company])
+        for statement in self.statements:
+            block = {'years': years}
+            block.update(self.company_view(company, statement, newest_first=newest_first))
+            data[statement] = block
+        return data
+
+    def __repr__(self) -> str:
+        return (f"FinancialPanel(companies={len(self.companies)}, metrics={len(self.metrics)}, "
+                f"years={self.years[0] if self.years else None}-{self.years[-1] if self.years else None})")
+
+
+def _statement_names(datasets: Mapping[str, Mapping[str, Any]]) -> List[str]:
+    """Known statements first, then any extra dict-valued blocks in first-seen order"""
+    names = [s for s in STATEMENTS if any(s in d for d in datasets.values())]
+    for company_data in datasets.values():
+        for field, value in company_data.items():
+            if isinstance(value, dict) and field not in names:
+                names.append(field)
+    return names
+
+
+def cached_by_digest(maxsize: int = 8):
+    """
+    Decorator memoizing func(panel) on panel.digest, least recently used first out
+
+    Unlike lru_cache on the panel itself, copies of the same dataset (e.g.
+    from st.cache_data or pickling) hit the same entry. Safe to call from
+    several threads: the cache is only touched under a lock, and func runs
+    outside it, once per digest, while other callers for that digest wait.
+    """
+    def decorator(func: Callable[[FinancialPanel], Any]) -> Callable[[FinancialPanel], Any]:
+        cache: 'OrderedDict[str, Any]' = OrderedDict()
+        lock = threading.Lock()
+        # Digest -> lock held while its value is being computed
+        pending: Dict[str, threading.Lock] = {}
+
+        def lookup(key: str) -> Tuple[bool, Any]:
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return True, cache[key]
+                return False, None
+
+        @wraps(func)
+        def wrapper(panel: FinancialPanel) -> Any:
+            key = panel.digest
+            hit, result = lookup(key)
+            if hit:
+                return result
+            with lock:
+                key_lock = pending.setdefault(key, threading.Lock())
+            with key_lock:
+                # Another thread may have computed it while we waited
+                hit, result = lookup(key)
+                if hit:
+                    return result
+                try:
+                    result = func(panel)
+                    with lock:
+                        cache[key] = result
+                        if len(cache) > maxsize:
+                            cache.popitem(last=False)
+                finally:
+                    with lock:
+                        pending.pop(key, None)
+            return result
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
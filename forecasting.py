@@ -0,0 +1,157 @@
+"""
+Forecasting Engine
+Batched closed-form forecasts with prediction intervals for many series at once
+"""
+
+import numpy as np
+from functools import lru_cache
+from scipy import stats
+from typing import NamedTuple
+
+MODELS = ('linear', 'log_linear', 'holt')
+
+# Display names for model pickers
+MODEL_LABELS = {
+    'linear': "Linear trend",
+    'log_linear': "Constant growth (log-linear)",
+    'holt': "Damped trend (Holt)"
+}
+
+# Damped Holt smoothing parameters (error-correction form, beta <= alpha)
+HOLT_ALPHA = 0.5
+HOLT_BETA = 0.3
+HOLT_PHI = 0.9
+
+
+class Forecast(NamedTuple):
+    """Read-only (series, horizon) arrays of point forecasts and interval bounds"""
+    point: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    model: str
+    level: float
+
+    def take(self, rows) -> 'Forecast':
+        """Forecast restricted to (and reordered by) the given row positions"""
+        rows = list(rows)
+        return Forecast(self.point[rows], self.lower[rows], self.upper[rows], self.model, self.level)
+
+
+def forecast(values, horizon: int = 1, model: str = 'linear', level: float = 0.95,
+             alpha: float = HOLT_ALPHA, beta: float = HOLT_BETA, phi: float = HOLT_PHI) -> Forecast:
+    """
+    Forecast every row of a (series, time) array `horizon` steps past its last column
+
+    Rows are chronological and may contain NaN gaps; each row is fitted on
+    its own valid points, all rows at once.
+    - linear: least-squares trend with Student-t prediction intervals
+    - log_linear: trend on log values (constant growth / CAGR); positive values only
+    - holt: damped-trend exponential smoothing with normal intervals
+    A row with a single valid point is carried forward flat without an interval;
+    a row with none forecasts NaN.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    if model == 'linear':
+        point, lower, upper = _linear(values, horizon, level)
+    elif model == 'log_linear':
+        logs = np.full(values.shape, np.nan)
+        np.log(values, out=logs, where=values > 0)
+        point, lower, upper = (np.exp(a) for a in _linear(logs, horizon, level))
+    elif model == 'holt':
+        point, lower, upper = _holt(values, horizon, level, alpha, beta, phi)
+    else:
+        raise ValueError(f"Unknown forecast model {model!r}; expected one of {MODELS}")
+
+    for array in (point, lower, upper):
+        array.setflags(write=False)
+    return Forecast(point, lower, upper, model, level)
+
+
+@lru_cache(maxsize=256)
+def forecast_panel(panel, metric: str, horizon: int = 1, model: str = 'linear',
+                   level: float = 0.95) -> Forecast:
+    """
+    Cached forecast of one metric for every company in a FinancialPanel
+
+    Panels are immutable, so the result is shared by every chart and table
+    that asks for the same (panel, metric, horizon, model, level).
+    """
+    return forecast(panel.metric(metric), horizon, model, level)
+
+
+def _linear(values: np.ndarray, horizon: int, level: float):
+    """Closed-form OLS on the column index for every row, ignoring NaN"""
+    x = np.arange(values.shape[1], dtype=np.float64)
+    valid = ~np.isnan(values)
+    n = valid.sum(axis=1)
+    count = np.maximum(n, 1)
+
+    x_mean = (valid * x).sum(axis=1) / count
+    y_mean = np.where(valid, values, 0.0).sum(axis=1) / count
+    dx = np.where(valid, x - x_mean[:, None], 0.0)
+    dy = np.where(valid, values - y_mean[:, None], 0.0)
+    sxx = (dx * dx).sum(axis=1)
+    slope = np.divide((dx * dy).sum(axis=1), sxx, out=np.zeros(len(values)), where=sxx > 0)
+    intercept = y_mean - slope * x_mean
+
+    future = x[-1] + np.arange(1, horizon + 1) if len(x) else np.arange(1, horizon + 1.0)
+    point = intercept[:, None] + slope[:, None] * future
+    point[n == 0] = np.nan
+
+    # Prediction interval: s * sqrt(1 + 1/n + (x0 - x_mean)^2 / Sxx) with n - 2 dof
+    dof = n - 2
+    residuals = np.where(valid, values - (intercept[:, None] + slope[:, None] * x), 0.0)
+    s2 = np.divide((residuals ** 2).sum(axis=1), dof, out=np.full(len(values), np.nan), where=dof > 0)
+    leverage = np.divide((future - x_mean[:, None]) ** 2, sxx[:, None],
+                         out=np.full(point.shape, np.nan), where=sxx[:, None] > 0)
+    spread = np.sqrt(s2[:, None] * (1 + 1 / count[:, None] + leverage))
+    # Rows share a handful of distinct dof values, so evaluate t.ppf once per dof
+    distinct, inverse = np.unique(dof, return_inverse=True)
+    quantile = stats.t.ppf((1 + level) / 2, np.where(distinct > 0, distinct, np.nan))[inverse]
+    margin = quantile[:, None] * spread
+    return point, point - margin, point + margin
+
+
+def _holt(values: np.ndarray, horizon: int, level: float,
+          alpha: float, beta: float, phi: float):
+    """Damped-trend Holt smoothing, recursing over time and vectorized over rows"""
+    rows = len(values)
+    smoothed = np.full(rows, np.nan)
+    trend = np.zeros(rows)
+    seen = np.zeros(rows, dtype=int)
+    sse = np.zeros(rows)
+    errors = np.zeros(rows, dtype=int)
+
+    for y in values.T:
+        has = ~np.isnan(y)
+        first = has & (seen == 0)
+        second = has & (seen == 1)
+        update = has & (seen >= 2)
+
+        # Gaps just carry the damped trend forward
+        step = smoothed + phi * trend
+        trend = np.where(seen > 0, phi * trend, trend)
+        smoothed = np.where(seen > 0, step, smoothed)
+
+        smoothed[first] = y[first]
+        trend[second] = y[second] - step[second]
+        smoothed[second] = y[second]
+
+        error = np.where(update, y - step, 0.0)
+        smoothed = np.where(update, step + alpha * error, smoothed)
+        trend = np.where(update, trend + beta * error, trend)
+        sse += error ** 2
+        errors += update
+        seen += has
+
+    steps = np.arange(1, horizon + 1)
+    damping = np.cumsum(phi ** steps)
+    point = smoothed[:, None] + damping * trend[:, None]
+
+    # h-step variance of ETS(A,Ad,N): sigma^2 * (1 + sum_{j<h} (alpha + beta * phi_j)^2)
+    sigma = np.sqrt(np.divide(sse, errors, out=np.full(rows, np.nan), where=errors > 0))
+    c = alpha + beta * np.concatenate([[0.0], damping[:-1]])
+    c[0] = 0.0
+    spread = sigma[:, None] * np.sqrt(1 + np.cumsum(c ** 2))
+    margin = stats.norm.ppf((1 + level) / 2) * spread
+    return point, point - margin, point + margin
@@ -0,0 +1,309 @@
+"""
+Metric Graph
+Dependency-graph metric registry with memoized, incremental recomputation
+"""
+
+import numpy as np
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+from benchmark_profile import BenchmarkProfile, grade_by_company, profiles_for_panel
+from financial_calculator import FinancialCalculator
+from financial_panel import FinancialPanel
+from ratio_engine import average_balance, safe_divide, statement_lines
+
+
+def _same(old: Any, new: Any) -> bool:
+    """Value equality that understands arrays (NaN == NaN) and dicts of arrays"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        return old.keys() == new.keys() and all(_same(old[k], new[k]) for k in old)
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        try:
+            return np.array_equal(old, new, equal_nan=True)
+        except TypeError:
+            return np.array_equal(old, new)
+    return old == new
+
+
+class _Node:
+    __slots__ = ('name', 'inputs', 'func', 'value', 'version', 'seen')
+
+    def __init__(self, name: str, inputs: Tuple[str, ...], func: Optional[Callable]):
+        self.name = name
+        self.inputs = inputs
+        self.func = func
+        self.value = None
+        self.version = 0
+        # Input versions the current value was computed from (None = never computed)
+        self.seen: Optional[Tuple[int, ...]] = None
+
+
+class MetricGraph:
+    """
+    Registry of source values and derived metrics that declare their inputs
+
+    A metric is recomputed only when the version of one of its inputs has
+    changed since it was last evaluated. A recomputed metric that comes out
+    unchanged keeps its version, so nothing downstream of it reruns either.
+    Inputs must be registered before the metrics that use them, which keeps
+    the graph acyclic by construction.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, _Node] = {}
+        self._last = {'recomputed': 0, 'reused': 0}
+        self._totals = {'recomputed': 0, 'reused': 0}
+
+    def source(self, name: str, value: Any = None) -> None:
+        """Declare a source value, or replace it (bumping its version if it changed)"""
+        node = self._nodes.get(name)
+        if node is None:
+            node = self._nodes[name] = _Node(name, (), None)
+            node.value, node.version = value, 1
+        elif node.func is not None:
+            raise ValueError(f"{name!r} is a derived metric, not a source")
+        elif not _same(node.value, value):
+            node.value = value
+            node.version += 1
+
+    def add(self, name: str, inputs: Sequence[str], func: Callable[..., Any]) -> None:
+        """Register a derived metric computed as func(*input_values)"""
+        if name in self._nodes:
+            raise ValueError(f"Metric {name!r} is already registered")
+        unknown = [i for i in inputs if i not in self._nodes]
+        if unknown:
+            raise KeyError(f"Metric {name!r} depends on unregistered inputs {unknown}")
+        self._nodes[name] = _Node(name, tuple(inputs), func)
+
+    def metric(self, name: str, inputs: Sequence[str]):
+        """Decorator form of add()"""
+        def register(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.add(name, inputs, func)
+            return func
+        return register
+
+    def get(self, name: str) -> Any:
+        """Current value of one metric, recomputing only what is stale"""
+        return self.evaluate(name)[name]
+
+    def evaluate(self, *names: str) -> Dict[str, Any]:
+        """Bring several metrics up to date in one pass; stats() describes the pass"""
+        visited: Dict[str, _Node] = {}
+        self._last = {'recomputed': 0, 'reused': 0}
+        for name in names:
+            self._evaluate(name, visited)
+        for key, count in self._last.items():
+            self._totals[key] += count
+        return {name: self._nodes[name].value for name in names}
+
+    def _evaluate(self, name: str, visited: Dict[str, _Node]) -> _Node:
+        if name in visited:
+            return visited[name]
+        node = self._nodes[name]
+        if node.func is not None:
+            versions = tuple(self._evaluate(dep, visited).version for dep in node.inputs)
+            if node.seen == versions:
+                self._last['reused'] += 1
+            else:
+                value = node.func(*(self._nodes[dep].value for dep in node.inputs))
+                self._last['recomputed'] += 1
+                if node.seen is None or not _same(node.value, value):
+                    node.value = value
+                    node.version += 1
+                node.seen = versions
+        visited[name] = node
+        return node
+
+    def dependents(self, name: str) -> Tuple[str, ...]:
+        """Every metric downstream of `name`, in registration (topological) order"""
+        affected = {name}
+        for node in self._nodes.values():
+            if any(dep in affected for dep in node.inputs):
+                affected.add(node.name)
+        return tuple(n for n in self._nodes if n in affected and n != name)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._nodes)
+
+    def stats(self) -> Dict[str, int]:
+        """Nodes recomputed vs reused in the last pass, plus running totals"""
+        return {
+            'nodes': len(self._nodes),
+            'recomputed': self._last['recomputed'],
+            'reused': self._last['reused'],
+            'total_recomputed': self._totals['recomputed'],
+            'total_reused': self._totals['reused']
+        }
+
+
+# What-if driver sources, in the order WhatIfEngine takes shock vectors
+DRIVERS = ('raw_material_pct', 'interest_rate_pct', 'receivable_days', 'capex_pct')
+
+# Funding cost for new, debt-funded assets when a company has no debt to infer it from
+DEFAULT_BORROWING_RATE = 0.09
+
+# Straight-line life of extra capex, in years
+CAPEX_USEFUL_LIFE = 10.0
+
+# Ratios derived by the standard graph; each one is graded on its company's profile
+GRAPH_RATIOS = (
+    'current_ratio', 'quick_ratio', 'debt_to_equity', 'times_interest_earned',
+    'gross_profit_margin', 'operating_profit_margin', 'net_profit_margin', 'return_on_assets',
+    'inventory_turnover', 'receivables_turnover', 'asset_turnover'
+)
+
+# Ratios the health score reads
+HEALTH_RATIOS = (
+    'current_ratio', 'quick_ratio', 'debt_to_equity', 'times_interest_earned',
+    'net_profit_margin', 'return_on_assets', 'asset_turnover'
+)
+
+
+def load_panel(graph: MetricGraph, panel: FinancialPanel,
+               profiles: Optional[Sequence[BenchmarkProfile]] = None) -> None:
+    """Point the graph's sources at a panel (e.g. one with a newly appended year)"""
+    for name, values in statement_lines(panel).items():
+        graph.source(name, values)
+    graph.source('mask', panel.mask)
+    graph.source('companies', panel.companies)
+    graph.source('years', panel.years)
+    graph.source('profiles', tuple(profiles) if profiles is not None else profiles_for_panel(panel))
+
+
+def _reported(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Values with the years a company did not report blanked to NaN"""
+    values = np.array(values, dtype=np.float64)
+    values[..., ~mask] = np.nan
+    return values
+
+
+def build_metric_graph(panel: FinancialPanel,
+                       profiles: Optional[Sequence[BenchmarkProfile]] = None) -> MetricGraph:
+    """
+    Standard graph: statement lines -> what-if drivers -> ratios -> health -> grades -> narratives
+
+    Sources are the statement_lines line items plus the DRIVERS shocks
+    (all zero, so the ratios start out as the reported ones). A driver may
+    be replaced by a (k, 1, 1) array to evaluate k scenarios at once; the
+    ratios, health and grades then come out as (k, company, year) arrays.
+    - raw material: scales direct material cost (cost of sales where not reported)
+    - interest: scales total interest cost, including interest on new borrowings
+    - receivable days: extra receivables of sales / 365 per day, debt-funded
+    - capex: extra net block as a share of sales, debt-funded and depreciated
+    Equity is held at its reported value. Companies are graded and scored
+    on their sector profiles unless `profiles` (one per company) is given.
+    """
+    graph = MetricGraph()
+    load_panel(graph, panel, profiles)
+    for driver in DRIVERS:
+        graph.source(driver, 0.0)
+    nan_to_zero = np.nan_to_num
+
+    # Model inputs the drivers act on
+    graph.add('materials', ('raw_materials', 'cost_of_sales'),
+              lambda materials, cost: np.where(np.isnan(materials), cost, materials))
+    graph.add('tax_rate', ('tax', 'profit_before_tax'), safe_divide)
+    graph.add('borrowing_rate', ('interest', 'debt'),
+              lambda interest, debt: np.where(debt > 0, safe_divide(interest, debt), DEFAULT_BORROWING_RATE))
+
+    # Driver effects; new receivables and capex are funded with debt
+    graph.add('extra_materials', ('materials', 'raw_material_pct'), lambda materials, pct: materials * pct / 100)
+    graph.add('extra_receivables', ('sales', 'receivable_days'), lambda sales, days: sales / 365 * days)
+    graph.add('extra_block', ('sales', 'capex_pct'), lambda sales, pct: sales * pct / 100)
+    graph.add('extra_debt', ('extra_receivables', 'extra_block'), np.add)
+
+    # Shocked line items
+    graph.add('shocked_interest', ('interest', 'extra_debt', 'borrowing_rate', 'interest_rate_pct'),
+              lambda interest, debt, rate, pct: (nan_to_zero(interest) + debt * rate) * (1 + pct / 100))
+    graph.add('pretax_change', ('extra_materials', 'extra_block', 'shocked_interest', 'interest'),
+              lambda materials, block, shocked, interest: (
+                  materials + block / CAPEX_USEFUL_LIFE + shocked - nan_to_zero(interest)))
+    graph.add('shocked_cost_of_sales', ('cost_of_sales', 'extra_materials'), np.add)
+    graph.add('shocked_operating_profit', ('operating_profit', 'extra_materials'), np.subtract)
+    graph.add('shocked_pretax_profit', ('profit_before_tax', 'pretax_change'), np.subtract)
+    # Lost pre-tax profit is tax-shielded at the reported effective rate
+    graph.add('shocked_net_profit', ('net_profit', 'pretax_change', 'tax_rate'),
+              lambda net, change, rate: net - change * (1 - nan_to_zero(rate)))
+    graph.add('shocked_receivables', ('receivables', 'extra_receivables'), np.add)
+    graph.add('shocked_current_assets', ('current_assets', 'extra_receivables'), np.add)
+    graph.add('shocked_debt', ('debt', 'extra_debt'), np.add)
+    graph.add('shocked_total_assets', ('total_assets', 'extra_debt'), np.add)
+
+    # Ratios (years a company did not report have none)
+    def ratio(name: str, inputs: Sequence[str], func: Callable[..., np.ndarray]) -> None:
+        graph.add(name, tuple(inputs) + ('mask',), lambda *values: _reported(func(*values[:-1]), values[-1]))
+
+    ratio('current_ratio', ('shocked_current_assets', 'current_liabilities'), safe_divide)
+    ratio('quick_ratio', ('shocked_current_assets', 'inventories', 'current_liabilities'),
+          lambda ca, inv, cl: safe_divide(ca - inv, cl))
+    ratio('debt_to_equity', ('shocked_debt', 'equity'), safe_divide)
+    ratio('times_interest_earned', ('shocked_pretax_profit', 'shocked_interest'),
+          lambda pbt, interest: safe_divide(pbt + interest, interest))
+    ratio('gross_profit_margin', ('sales', 'shocked_cost_of_sales'),
+          lambda sales, cost: safe_divide(sales - cost, sales) * 100)
+    ratio('operating_profit_margin', ('shocked_operating_profit', 'sales'),
+          lambda profit, sales: safe_divide(profit, sales) * 100)
+    ratio('net_profit_margin', ('shocked_net_profit', 'sales'),
+          lambda profit, sales: safe_divide(profit, sales) * 100)
+    ratio('return_on_assets', ('shocked_net_profit', 'shocked_total_assets'),
+          lambda profit, assets: safe_divide(profit, assets) * 100)
+    ratio('inventory_turnover', ('shocked_cost_of_sales', 'inventories'),
+          lambda cost, inv: safe_divide(cost, average_balance(inv)))
+    ratio('receivables_turnover', ('sales', 'shocked_receivables'),
+          lambda sales, receivables: safe_divide(sales, average_balance(receivables)))
+    ratio('asset_turnover', ('sales', 'shocked_total_assets'), safe_divide)
+    ratio('equity_multiplier', ('shocked_total_assets', 'equity'), safe_divide)
+    graph.add('roe', ('net_profit_margin', 'asset_turnover', 'equity_multiplier'),
+              lambda npm, turnover, multiplier: FinancialCalculator.calculate_dupont_3point(
+                  npm / 100, turnover, multiplier))
+
+    # Scores and grades
+    graph.add('health_scores', HEALTH_RATIOS + ('mask', 'profiles'),
+              lambda *values: FinancialCalculator.calculate_health_scores(
+                  dict(zip(HEALTH_RATIOS, values[:-2])), mask=values[-2], profiles=values[-1]))
+    graph.add('health_score', ('health_scores',), lambda scores: scores['health'])
+    for name in GRAPH_RATIOS:
+        graph.add(f'grade:{name}', (name, 'profiles'),
+                  lambda values, profiles, name=name: grade_by_company(name, values, profiles))
+
+    # Narratives for each company's latest reported year (scalar drivers only)
+    graph.add('narratives', ('health_scores', 'companies', 'years', 'mask'), _health_narratives)
+    return graph
+
+
+def _health_narratives(scores: Dict[str, np.ndarray], companies: Iterable[str],
+                       years: Sequence[int], mask: np.ndarray) -> Dict[str, str]:
+    """One-line health summary per company"""
+    narratives = {}
+    for c, company in enumerate(companies):
+        reported = np.flatnonzero(mask[c])
+        if not len(reported):
+            continue
+        y = reported[-1]
+        health = scores['health'][c, y]
+        weakest = min(('liquidity', 'solvency', 'profitability', 'efficiency'),
+                      key=lambda part: np.nan_to_num(scores[part][c, y], nan=np.inf))
+        position = "strong" if health > 75 else "moderate" if health > 50 else "weak"
+        narratives[company] = (f"{company} scores {health:.1f}/100 in FY{years[y]} ({position}); "
+                               f"{weakest} is the weakest pillar at {scores[weakest][c, y]:.1f}.")
+    return narratives
+
+
+if __name__ == "__main__":
+    from data_extractor import FinancialDataExtractor
+
+    panel = FinancialDataExtractor("Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx").extract_panel()
+    graph = build_metric_graph(panel)
+    everything = [n for n in graph.names]
+
+    graph.evaluate(*everything)
+    print(f"Cold pass:        {graph.stats()}")
+    graph.evaluate(*everything)
+    print(f"Unchanged rerun:  {graph.stats()}")
+
+    # What-if: interest cost +50%
+    graph.source('interest_rate_pct', 50.0)
+    print(f"Affected by 'interest_rate_pct': {len(graph.dependents('interest_rate_pct'))} of {len(everything)} nodes")
+    result = graph.evaluate(*everything)
+    print(f"Interest shock:   {graph.stats()}")
+    for text in result['narratives'].values():
+        print(f"   {text}")
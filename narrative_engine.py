@@ -0,0 +1,147 @@
+"""
+Narrative Engine
+Precompiled narrative templates rendered in bulk for every company, metric and year
+"""
+
+import numpy as np
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, List, Optional
+from financial_panel import FinancialPanel, cached_by_digest
+from rolling_analytics import TREND_THRESHOLD, rolling_slope, yoy_change
+
+# Sentence templates per metric category; 'default' covers everything else
+TEMPLATES = MappingProxyType({
+    'liquidity': "{company}'s liquidity position has {direction} by {change:.1f}% YoY, showing {performance} short-term financial health.",
+    'solvency': "{company} demonstrates {performance} long-term financial stability with debt metrics {direction} by {change:.1f}%.",
+    'profitability': "{company}'s profitability has {direction} by {change:.1f}%, indicating {performance} operational efficiency.",
+    'efficiency': "Asset utilization at {company} has {direction} by {change:.1f}%, reflecting {performance} resource management.",
+    'default': "{company}'s {metric} has {direction} by {change:.1f}% year-over-year."
+})
+
+# Bound str.format of each template, so rendering skips the template lookup and parse
+_RENDERERS = MappingProxyType({category: template.format for category, template in TEMPLATES.items()})
+
+# Category of each derived ratio, for metric names that do not spell out their category
+METRIC_CATEGORIES = MappingProxyType({
+    'current_ratio': 'liquidity', 'quick_ratio': 'liquidity', 'cash_ratio': 'liquidity',
+    'debt_to_equity': 'solvency', 'debt_ratio': 'solvency', 'times_interest_earned': 'solvency',
+    'gross_profit_margin': 'profitability', 'operating_profit_margin': 'profitability',
+    'net_profit_margin': 'profitability', 'return_on_assets': 'profitability',
+    'roe_3point': 'profitability', 'roe_5point': 'profitability',
+    'inventory_turnover': 'efficiency', 'receivables_turnover': 'efficiency',
+    'payables_turnover': 'efficiency', 'asset_turnover': 'efficiency'
+})
+
+# Trend label -> adjective used in the templates
+PERFORMANCE = MappingProxyType({'improving': 'strong', 'declining': 'weak', 'stable': 'stable'})
+
+
+@lru_cache(maxsize=None)
+def template_for(metric_name: str) -> str:
+    """Template category for a metric name (resolved once per name)"""
+    lowered = metric_name.lower()
+    for category in ('liquidity', 'solvency', 'profitability', 'efficiency'):
+        if category in lowered:
+            return category
+    return METRIC_CATEGORIES.get(lowered, 'default')
+
+
+def render(metric_name: str, company: str, change: float, trend: str, label: Optional[str] = None) -> str:
+    """One sentence from a YoY change (%) and a trend label"""
+    return _RENDERERS[template_for(metric_name)](
+        company=company,
+        metric=label or metric_name,
+        direction="increased" if change > 0 else "decreased",
+        change=abs(change),
+        performance=PERFORMANCE.get(trend, 'stable')
+    )
+
+
+def expanding_trend(values: np.ndarray, threshold: float = TREND_THRESHOLD) -> np.ndarray:
+    """Trend label at each year from the slope of all history up to and including it"""
+    values = np.asarray(values, dtype=np.float64)
+    periods = values.shape[-1]
+    padded = np.concatenate([np.full(values.shape[:-1] + (periods - 1,), np.nan), values], axis=-1)
+    slope = rolling_slope(padded, periods, min_periods=2)[..., periods - 1:]
+    labels = np.full(slope.shape, 'stable', dtype=object)
+    labels[slope > threshold] = 'improving'
+    labels[slope < -threshold] = 'declining'
+    return labels
+
+
+class NarrativeEngine:
+    """
+    Every company x metric x year narrative of a panel, rendered in one pass
+
+    YoY changes and expanding-window trends are computed for the whole
+    panel at once; each reported year with a prior value gets one sentence
+    in `sentences`, a read-only (company, metric, year) object array
+    (None where there is nothing to say).
+    """
+
+    def __init__(self, panel: FinancialPanel):
+        values = np.where(panel.mask[:, None, :], panel.values, np.nan)
+        changes = yoy_change(values)
+        trends = expanding_trend(values)
+        renderers = [_RENDERERS[template_for(metric)] for metric in panel.metrics]
+        labels = [metric.replace('_', ' ') for metric in panel.metrics]
+        names = [panel.info[company].get('company', company) for company in panel.companies]
+
+        sentences = np.full(values.shape, None, dtype=object)
+        cells = np.nonzero(~np.isnan(changes))
+        for c, m, y in zip(*cells):
+            change = changes[c, m, y]
+            sentences[c, m, y] = renderers[m](
+                company=names[c],
+                metric=labels[m],
+                direction="increased" if change > 0 else "decreased",
+                change=abs(change),
+                performance=PERFORMANCE[trends[c, m, y]]
+            )
+        sentences.setflags(write=False)
+
+        self.panel = panel
+        self.sentences = sentences
+        # Number of sentences rendered
+        self.count = len(cells[0])
+
+    def sentence(self, company: str, metric: str, year: int) -> Optional[str]:
+        """Narrative for one company, metric and fiscal year (None without a prior year)"""
+        p = self.panel
+        return self.sentences[p.company_index[company], p.metric_index[metric], p.year_index[year]]
+
+    def for_year(self, company: str, year: int, metrics: Optional[Iterable[str]] = None) -> List[str]:
+        """All available narratives for one company and year, in metric order"""
+        p = self.panel
+        row = self.sentences[p.company_index[company], :, p.year_index[year]]
+        positions = range(len(p.metrics)) if metrics is None else [p.metric_index[m] for m in metrics]
+        return [row[i] for i in positions if row[i] is not None]
+
+
+@cached_by_digest()
+def narrative_engine(panel: FinancialPanel) -> NarrativeEngine:
+    """NarrativeEngine cached per dataset content hash"""
+    return NarrativeEngine(panel)
+
+
+if __name__ == "__main__":
+    import time
+    from data_extractor import FinancialDataExtractor
+
+    panel = FinancialDataExtractor("Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx").extract_panel()
+
+    start = time.perf_counter()
+    engine = narrative_engine(panel)
+    cold = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    narrative_engine(panel)
+    warm = (time.perf_counter() - start) * 1000
+    print(f"Rendered {engine.count:,} narratives in {cold:.1f} ms ({warm:.3f} ms cached)")
+
+    year = panel.years[-1]
+    for company in panel.companies:
+        print(f"\n{company} FY{year}:")
+        for text in engine.for_year(company, year, ['sales_turnover', 'current_ratio', 'debt_to_equity',
+                                                    'net_profit_margin', 'asset_turnover']):
+            print(f"   {text}")
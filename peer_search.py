@@ -0,0 +1,204 @@
+"""
+Peer Search
+Nearest-neighbour peer discovery on normalized ratio vectors
+"""
+
+import numpy as np
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from financial_panel import FinancialPanel, cached_by_digest
+from rolling_analytics import rolling_cagr
+
+# Ratio vector pillars; each pillar carries equal total weight in the distance
+PEER_FEATURES = {
+    'liquidity': ('current_ratio', 'quick_ratio'),
+    'solvency': ('debt_to_equity', 'times_interest_earned'),
+    'profitability': ('net_profit_margin', 'return_on_assets'),
+    'efficiency': ('asset_turnover',),
+    'growth': ('revenue_growth',)
+}
+
+# Standardized values are clipped here so one outlier ratio cannot dominate a distance
+Z_CLIP = 3.0
+
+# Companies a year needs for median/IQR scaling to mean anything: with two,
+# every feature standardizes to +-1 whatever the ratios are
+MIN_PEER_COMPANIES = 3
+
+# Rows of the distance matrix computed per block in all_nearest
+BLOCK_SIZE = 1024
+
+
+def _feature_weights() -> Tuple[Tuple[str, ...], np.ndarray]:
+    names, weights = [], []
+    for features in PEER_FEATURES.values():
+        for feature in features:
+            names.append(feature)
+            weights.append(1 / np.sqrt(len(features)))
+    return tuple(names), np.array(weights)
+
+
+FEATURES, FEATURE_WEIGHTS = _feature_weights()
+
+
+class PeerIndex:
+    """
+    Per-year matrix of normalized ratio vectors answering k-nearest queries
+
+    Each feature is standardized across the companies reporting that year
+    (median / IQR, clipped to +-Z_CLIP), missing values sit at the centre
+    (0), and pillars are weighted equally. Squared distances come from one
+    matrix product: |a - b|^2 = |a|^2 + |b|^2 - 2 a.b. Matrices are built
+    once per year and kept. Distances only carry information in years that
+    at least MIN_PEER_COMPANIES reported (see comparable).
+    """
+
+    def __init__(self, features: np.ndarray, companies: Sequence[str], years: Sequence[int],
+                 mask: Optional[np.ndarray] = None):
+        features = np.asarray(features, dtype=np.float64)
+        if features.shape != (len(companies), len(FEATURES), len(years)):
+            raise ValueError(f"Features have shape {features.shape}, expected "
+                             f"{(len(companies), len(FEATURES), len(years))}")
+        self.features = features
+        self.companies = tuple(companies)
+        self.years = tuple(int(y) for y in years)
+        self.company_index = {c: i for i, c in enumerate(self.companies)}
+        self.year_index = {y: i for i, y in enumerate(self.years)}
+        self.mask = (np.ones((len(companies), len(years)), dtype=bool) if mask is None
+                     else np.asarray(mask, dtype=bool))
+        # year column -> (normalized matrix, squared row norms, reporting companies)
+        self._matrices: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_panel(cls, panel: FinancialPanel) -> 'PeerIndex':
+        """Peer index over a panel's derived ratios plus YoY revenue growth"""
+        missing = np.full(panel.mask.shape, np.nan)
+        columns = []
+        for feature in FEATURES:
+            if feature == 'revenue_growth':
+                columns.append(rolling_cagr(panel.metric('sales_turnover'), 1) if 'sales_turnover' in panel.metric_index
+                               else missing)
+            else:
+                columns.append(panel.metric(feature) if feature in panel.metric_index else missing)
+        return cls(np.stack(columns, axis=1), panel.companies, panel.years, panel.mask)
+
+    def matrix(self, year: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(normalized vectors, squared norms, reporting company positions) for one year"""
+        column = self.year_index[year]
+        if column not in self._matrices:
+            reporting = np.flatnonzero(self.mask[:, column])
+            block = self.features[reporting, :, column]
+            if len(reporting):
+                present = ~np.isnan(block).all(axis=0)
+                centre = np.zeros(block.shape[1])
+                scale = np.ones(block.shape[1])
+                centre[present] = np.nanmedian(block[:, present], axis=0)
+                q75, q25 = np.nanpercentile(block[:, present], [75, 25], axis=0)
+                spread = q75 - q25
+                scale[present] = np.where(spread > 0, spread, 1.0)
+                block = np.clip((block - centre) / scale, -Z_CLIP, Z_CLIP)
+            vectors = np.ascontiguousarray(np.nan_to_num(block) * FEATURE_WEIGHTS)
+            self._matrices[column] = (vectors, np.einsum('ij,ij->i', vectors, vectors), reporting)
+        return self._matrices[column]
+
+    def reporting_count(self, year: int) -> int:
+        """Number of companies that reported one year"""
+        return int(self.mask[:, self.year_index[year]].sum())
+
+    def comparable(self, year: int) -> bool:
+        """Whether enough companies reported a year for their distances to be meaningful"""
+        return self.reporting_count(year) >= MIN_PEER_COMPANIES
+
+    def nearest(self, company: str, year: int, k: int = 5) -> List[Tuple[str, float]]:
+        """The k most similar other companies to one company in one year, with distances"""
+        vectors, norms, reporting = self.matrix(year)
+        rows = np.flatnonzero(reporting == self.company_index[company])
+        if not len(rows):
+            raise KeyError(f"{company} did not report FY{year}")
+        row = rows[0]
+        distances = np.maximum(norms + norms[row] - 2 * vectors @ vectors[row], 0.0)
+        distances[row] = np.inf
+        k = min(k, len(reporting) - 1)
+        if k <= 0:
+            return []
+        best = np.argpartition(distances, k - 1)[:k]
+        best = best[np.argsort(distances[best], kind='stable')]
+        return [(self.companies[reporting[i]], float(np.sqrt(distances[i]))) for i in best]
+
+    def all_nearest(self, year: int, k: int = 5, block_size: int = BLOCK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (company positions, distances) of every reporting company's k nearest peers
+
+        Rows are processed block_size at a time, so memory stays at
+        block_size x n however large the universe is. Both arrays are
+        (reporting companies, k), nearest first.
+        """
+        vectors, norms, reporting = self.matrix(year)
+        n = len(reporting)
+        k = min(k, n - 1)
+        positions = np.empty((n, max(k, 0)), dtype=np.int64)
+        distances = np.empty((n, max(k, 0)))
+        if k <= 0:
+            return positions, distances
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            block = norms[start:stop, None] + norms[None, :] - 2 * vectors[start:stop] @ vectors.T
+            block[np.arange(stop - start), np.arange(start, stop)] = np.inf
+            best = np.argpartition(block, k - 1, axis=1)[:, :k]
+            best_distances = np.take_along_axis(block, best, axis=1)
+            order = np.argsort(best_distances, axis=1, kind='stable')
+            positions[start:stop] = reporting[np.take_along_axis(best, order, axis=1)]
+            distances[start:stop] = np.sqrt(np.maximum(np.take_along_axis(best_distances, order, axis=1), 0.0))
+        return positions, distances
+
+    def pillar_gaps(self, company: str, peer: str, year: int) -> Mapping[str, float]:
+        """Per-pillar distance between two companies, to explain why they are (not) alike"""
+        vectors, _, reporting = self.matrix(year)
+        lookup = {position: row for row, position in enumerate(reporting)}
+        diff = vectors[lookup[self.company_index[company]]] - vectors[lookup[self.company_index[peer]]]
+        gaps, start = {}, 0
+        for pillar, features in PEER_FEATURES.items():
+            gaps[pillar] = float(np.linalg.norm(diff[start:start + len(features)]))
+            start += len(features)
+        return gaps
+
+
+@cached_by_digest()
+def peer_index(panel: FinancialPanel) -> PeerIndex:
+    """PeerIndex cached per dataset content hash"""
+    return PeerIndex.from_panel(panel)
+
+
+if __name__ == "__main__":
+    import time
+    from data_extractor import FinancialDataExtractor
+
+    panel = FinancialDataExtractor("Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx").extract_panel()
+    index = peer_index(panel)
+    year = panel.years[-1]
+    print("=" * 60)
+    print("PEER SEARCH")
+    print("=" * 60)
+    if index.comparable(year):
+        for company in panel.companies:
+            print(f"{company} FY{year}: {index.nearest(company, year)}")
+    else:
+        print(f"FY{year}: {index.reporting_count(year)} reporting companies, "
+              f"distances need at least {MIN_PEER_COMPANIES}")
+
+    # 20,000-company universe
+    rng = np.random.default_rng(0)
+    n = 20000
+    universe = PeerIndex(rng.lognormal(0, 0.6, (n, len(FEATURES), 3)), [f"C{i:05d}" for i in range(n)],
+                         [2023, 2024, 2025])
+    start = time.perf_counter()
+    universe.matrix(2025)
+    build = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    peers = universe.nearest("C00042", 2025, k=10)
+    query = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    universe.all_nearest(2025, k=10)
+    everyone = (time.perf_counter() - start) * 1000
+    print(f"\n{n:,} companies: matrix {build:.1f} ms, one query {query:.2f} ms, "
+          f"all {n:,} queries {everyone:.0f} ms (blocked)")
+    print(f"C00042 peers: {[name for name, _ in peers[:5]]}")
@@ -0,0 +1,198 @@
+"""
+Ratio Engine
+Derives every financial ratio from raw statement line items, vectorized
+over all companies and years of a FinancialPanel
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple
+from financial_panel import FinancialPanel
+
+# Derived ratios in the order they appear in the 'ratios' statement.
+# Margins and returns are percentages; everything else is a plain multiple.
+RATIOS = (
+    'current_ratio', 'quick_ratio', 'cash_ratio',
+    'debt_to_equity', 'debt_ratio', 'times_interest_earned',
+    'gross_profit_margin', 'operating_profit_margin', 'net_profit_margin', 'return_on_assets',
+    'inventory_turnover', 'receivables_turnover', 'payables_turnover', 'asset_turnover',
+    'equity_multiplier', 'tax_burden', 'interest_burden', 'roe_3point', 'roe_5point'
+)
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Elementwise division that yields NaN instead of inf for a zero or missing denominator"""
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=(denominator != 0) & ~np.isnan(denominator))
+    return out
+
+
+def _coalesce(*arrays: np.ndarray) -> np.ndarray:
+    """First non-NaN value across the arrays, elementwise"""
+    out = arrays[0].copy()
+    for array in arrays[1:]:
+        out = np.where(np.isnan(out), array, out)
+    return out
+
+
+def average_balance(balance: np.ndarray) -> np.ndarray:
+    """Opening/closing average of a (..., year) balance; the first year has no opening"""
+    out = np.full(balance.shape, np.nan)
+    out[..., 1:] = (balance[..., 1:] + balance[..., :-1]) / 2
+    return out
+
+
+def statement_lines(panel: FinancialPanel) -> Dict[str, np.ndarray]:
+    """
+    Line items every ratio is built from, as (company, year) arrays
+
+    Reported lines are used as they are. Only where a company does not
+    report one is it rebuilt from the identities the workbook follows:
+    - cost of sales = raw materials + power & fuel + employee cost - stock
+      adjustments (else total expenses less overheads)
+    - current assets = inventories + debtors + cash
+    - equity = share capital + reserves
+    - capital employed = net block + CWIP + investments + net current assets
+    - debt = capital employed - equity
+    - total assets = capital employed (Moneycontrol's application of funds,
+      i.e. net of current liabilities and provisions)
+    """
+    shape = (len(panel.companies), len(panel.years))
+    missing = np.full(shape, np.nan)
+
+    def line(metric: str) -> np.ndarray:
+        return panel.metric(metric) if metric in panel.metric_index else missing
+
+    def optional(metric: str) -> np.ndarray:
+        return np.nan_to_num(line(metric))
+
+    # Income statement
+    pbt = line('profit_before_tax')
+    interest = line('interest')
+    overheads = optional('employee_cost') + optional('selling_admin') + optional('misc_expenses')
+    direct_costs = (line('raw_materials') + optional('power_fuel') + optional('employee_cost')
+                    - optional('stock_adjustments'))
+
+    # Balance sheet
+    inventories = line('inventories')
+    receivables = line('sundry_debtors')
+    cash = line('cash_bank')
+    reserves = _coalesce(line('reserves_surplus'), line('reserves'))
+    equity = _coalesce(line('networth'), line('total_share_capital') + reserves)
+    capital_employed = (line('net_block') + optional('capital_wip')
+                        + optional('investments') + line('net_current_assets'))
+
+    return {
+        'sales': line('sales_turnover'),
+        'total_expenses': line('total_expenses'),
+        'cost_of_sales': _coalesce(direct_costs, line('total_expenses') - overheads),
+        'operating_profit': line('operating_profit'),
+        'raw_materials': line('raw_materials'),
+        'interest': interest,
+        'ebit': pbt + interest,
+        'profit_before_tax': pbt,
+        'tax': line('tax'),
+        'net_profit': line('net_profit'),
+        'inventories': inventories,
+        'receivables': receivables,
+        'cash': cash,
+        'current_assets': _coalesce(line('current_assets'), inventories + receivables + cash),
+        'current_liabilities': line('current_liabilities'),
+        'provisions': line('provisions'),
+        'reserves': reserves,
+        'equity': equity,
+        'capital_employed': capital_employed,
+        'debt': _coalesce(line('total_debt'), np.maximum(capital_employed - equity, 0.0)),
+        'total_assets': _coalesce(line('total_assets'), capital_employed),
+    }
+
+
+def derive_ratios(panel: FinancialPanel) -> Dict[str, np.ndarray]:
+    """
+    Compute every ratio in RATIOS as a (company, year) array in one pass
+
+    Inputs come from statement_lines. DuPont inputs use period-end balances
+    so that the 3- and 5-point ROE identities hold exactly; the
+    working-capital turnovers use the average of opening and closing balances.
+    """
+    lines = statement_lines(panel)
+    sales = lines['sales']
+    interest = lines['interest']
+    pbt = lines['profit_before_tax']
+    net_profit = lines['net_profit']
+    ebit = lines['ebit']
+    cost_of_sales = lines['cost_of_sales']
+    inventories = lines['inventories']
+    receivables = lines['receivables']
+    cash = lines['cash']
+    current_assets = lines['current_assets']
+    current_liabilities = lines['current_liabilities']
+    equity = lines['equity']
+    debt = lines['debt']
+    total_assets = lines['total_assets']
+
+    net_margin = safe_divide(net_profit, sales)
+    ebit_margin = safe_divide(ebit, sales)
+    asset_turnover = safe_divide(sales, total_assets)
+    equity_multiplier = safe_divide(total_assets, equity)
+    tax_burden = safe_divide(net_profit, pbt)
+    interest_burden = safe_divide(pbt, ebit)
+
+    ratios = {
+        'current_ratio': safe_divide(current_assets, current_liabilities),
+        'quick_ratio': safe_divide(current_assets - inventories, current_liabilities),
+        'cash_ratio': safe_divide(cash, current_liabilities),
+        'debt_to_equity': safe_divide(debt, equity),
+        'debt_ratio': safe_divide(debt, total_assets),
+        'times_interest_earned': safe_divide(ebit, interest),
+        'gross_profit_margin': safe_divide(sales - cost_of_sales, sales) * 100,
+        'operating_profit_margin': safe_divide(lines['operating_profit'], sales) * 100,
+        'net_profit_margin': net_margin * 100,
+        'return_on_assets': safe_divide(net_profit, total_assets) * 100,
+        'inventory_turnover': safe_divide(cost_of_sales, average_balance(inventories)),
+        'receivables_turnover': safe_divide(sales, average_balance(receivables)),
+        'payables_turnover': safe_divide(lines['total_expenses'], average_balance(current_liabilities)),
+        'asset_turnover': asset_turnover,
+        'equity_multiplier': equity_multiplier,
+        'tax_burden': tax_burden,
+        'interest_burden': interest_burden,
+        'roe_3point': net_margin * asset_turnover * equity_multiplier,
+        'roe_5point': tax_burden * interest_burden * ebit_margin * asset_turnover * equity_multiplier,
+    }
+
+    # Years a company did not report have no ratios, even if a neighbour year leaks in
+    for values in ratios.values():
+        values[~panel.mask] = np.nan
+    return ratios
+
+
+def with_derived_ratios(panel: FinancialPanel) -> FinancialPanel:
+    """
+    Copy of the panel whose 'ratios' statement holds the derived ratios
+
+    Derived values replace the workbook's precomputed ones; ratios the
+    engine does not know about are kept after them unchanged.
+    """
+    derived = derive_ratios(panel)
+    names = list(panel.statements)
+    if 'ratios' not in names:
+        names.append('ratios')
+
+    blocks: List[np.ndarray] = []
+    metrics: List[str] = []
+    statements: Dict[str, Tuple[int, int]] = {}
+    for name in names:
+        start = len(metrics)
+        if name == 'ratios':
+            extra = [m for m in panel.statement_metrics(name) if m not in derived] if name in panel.statements else []
+            blocks.append(np.stack([derived[m] for m in RATIOS], axis=1))
+            blocks.append(panel.take(extra))
+            metrics.extend(RATIOS)
+            metrics.extend(extra)
+        else:
+            blocks.append(panel.statement(name))
+            metrics.extend(panel.statement_metrics(name))
+        statements[name] = (start, len(metrics))
+
+    info = {company: dict(fields) for company, fields in panel.info.items()}
+    return FinancialPanel(np.concatenate(blocks, axis=1), panel.companies, metrics,
+                          panel.years, statements, info, panel.mask)
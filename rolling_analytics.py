@@ -0,0 +1,132 @@
+"""
+Rolling Analytics
+O(n) sliding-window kernels over the last (time) axis of panel arrays
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Optional
+
+# Slope (per period) beyond which a trend counts as improving / declining
+TREND_THRESHOLD = 0.05
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Values `periods` steps back along the last axis, NaN where there is no history"""
+    out = np.full(values.shape, np.nan)
+    if periods < values.shape[-1]:
+        out[..., periods:] = values[..., :values.shape[-1] - periods]
+    return out
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window sums along the last axis via one cumulative sum (NaN before a full window)"""
+    totals = np.cumsum(values, axis=-1)
+    out = np.full(values.shape, np.nan)
+    if window <= values.shape[-1]:
+        out[..., window - 1:] = totals[..., window - 1:]
+        out[..., window:] -= totals[..., :values.shape[-1] - window]
+    return out
+
+
+def rolling_window(values, window: int) -> np.ndarray:
+    """Zero-copy (..., time - window + 1, window) strided view of trailing windows"""
+    return sliding_window_view(np.asarray(values, dtype=np.float64), window, axis=-1)
+
+
+def yoy_change(values, periods: int = 1) -> np.ndarray:
+    """Percentage change versus `periods` steps earlier, for every point at once"""
+    values = np.asarray(values, dtype=np.float64)
+    previous = _shift(values, periods)
+    out = np.full(values.shape, np.nan)
+    np.divide(values - previous, np.abs(previous), out=out, where=(previous != 0) & ~np.isnan(previous))
+    return out * 100
+
+
+def rolling_cagr(values, window: int) -> np.ndarray:
+    """Compound annual growth (%) over each trailing `window` periods; NaN for non-positive ends"""
+    values = np.asarray(values, dtype=np.float64)
+    start = _shift(values, window)
+    out = np.full(values.shape, np.nan)
+    valid = (start > 0) & (values > 0)
+    out[valid] = (np.power(values[valid] / start[valid], 1 / window) - 1) * 100
+    return out
+
+
+def rolling_mean(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Trailing mean ignoring NaN; NaN where fewer than `min_periods` (default: window) values"""
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    count = _window_sums(valid.astype(np.float64), window)
+    total = _window_sums(np.where(valid, values, 0.0), window)
+    return np.where(count >= (min_periods or window), total / np.maximum(count, 1), np.nan)
+
+
+def rolling_std(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Trailing sample standard deviation (ddof=1) ignoring NaN, e.g. margin volatility
+
+    Each row is centred on its own mean first so the sum-of-squares form
+    stays numerically stable for large magnitudes.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    row_mean = np.zeros(values.shape[:-1] + (1,))
+    has = valid.any(axis=-1)
+    row_mean[has] = np.nanmean(values[has], axis=-1, keepdims=True)
+    centred = np.where(valid, values - row_mean, 0.0)
+    count = _window_sums(valid.astype(np.float64), window)
+    total = _window_sums(centred, window)
+    squares = _window_sums(centred ** 2, window)
+    variance = np.full(values.shape, np.nan)
+    np.divide(squares - total ** 2 / np.maximum(count, 1), count - 1, out=variance, where=count > 1)
+    enough = count >= max(min_periods or window, 2)
+    return np.where(enough, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+
+def rolling_slope(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Least-squares slope per period over each trailing window, ignoring NaN"""
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    t = np.broadcast_to(np.arange(values.shape[-1], dtype=np.float64), values.shape)
+    weights = valid.astype(np.float64)
+    y = np.where(valid, values, 0.0)
+
+    n = _window_sums(weights, window)
+    st = _window_sums(t * weights, window)
+    stt = _window_sums(t * t * weights, window)
+    sy = _window_sums(y, window)
+    sty = _window_sums(t * y, window)
+
+    denominator = n * stt - st ** 2
+    slope = np.full(values.shape, np.nan)
+    np.divide(n * sty - st * sy, denominator, out=slope, where=denominator > 0)
+    return np.where(n >= max(min_periods or window, 2), slope, np.nan)
+
+
+def drawdown(values) -> np.ndarray:
+    """Fractional decline from the running peak (0 at a new high, -0.25 = 25% below it)"""
+    values = np.asarray(values, dtype=np.float64)
+    peak = np.fmax.accumulate(values, axis=-1)
+    out = np.full(values.shape, np.nan)
+    np.divide(values - peak, np.abs(peak), out=out, where=(peak != 0) & ~np.isnan(values))
+    return out
+
+
+def max_drawdown(values) -> np.ndarray:
+    """Worst drawdown of each series over its whole history (e.g. of net profit)"""
+    drawdowns = drawdown(values)
+    out = np.full(drawdowns.shape[:-1], np.nan)
+    has = ~np.isnan(drawdowns).all(axis=-1)
+    out[has] = np.nanmin(drawdowns[has], axis=-1)
+    return out
+
+
+def trend_direction(values, threshold: float = TREND_THRESHOLD) -> np.ndarray:
+    """'improving' / 'declining' / 'stable' per series from its full-history slope"""
+    values = np.asarray(values, dtype=np.float64)
+    slope = rolling_slope(values, values.shape[-1], min_periods=2)[..., -1]
+    labels = np.full(slope.shape, 'stable', dtype=object)
+    labels[slope > threshold] = 'improving'
+    labels[slope < -threshold] = 'declining'
+    return labels
@@ -0,0 +1,172 @@
+"""
+Scenario Simulator
+Vectorized Monte Carlo paths for revenue, net profit, EPS and health score
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+from benchmark_profile import profile_for_sector
+from financial_calculator import FinancialCalculator
+
+PERCENTILES = (5, 50, 95)
+SIMULATED_METRICS = ('revenue', 'net_profit', 'eps', 'health_score')
+
+# Floors for volatilities estimated from only a handful of annual observations
+MIN_GROWTH_STD = 0.05
+MIN_MARGIN_STD = 0.01
+
+# Year-on-year persistence of net margin around its historical mean
+MARGIN_PERSISTENCE = 0.6
+
+# Ratios held at their latest value while revenue and margin are simulated
+HELD_RATIOS = ('current_ratio', 'quick_ratio', 'debt_to_equity', 'times_interest_earned', 'asset_turnover')
+
+
+class ScenarioInputs(NamedTuple):
+    """Per-company starting point and calibrated distributions"""
+    revenue: float
+    growth_mean: float
+    growth_std: float
+    margin: float
+    margin_mean: float
+    margin_std: float
+    shares_lakhs: float
+    ratios: Dict[str, float]
+    # The company's sector health benchmarks (a plain dict, so inputs pickle to workers)
+    health_benchmarks: Dict[str, float]
+
+
+class ScenarioBands(NamedTuple):
+    """Percentile bands, metric -> (len(PERCENTILES), horizon), over the paths drawn so far"""
+    company: str
+    years: Tuple[int, ...]
+    paths: int
+    bands: Dict[str, np.ndarray]
+
+
+def _last_valid(series: np.ndarray) -> float:
+    """Most recent non-NaN value of a chronological series"""
+    valid = series[~np.isnan(series)]
+    return float(valid[-1]) if len(valid) else np.nan
+
+
+def scenario_inputs(panel, company: str) -> ScenarioInputs:
+    """Calibrate growth and margin distributions from a company's income statement"""
+    revenue = panel.series(company, 'sales_turnover')
+    net_profit = panel.series(company, 'net_profit')
+    valid = ~np.isnan(revenue) & ~np.isnan(net_profit) & (revenue > 0)
+    if valid.sum() < 2:
+        raise ValueError(f"{company}: need at least two years of revenue and profit to simulate")
+
+    growth = np.diff(np.log(revenue[valid]))
+    margins = net_profit[valid] / revenue[valid]
+    return ScenarioInputs(
+        revenue=float(revenue[valid][-1]),
+        growth_mean=float(growth.mean()),
+        growth_std=max(float(growth.std(ddof=1)) if len(growth) > 1 else 0.0, MIN_GROWTH_STD),
+        margin=float(margins[-1]),
+        margin_mean=float(margins.mean()),
+        margin_std=max(float(margins.std(ddof=1)), MIN_MARGIN_STD),
+        shares_lakhs=_last_valid(panel.series(company, 'shares_lakhs')),
+        ratios={name: _last_valid(panel.series(company, name)) for name in HELD_RATIOS},
+        health_benchmarks=dict(profile_for_sector(panel.info[company].get('sector')).health)
+    )
+
+
+def simulate_batch(inputs: ScenarioInputs, n_paths: int, horizon: int,
+                   seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """Draw one batch of paths; every metric is a (n_paths, horizon) array"""
+    rng = np.random.default_rng(seed)
+
+    # Log-normal revenue growth
+    growth = rng.normal(inputs.growth_mean, inputs.growth_std, (n_paths, horizon))
+    revenue = inputs.revenue * np.exp(np.cumsum(growth, axis=1))
+
+    # AR(1) net margin reverting to its historical mean
+    shocks = rng.standard_normal((n_paths, horizon))
+    noise = inputs.margin_std * np.sqrt(1 - MARGIN_PERSISTENCE ** 2)
+    margin = np.empty((n_paths, horizon))
+    previous = np.full(n_paths, inputs.margin)
+    for t in range(horizon):
+        previous = (inputs.margin_mean + MARGIN_PERSISTENCE * (previous - inputs.margin_mean)
+                    + noise * shocks[:, t])
+        margin[:, t] = previous
+
+    net_profit = revenue * margin
+    # Net profit in crores over shares in lakhs -> rupees per share
+    eps = net_profit * 100 / inputs.shares_lakhs
+
+    # Balance-sheet ratios stay put; profitability follows the simulated margin
+    ratios = {name: np.full((n_paths, horizon), value) for name, value in inputs.ratios.items()}
+    ratios['net_profit_margin'] = margin * 100
+    ratios['return_on_assets'] = margin * inputs.ratios['asset_turnover'] * 100
+    health = FinancialCalculator.calculate_health_scores(ratios, benchmarks=inputs.health_benchmarks)['health']
+
+    return {'revenue': revenue, 'net_profit': net_profit, 'eps': eps, 'health_score': health}
+
+
+def simulate(panel, company: str, n_paths: int = 20000, horizon: int = 3,
+             batch_size: int = 5000, seed: int = 0,
+             workers: Optional[int] = None) -> Iterator[ScenarioBands]:
+    """
+    Stream percentile bands as batches of paths complete
+
+    Each batch gets its own child of SeedSequence(seed), so results are
+    identical whether batches run in-process or across `workers` processes.
+    Batches are copied into one preallocated (n_paths, horizon) buffer per
+    metric; bands are yielded after batches 1, 2, 4, 8, ... and the last,
+    so the percentile work stays linear in n_paths.
+    """
+    inputs = scenario_inputs(panel, company)
+    sizes = [min(batch_size, n_paths - start) for start in range(0, n_paths, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    last_year = max(panel.company_years(company))
+    years = tuple(range(last_year + 1, last_year + horizon + 1))
+
+    if workers and workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        batches = executor.map(simulate_batch, [inputs] * len(sizes), sizes, [horizon] * len(sizes), seeds)
+    else:
+        executor = None
+        batches = (simulate_batch(inputs, size, horizon, s) for size, s in zip(sizes, seeds))
+
+    samples = {metric: np.empty((n_paths, horizon)) for metric in SIMULATED_METRICS}
+    drawn = 0
+    try:
+        for count, batch in enumerate(batches, start=1):
+            size = len(batch['revenue'])
+            for metric in SIMULATED_METRICS:
+                samples[metric][drawn:drawn + size] = batch[metric]
+            drawn += size
+            if count & (count - 1) == 0 or count == len(sizes):
+                bands = {metric: np.nanpercentile(values[:drawn], PERCENTILES, axis=0)
+                         for metric, values in samples.items()}
+                yield ScenarioBands(company, years, drawn, bands)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def run_scenarios(panel, company: str, **kwargs) -> ScenarioBands:
+    """Final percentile bands once every batch has been drawn"""
+    result = None
+    for result in simulate(panel, company, **kwargs):
+        pass
+    return result
+
+
+if __name__ == "__main__":
+    import time
+    from data_extractor import FinancialDataExtractor
+
+    panel = FinancialDataExtractor("Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx").extract_panel()
+    for company in panel.companies:
+        start = time.perf_counter()
+        result = run_scenarios(panel, company, n_paths=50000, horizon=3)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n{company}: {result.paths:,} paths in {elapsed:.0f} ms")
+        for metric, band in result.bands.items():
+            cells = "  ".join(f"{y}: {lo:,.2f} / {mid:,.2f} / {hi:,.2f}"
+                              for y, lo, mid, hi in zip(result.years, *band))
+            print(f"   {metric:<13} P5/P50/P95  {cells}")
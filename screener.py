@@ -0,0 +1,200 @@
+"""
+Screener
+Sorted per-metric indexes answering range queries and top-k over a company universe
+"""
+
+import re
+import numpy as np
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from benchmark_profile import BenchmarkProfile, profiles_for_panel
+from financial_calculator import FinancialCalculator
+from financial_panel import FinancialPanel
+from ratio_engine import RATIOS
+from rolling_analytics import rolling_cagr
+
+# Screenable series added on top of the panel's ratios: name -> (source metric, CAGR window)
+GROWTH_METRICS = {
+    'revenue_cagr_3y': ('sales_turnover', 3),
+    'profit_cagr_3y': ('net_profit', 3),
+    'revenue_growth': ('sales_turnover', 1)
+}
+
+# "metric op number" with an optional % sign, joined by "and"
+_CONDITION = re.compile(r'^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(>=|<=|==|>|<)\s*(-?\d+(?:\.\d+)?)\s*%?\s*$')
+
+
+class Condition(NamedTuple):
+    """Closed or open range on one metric; None leaves that side unbounded"""
+    metric: str
+    low: Optional[float] = None
+    high: Optional[float] = None
+    low_inclusive: bool = False
+    high_inclusive: bool = False
+
+
+def parse_query(expression: str) -> List[Condition]:
+    """Parse e.g. "current_ratio > 1.5 and debt_to_equity < 0.5" into conditions"""
+    conditions = []
+    for clause in re.split(r'\s+and\s+', expression.strip(), flags=re.IGNORECASE):
+        match = _CONDITION.match(clause)
+        if not match:
+            raise ValueError(f"Cannot parse screen condition {clause!r}")
+        metric, op, number = match.group(1), match.group(2), float(match.group(3))
+        if op == '==':
+            conditions.append(Condition(metric, number, number, True, True))
+        elif op in ('>', '>='):
+            conditions.append(Condition(metric, low=number, low_inclusive=op == '>='))
+        else:
+            conditions.append(Condition(metric, high=number, high_inclusive=op == '<='))
+    return conditions
+
+
+class Screener:
+    """
+    Range and top-k queries over (company, year) metric arrays
+
+    Every (metric, year) column is sorted up front, one batched argsort per
+    metric, into company positions ordered by value with missing values
+    dropped; the screener is read-only afterwards, so reruns on several
+    threads can share it. A range predicate is then two binary searches, a
+    query intersects the matching position sets smallest first, and top-k
+    reads the end of the sorted column.
+    """
+
+    def __init__(self, values: Mapping[str, np.ndarray], companies: Sequence[str], years: Sequence[int]):
+        self.companies = tuple(companies)
+        self.years = tuple(int(y) for y in years)
+        self.year_index = {y: i for i, y in enumerate(self.years)}
+        expected = (len(self.companies), len(self.years))
+        self.values: Dict[str, np.ndarray] = {}
+        for metric, array in values.items():
+            array = np.asarray(array, dtype=np.float64)
+            if array.shape != expected:
+                raise ValueError(f"{metric} has shape {array.shape}, expected {expected}")
+            self.values[metric] = array
+        # (metric, year column) -> (company positions by ascending value, sorted values)
+        self._indexes: Dict[Tuple[str, int], Tuple[np.ndarray, np.ndarray]] = {}
+        for metric, array in self.values.items():
+            # NaN sorts last, so each column's present values are a prefix
+            orders = np.argsort(array, axis=0, kind='stable')
+            ordered = np.take_along_axis(array, orders, axis=0)
+            present = np.count_nonzero(~np.isnan(array), axis=0)
+            for column, count in enumerate(present):
+                index = (orders[:count, column].copy(), ordered[:count, column].copy())
+                for part in index:
+                    part.setflags(write=False)
+                self._indexes[(metric, column)] = index
+
+    @classmethod
+    def from_panel(cls, panel: FinancialPanel,
+                   profiles: Optional[Sequence[BenchmarkProfile]] = None) -> 'Screener':
+        """
+        Screener over a panel's ratios, health score and growth rates
+
+        Ratios are the ratio engine's names (as graded by grade_ratio);
+        'health_score' is calculate_health_scores' overall score, on each
+        company's sector profile unless `profiles` is given. Unreported
+        years are missing, so they never match.
+        """
+        values = {
+            metric: panel.metric(metric) for metric in RATIOS if metric in panel.metric_index
+        }
+        if profiles is None:
+            profiles = profiles_for_panel(panel)
+        values['health_score'] = FinancialCalculator.calculate_health_scores(panel, profiles=profiles)['health']
+        for name, (source, window) in GROWTH_METRICS.items():
+            if source in panel.metric_index:
+                values[name] = rolling_cagr(panel.metric(source), window)
+        values = {metric: np.where(panel.mask, array, np.nan) for metric, array in values.items()}
+        return cls(values, panel.companies, panel.years)
+
+    def _column(self, year: Optional[int]) -> int:
+        return len(self.years) - 1 if year is None else self.year_index[year]
+
+    def index(self, metric: str, year: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(company positions by ascending value, sorted values) for one metric and year"""
+        if metric not in self.values:
+            raise KeyError(f"Unknown screen metric {metric!r}; available: {sorted(self.values)}")
+        return self._indexes[(metric, self._column(year))]
+
+    def where(self, condition: Condition, year: Optional[int] = None) -> np.ndarray:
+        """Sorted company positions satisfying one condition"""
+        order, ordered = self.index(condition.metric, year)
+        start, stop = 0, len(ordered)
+        if condition.low is not None:
+            start = np.searchsorted(ordered, condition.low, side='left' if condition.low_inclusive else 'right')
+        if condition.high is not None:
+            stop = np.searchsorted(ordered, condition.high, side='right' if condition.high_inclusive else 'left')
+        return np.sort(order[start:max(start, stop)])
+
+    def screen(self, conditions: Sequence[Condition], year: Optional[int] = None) -> np.ndarray:
+        """Sorted company positions satisfying every condition"""
+        if not conditions:
+            return np.arange(len(self.companies))
+        matches = sorted((self.where(c, year) for c in conditions), key=len)
+        result = matches[0]
+        for other in matches[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, other, assume_unique=True)
+        return result
+
+    def top(self, metric: str, k: int, year: Optional[int] = None,
+            among: Optional[np.ndarray] = None, ascending: bool = False) -> np.ndarray:
+        """Positions of the k best companies on a metric (highest first unless ascending)"""
+        order, _ = self.index(metric, year)
+        if among is not None:
+            members = np.zeros(len(self.companies), dtype=bool)
+            members[among] = True
+            order = order[members[order]]
+        return order[:k] if ascending else order[::-1][:k]
+
+    def query(self, expression: str, year: Optional[int] = None, order_by: Optional[str] = None,
+              k: Optional[int] = None, ascending: bool = False) -> List[str]:
+        """
+        Company names matching a query string, optionally ranked and truncated
+
+        e.g. query("current_ratio > 1.5 and debt_to_equity < 0.5 and revenue_cagr_3y > 20%",
+                   order_by='health_score', k=10)
+        """
+        positions = self.screen(parse_query(expression) if expression.strip() else [], year)
+        if order_by is not None:
+            positions = self.top(order_by, len(positions) if k is None else k, year,
+                                 among=positions, ascending=ascending)
+        elif k is not None:
+            positions = positions[:k]
+        return [self.companies[i] for i in positions]
+
+
+if __name__ == "__main__":
+    import time
+    from data_extractor import FinancialDataExtractor
+
+    panel = FinancialDataExtractor("Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx").extract_panel()
+    screener = Screener.from_panel(panel)
+    print("=" * 60)
+    print("SCREENER")
+    print("=" * 60)
+    print(f"current_ratio > 1.5 and health_score > 60: {screener.query('current_ratio > 1.5 and health_score > 60')}")
+    print(f"Ranked by ROA: {screener.query('', order_by='return_on_assets')}")
+
+    # 10,000 companies x 20 years
+    rng = np.random.default_rng(0)
+    shape = (10000, 20)
+    values = {
+        'current_ratio': rng.lognormal(0.4, 0.5, shape),
+        'debt_to_equity': rng.lognormal(-1.0, 0.8, shape),
+        'revenue_cagr_3y': rng.normal(12, 10, shape),
+        'health_score': rng.uniform(20, 100, shape)
+    }
+    expression = "current_ratio > 1.5 and debt_to_equity < 0.5 and revenue_cagr_3y > 20%"
+
+    start = time.perf_counter()
+    universe = Screener(values, [f"C{i:05d}" for i in range(shape[0])], range(2006, 2026))
+    build = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for year in universe.years:
+        hits = universe.query(expression, year=year, order_by='health_score', k=10)
+    indexed = (time.perf_counter() - start) * 1000 / len(universe.years)
+    print(f"\n10k companies x 20 years: {build:.1f} ms to build every index, {indexed:.2f} ms/year per query")
+    print(f"Top 10 by health in {universe.years[-1]}: {hits}")
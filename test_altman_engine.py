@@ -0,0 +1,60 @@
+"""
+Tests for batch Altman Z / Z'' scoring
+Run with: python -m pytest test_altman_engine.py
+"""
+
+import pickle
+import numpy as np
+import pytest
+from altman_engine import AltmanAnalysis, altman_analysis, altman_inputs, altman_score, classify_zone
+from data_extractor import FinancialDataExtractor
+from ratio_engine import statement_lines
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return FinancialDataExtractor(EXCEL_FILE).extract_panel()
+
+
+def test_scores_are_finite_for_every_reported_year(panel):
+    analysis = AltmanAnalysis(panel)
+    for company in panel.companies:
+        c = panel.company_index[company]
+        reported = panel.mask[c]
+        for model in ('z', 'z_double_prime'):
+            assert np.isfinite(analysis.scores[model][c, reported]).all(), (company, model)
+        assert 'N/A' not in analysis.zones[c, reported], company
+
+
+def test_debt_free_company_has_liabilities(panel):
+    # BEL reports no borrowings; its liabilities are current liabilities and provisions
+    inputs = altman_inputs(panel)
+    bel = panel.company_index['bel']
+    assert np.isfinite(inputs['x4_book'][bel, panel.mask[bel]]).all()
+    latest = panel.year_column(panel.company_years('bel')[-1])
+    assert AltmanAnalysis(panel).scores['z_double_prime'][bel, latest] > 2.6
+
+
+def test_gross_assets_add_back_current_liabilities(panel):
+    lines = statement_lines(panel)
+    gross = lines['total_assets'] + lines['current_liabilities'] + np.nan_to_num(lines['provisions'])
+    inputs = altman_inputs(panel)
+    assert np.allclose(inputs['x5'], lines['sales'] / gross, equal_nan=True)
+    assert np.allclose(inputs['x4_book'], lines['equity'] / (gross - lines['equity']), equal_nan=True)
+
+
+def test_score_and_zone_kernels():
+    inputs = {name: np.array([[0.1, np.nan]]) for name in ('x1', 'x2', 'x3', 'x4', 'x4_book', 'x5')}
+    inputs['x5'] = np.array([[np.nan, np.nan]])
+    z = altman_score(inputs, 'z')
+    z_double_prime = altman_score(inputs, 'z_double_prime')
+    assert np.isnan(z).all()
+    # Z'' has no sales term, so a missing X5 does not blank it
+    assert z_double_prime[0, 0] == pytest.approx(0.1 * (6.56 + 3.26 + 6.72 + 1.05))
+    assert list(classify_zone([1.0, 2.0, 3.5, np.nan], 'z')) == ['distress', 'grey', 'safe', 'N/A']
+
+
+def test_cached_per_dataset_content(panel):
+    assert altman_analysis(pickle.loads(pickle.dumps(panel))) is altman_analysis(panel)
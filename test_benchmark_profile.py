@@ -0,0 +1,57 @@
+"""
+Tests for compiled benchmark profiles, ad-hoc grading and sector selection
+Run with: python -m pytest test_benchmark_profile.py
+"""
+
+import numpy as np
+import pytest
+from benchmark_profile import (
+    DEFAULT_PROFILE, DEFENSE_PROFILE, EMS_PROFILE, grade_by_company, ladder_grade, profiles_for_panel
+)
+from data_extractor import FinancialDataExtractor
+from financial_calculator import FinancialCalculator
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return FinancialDataExtractor(EXCEL_FILE).extract_panel()
+
+
+@pytest.mark.parametrize('ratio', sorted(DEFAULT_PROFILE.thresholds))
+def test_compiled_grades_match_ladder(ratio):
+    values = np.concatenate([np.random.default_rng(1).uniform(-1, 40, 500),
+                             list(DEFAULT_PROFILE.thresholds[ratio].values()), [np.nan]])
+    expected = ladder_grade(DEFAULT_PROFILE.thresholds[ratio], values, ratio in DEFAULT_PROFILE.lower_is_better)
+    assert list(DEFAULT_PROFILE.grade(ratio, values)) == list(expected)
+
+
+def test_non_monotone_benchmarks_fall_back_to_ladder():
+    benchmarks = {'current_ratio': {'A': 2.0, 'B': 1.0, 'C': 1.5, 'D': 0.5}}
+    assert FinancialCalculator.grade_ratio('current_ratio', 1.3, benchmarks) == 'B'
+    assert FinancialCalculator.grade_ratio('current_ratio', 0.7, benchmarks) == 'D'
+    assert FinancialCalculator.grade_ratio('quick_ratio', 0.7, benchmarks) == 'N/A'
+    grades = FinancialCalculator.grade_ratio('current_ratio', np.array([2.5, 1.2, 0.1]), benchmarks)
+    assert list(grades) == ['A', 'B', 'F']
+
+
+def test_panel_companies_get_sector_profiles(panel):
+    profiles = dict(zip(panel.companies, profiles_for_panel(panel)))
+    assert profiles['kaynes'] is EMS_PROFILE
+    assert profiles['bel'] is DEFENSE_PROFILE
+
+
+def test_grade_by_company_uses_each_profile(panel):
+    profiles = profiles_for_panel(panel)
+    grades = grade_by_company('current_ratio', panel.metric('current_ratio'), profiles)
+    for c, profile in enumerate(profiles):
+        assert list(grades[c]) == list(profile.grade('current_ratio', panel.metric('current_ratio')[c]))
+
+
+def test_health_scores_per_company_profile(panel):
+    profiles = profiles_for_panel(panel)
+    mixed = FinancialCalculator.calculate_health_scores(panel, profiles=profiles)['health']
+    for c, profile in enumerate(profiles):
+        single = FinancialCalculator.calculate_health_scores(panel, profile=profile)['health']
+        assert np.array_equal(mixed[c], single[c], equal_nan=True)
@@ -0,0 +1,118 @@
+"""
+Tests for the dashboard chart builders and their figure cache
+Run with: python -m pytest test_chart_components.py
+"""
+
+import threading
+import time
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+from chart_components import DashboardCharts, FigureCache
+from data_extractor import FinancialDataExtractor
+from forecasting import MODELS, forecast_panel
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+YEARS = [2022, 2023, 2024, 2025]
+
+
+def _forecasts(figure):
+    return {trace.name: (list(trace.x), list(trace.y)) for trace in figure.data if 'Forecast' in trace.name}
+
+
+def test_trend_line_forecasts_unequal_series():
+    figure = DashboardCharts.create_trend_line(YEARS, [1, 2, 3, 4], [1, 2, 3], 't', 'y', show_forecast=True)
+    forecasts = _forecasts(figure)
+    assert forecasts['Kaynes Forecast'] == ([2025, 2026], [4.0, 5.0])
+    # The shorter series is fitted on the years it has and extended from its last one
+    assert forecasts['BEL Forecast'] == ([2024, 2026], [3.0, 5.0])
+
+
+def test_trend_line_skips_unreported_series():
+    figure = DashboardCharts.create_trend_line(YEARS, [1, 2, 3, 4], [np.nan] * 4, 't', 'y', show_forecast=True)
+    assert list(_forecasts(figure)) == ['Kaynes Forecast']
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return FinancialDataExtractor(EXCEL_FILE).extract_panel()
+
+
+@pytest.mark.parametrize('model', MODELS)
+def test_panel_trend_line_plots_the_cached_panel_forecast(panel, model):
+    years = list(panel.common_years)
+    figure = DashboardCharts.create_panel_trend_line(panel, 'sales_turnover', 't', 'y', show_forecast=True,
+                                                     years=years, model=model)
+    assert list(figure.data[0].x) == years
+    forecasts = _forecasts(figure)
+    result = forecast_panel(panel, 'sales_turnover', model=model)
+    for company, name in (('kaynes', 'Kaynes Forecast'), ('bel', 'BEL Forecast')):
+        x, y = forecasts[name]
+        assert x == [years[-1], years[-1] + 1]
+        assert y[1] == result.point[panel.company_index[company], 0]
+
+
+def test_panel_trend_line_forecast_needs_the_latest_year(panel):
+    with pytest.raises(ValueError):
+        DashboardCharts.create_panel_trend_line(panel, 'sales_turnover', 't', 'y', show_forecast=True,
+                                                years=list(panel.common_years)[:-1])
+
+
+def test_figure_cache_hits_and_evicts():
+    cache = FigureCache(maxsize=2)
+    build = cache.wrap(lambda values, title: go.Figure(go.Scatter(y=values), layout=dict(title=title)))
+    first = build(np.arange(3.0), 'a')
+    assert build(np.arange(3.0), 'a') is first
+    assert build(np.arange(4.0), 'a') is not first
+    build(np.arange(5.0), 'a')
+    assert cache.stats()['size'] == 2
+    assert build(np.arange(3.0), 'a') is not first
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 4)
+
+
+def test_figure_cache_evicts_least_recently_used():
+    cache = FigureCache(maxsize=2)
+    build = cache.wrap(lambda title: go.Figure(layout=dict(title=title)))
+    first = build('a')
+    build('b')
+    # Reading 'a' makes 'b' the eviction candidate
+    assert build('a') is first
+    build('c')
+    assert build('a') is first
+    assert cache.stats()['misses'] == 3
+
+
+def test_figure_cache_counts_every_concurrent_hit():
+    cache = FigureCache()
+    build = cache.wrap(lambda title: go.Figure(layout=dict(title=title)))
+    build('t')
+
+    def hammer():
+        for _ in range(200):
+            build('t')
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1600, 1)
+
+
+def test_figure_cache_concurrent_misses_share_one_figure():
+    cache = FigureCache()
+
+    def slow(title):
+        time.sleep(0.02)
+        return go.Figure(layout=dict(title=title))
+
+    build = cache.wrap(slow)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(build('t'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8 and all(figure is results[0] for figure in results)
+    assert cache.stats()['size'] == 1
@@ -4,6 +4,7 @@ Test script to verify all dashboard components work correctly
 
 import sys
 from data_extractor import FinancialDataExtractor
+from dataset_cache import DatasetCache
 from financial_calculator import FinancialCalculator as calc
 from chart_components import DashboardCharts as charts
 
@@ -16,7 +17,7 @@ excel_file = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
 
 print("\n1. Testing Data Extraction...")
 try:
-    extractor = FinancialDataExtractor(excel_file)
+    extractor = FinancialDataExtractor(excel_file, cache=DatasetCache())
     kaynes_data, bel_data = extractor.extract_all_data()
     print("   ✅ Data extraction successful!")
     
@@ -0,0 +1,85 @@
+"""
+Tests for the content-hash keyed dataset cache
+Run with: python -m pytest test_dataset_cache.py
+"""
+
+import io
+import os
+import shutil
+from data_extractor import FinancialDataExtractor
+from dataset_cache import DatasetCache, workbook_digest
+from workbook_layout import layout_fingerprint
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+
+def test_digest_ignores_stream_position():
+    with open(EXCEL_FILE, 'rb') as stream:
+        expected = workbook_digest(EXCEL_FILE)
+        assert workbook_digest(stream) == expected
+        stream.read(123)
+        assert workbook_digest(stream) == expected
+        assert stream.tell() == 123
+
+
+def test_round_trip_matches_fresh_parse(tmp_path):
+    fresh = FinancialDataExtractor(EXCEL_FILE).extract_datasets()
+    cache = DatasetCache(str(tmp_path))
+    first = FinancialDataExtractor(EXCEL_FILE, cache=cache).extract_datasets()
+    second = FinancialDataExtractor(EXCEL_FILE, cache=cache).extract_datasets()
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert first == fresh
+    assert second == fresh
+
+
+def test_changed_workbook_misses(tmp_path):
+    cache = DatasetCache(str(tmp_path / 'cache'))
+    copy = tmp_path / 'copy.xlsx'
+    shutil.copy(EXCEL_FILE, copy)
+    FinancialDataExtractor(str(copy), cache=cache).extract_datasets()
+    layout_id = layout_fingerprint(FinancialDataExtractor(str(copy)).layout)
+    assert cache.get(cache.make_key(str(copy), layout_id)) is not None
+    with open(copy, 'ab') as stream:
+        stream.write(b'\0')
+    assert cache.get(cache.make_key(str(copy), layout_id)) is None
+
+
+def test_changed_layout_misses(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    extractor = FinancialDataExtractor(EXCEL_FILE, cache=cache)
+    extractor.extract_datasets()
+    layout = {key: dict(value) for key, value in extractor.layout.items()}
+    layout['kaynes']['company'] = 'Renamed'
+    assert layout_fingerprint(layout) != layout_fingerprint(extractor.layout)
+    datasets = FinancialDataExtractor(EXCEL_FILE, layout=layout, cache=cache).extract_datasets()
+    assert datasets['kaynes']['company'] == 'Renamed'
+    assert cache.misses == 2
+
+
+def test_corrupt_entry_is_dropped(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    key = cache.make_key(EXCEL_FILE, 'layout')
+    cache.put(key, FinancialDataExtractor(EXCEL_FILE).extract_datasets())
+    path = os.path.join(str(tmp_path), key + '.npz')
+    with open(path, 'wb') as stream:
+        stream.write(b'not a zip')
+    assert cache.get(key) is None
+    assert not os.path.exists(path)
+
+
+def test_eviction_keeps_newest_entry(tmp_path):
+    datasets = FinancialDataExtractor(EXCEL_FILE).extract_datasets()
+    cache = DatasetCache(str(tmp_path), max_bytes=1)
+    cache.put('old', datasets)
+    cache.put('new', datasets)
+    assert cache.get('old') is None
+    assert cache.get('new') == datasets
+    assert cache.evictions == 1
+
+
+def test_file_object_source(tmp_path):
+    with open(EXCEL_FILE, 'rb') as stream:
+        upload = io.BytesIO(stream.read())
+    upload.seek(50)
+    cache = DatasetCache(str(tmp_path))
+    assert cache.make_key(upload, 'x') == cache.make_key(EXCEL_FILE, 'x')
@@ -0,0 +1,49 @@
+"""
+Tests for the 3- and 5-point DuPont decompositions
+Run with: python -m pytest test_dupont_engine.py
+"""
+
+import pickle
+import numpy as np
+import pytest
+from data_extractor import FinancialDataExtractor
+from dupont_engine import DUPONT_3POINT, DUPONT_5POINT, FACTOR_LABELS, dupont_analysis
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return FinancialDataExtractor(EXCEL_FILE).extract_panel()
+
+
+@pytest.mark.parametrize('points', (3, 5))
+def test_factors_multiply_back_to_roe(panel, points):
+    analysis = dupont_analysis(panel)
+    roe = analysis.factors['roe']
+    assert np.isfinite(roe[panel.mask]).all()
+    np.testing.assert_allclose(analysis.roe(points)[panel.mask], roe[panel.mask], rtol=1e-12)
+
+
+def test_components_multiply_back_to_roe(panel):
+    analysis = dupont_analysis(panel)
+    for company in panel.companies:
+        for year in panel.company_years(company):
+            for points, names in ((3, DUPONT_3POINT), (5, DUPONT_5POINT)):
+                components = analysis.components(company, year, points)
+                product = np.prod([components[FACTOR_LABELS[name]] for name in names])
+                assert product == pytest.approx(components['ROE'], rel=1e-12), (company, year, points)
+
+
+def test_unreported_years_are_nan(panel):
+    analysis = dupont_analysis(panel)
+    assert np.isnan(analysis.factors['roe'][~panel.mask]).all()
+
+
+def test_rejects_other_decompositions(panel):
+    with pytest.raises(ValueError):
+        dupont_analysis(panel).components('kaynes', panel.company_years('kaynes')[-1], points=4)
+
+
+def test_cached_per_dataset_content(panel):
+    assert dupont_analysis(pickle.loads(pickle.dumps(panel))) is dupont_analysis(panel)
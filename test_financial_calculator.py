@@ -0,0 +1,53 @@
+"""
+Tests for the batched health score against the scalar calculate_health_score
+Run with: python -m pytest test_financial_calculator.py
+"""
+
+import numpy as np
+import pytest
+from data_extractor import FinancialDataExtractor
+from financial_calculator import FinancialCalculator
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+HEALTH_RATIOS = (
+    'current_ratio', 'quick_ratio', 'debt_to_equity', 'times_interest_earned',
+    'net_profit_margin', 'return_on_assets', 'asset_turnover'
+)
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return FinancialDataExtractor(EXCEL_FILE).extract_panel()
+
+
+def test_batched_matches_scalar_on_panel(panel):
+    batched = FinancialCalculator.calculate_health_scores(panel)['health']
+    for company in panel.companies:
+        c = panel.company_index[company]
+        for year in panel.company_years(company):
+            y = panel.year_index[year]
+            ratios = {name: [panel.metric(name)[c, y]] for name in HEALTH_RATIOS}
+            if any(np.isnan(ratios[name][0]) for name in HEALTH_RATIOS if name != 'asset_turnover'):
+                continue
+            assert round(batched[c, y], 2) == FinancialCalculator.calculate_health_score(ratios), (company, year)
+
+
+def test_batched_matches_scalar_on_random_ratios():
+    rng = np.random.default_rng(7)
+    shape = (50, 6)
+    ratios = {name: rng.uniform(0, 30, shape) if name == 'times_interest_earned' else rng.uniform(0, 3, shape)
+              for name in HEALTH_RATIOS}
+    ratios['net_profit_margin'] = rng.uniform(-10, 30, shape)
+    ratios['return_on_assets'] = rng.uniform(-5, 20, shape)
+    ratios['asset_turnover'][rng.random(shape) < 0.2] = np.nan
+    batched = FinancialCalculator.calculate_health_scores(ratios)['health']
+    for c, y in np.ndindex(shape):
+        scalar = FinancialCalculator.calculate_health_score({name: [ratios[name][c, y]] for name in HEALTH_RATIOS})
+        assert round(batched[c, y], 2) == pytest.approx(scalar, abs=1e-9)
+
+
+def test_masked_cells_have_no_score(panel):
+    health = FinancialCalculator.calculate_health_scores(panel)['health']
+    assert np.isnan(health[~panel.mask]).all()
+    assert not np.isnan(health[panel.mask]).any()
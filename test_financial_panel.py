@@ -0,0 +1,68 @@
+"""
+Tests for digest-keyed memoization of panel computations
+Run with: python -m pytest test_financial_panel.py
+"""
+
+import pickle
+import threading
+import time
+import pytest
+from data_extractor import FinancialDataExtractor
+from financial_panel import cached_by_digest
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return FinancialDataExtractor(EXCEL_FILE).extract_panel()
+
+
+def test_copies_share_an_entry(panel):
+    calls = []
+
+    @cached_by_digest()
+    def build(p):
+        calls.append(p)
+        return object()
+
+    assert build(panel) is build(pickle.loads(pickle.dumps(panel)))
+    assert len(calls) == 1
+    build.cache_clear()
+    build(panel)
+    assert len(calls) == 2
+
+
+def test_concurrent_callers_compute_once(panel):
+    calls = []
+
+    @cached_by_digest()
+    def build(p):
+        calls.append(p)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(build(panel))) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 16 and all(result is results[0] for result in results)
+
+
+def test_failed_compute_is_retried(panel):
+    attempts = []
+
+    @cached_by_digest()
+    def build(p):
+        attempts.append(p)
+        if len(attempts) == 1:
+            raise RuntimeError("transient")
+        return len(attempts)
+
+    with pytest.raises(RuntimeError):
+        build(panel)
+    assert build(panel) == 2
+    assert build(panel) == 2
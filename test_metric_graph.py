@@ -0,0 +1,62 @@
+"""
+Tests for the metric graph and the what-if engine built on it
+Run with: python -m pytest test_metric_graph.py
+"""
+
+import pickle
+import numpy as np
+import pytest
+from benchmark_profile import profiles_for_panel
+from data_extractor import FinancialDataExtractor
+from financial_calculator import FinancialCalculator
+from metric_graph import GRAPH_RATIOS, build_metric_graph
+from ratio_engine import derive_ratios
+from whatif_engine import OUTPUTS, WhatIfEngine, whatif_engine
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return FinancialDataExtractor(EXCEL_FILE).extract_panel()
+
+
+def test_unshocked_graph_matches_ratio_engine(panel):
+    graph = build_metric_graph(panel)
+    derived = derive_ratios(panel)
+    for ratio in GRAPH_RATIOS:
+        assert np.allclose(graph.get(ratio), derived[ratio], equal_nan=True), ratio
+    assert np.array_equal(graph.get('shocked_net_profit'), panel.metric('net_profit'), equal_nan=True)
+
+
+def test_unshocked_health_matches_batched_score(panel):
+    expected = FinancialCalculator.calculate_health_scores(panel, profiles=profiles_for_panel(panel))['health']
+    assert np.array_equal(build_metric_graph(panel).get('health_score'), expected, equal_nan=True)
+
+
+def test_driver_change_recomputes_only_dependents(panel):
+    graph = build_metric_graph(panel)
+    graph.evaluate(*graph.names)
+    margin = graph.get('gross_profit_margin')
+    graph.source('interest_rate_pct', 50.0)
+    graph.evaluate(*graph.names)
+    stats = graph.stats()
+    assert stats['recomputed'] == len(graph.dependents('interest_rate_pct'))
+    assert stats['reused'] > 0
+    assert graph.get('gross_profit_margin') is margin
+    graph.evaluate(*graph.names)
+    assert graph.stats()['recomputed'] == 0
+
+
+def test_whatif_outputs_are_independent_copies(panel):
+    engine = WhatIfEngine(panel)
+    outputs = engine.run([[10.0, 25.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]])
+    assert set(outputs) == set(OUTPUTS)
+    assert outputs['health_score'].shape == (2,) + panel.mask.shape
+    assert np.allclose(outputs['net_profit_margin'][1], derive_ratios(panel)['net_profit_margin'], equal_nan=True)
+    outputs['roe'][:] = 0.0
+    assert not np.allclose(engine.run([[10.0, 25.0, 0.0, 0.0]])['roe'][0][panel.mask], 0.0)
+
+
+def test_engine_cached_per_dataset_content(panel):
+    assert whatif_engine(pickle.loads(pickle.dumps(panel))) is whatif_engine(panel)
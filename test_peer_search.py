@@ -0,0 +1,55 @@
+"""
+Tests for nearest-neighbour peer search
+Run with: python -m pytest test_peer_search.py
+"""
+
+import numpy as np
+from peer_search import FEATURES, MIN_PEER_COMPANIES, PeerIndex
+
+YEARS = [2024, 2025]
+
+
+def _index(features, mask=None):
+    companies = [f"C{i}" for i in range(len(features))]
+    return PeerIndex(np.repeat(np.asarray(features, dtype=np.float64)[:, :, None], len(YEARS), axis=2),
+                     companies, YEARS, mask)
+
+
+def test_distances_follow_the_inputs():
+    rng = np.random.default_rng(3)
+    features = rng.lognormal(0, 0.5, (8, len(FEATURES)))
+    before = dict(_index(features).nearest('C0', 2025, k=7))
+    # Move C5 most of the way to C0: it becomes the nearest peer and its distance shrinks
+    features[5] = features[0] + (features[5] - features[0]) * 0.05
+    after = _index(features).nearest('C0', 2025, k=7)
+    assert after[0][0] == 'C5'
+    assert after[0][1] < before['C5']
+    assert len({round(distance, 6) for _, distance in after}) > 1
+
+
+def test_all_nearest_matches_single_queries():
+    index = _index(np.random.default_rng(4).lognormal(0, 0.5, (30, len(FEATURES))))
+    positions, distances = index.all_nearest(2025, k=3, block_size=7)
+    for row, company in enumerate(index.companies):
+        expected = index.nearest(company, 2025, k=3)
+        assert [index.companies[p] for p in positions[row]] == [name for name, _ in expected]
+        assert np.allclose(distances[row], [distance for _, distance in expected])
+
+
+def test_two_companies_are_not_comparable():
+    rng = np.random.default_rng(5)
+    gaps = {round(dict(_index(rng.lognormal(0, 0.5, (2, len(FEATURES)))).nearest('C0', 2025))['C1'], 6)
+            for _ in range(5)}
+    # Median/IQR over two companies makes every pair the same distance apart
+    assert len(gaps) == 1
+    assert not _index(np.ones((2, len(FEATURES)))).comparable(2025)
+    assert _index(np.ones((MIN_PEER_COMPANIES, len(FEATURES)))).comparable(2025)
+
+
+def test_unreported_year_is_excluded():
+    mask = np.ones((4, len(YEARS)), dtype=bool)
+    mask[1:, 0] = False
+    index = _index(np.random.default_rng(6).lognormal(0, 0.5, (4, len(FEATURES))), mask)
+    assert index.reporting_count(2024) == 1
+    assert not index.comparable(2024)
+    assert index.comparable(2025)
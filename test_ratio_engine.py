@@ -0,0 +1,109 @@
+"""
+Tests for statement line items and derived ratios against the workbook
+Run with: python -m pytest test_ratio_engine.py
+"""
+
+import numpy as np
+import pytest
+from data_extractor import FinancialDataExtractor
+from ratio_engine import derive_ratios, statement_lines
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+# Sheet ratios computed the same way for both companies. Not used as
+# references: BEL's D/E and both debt ratios are hardcoded to 1, ROA divides
+# total income by total assets, and Kaynes' cash ratio counts investments.
+SHEET_RATIOS = (
+    'current_ratio', 'quick_ratio', 'times_interest_earned',
+    'operating_profit_margin', 'net_profit_margin'
+)
+
+
+@pytest.fixture(scope='module')
+def extractor():
+    return FinancialDataExtractor(EXCEL_FILE)
+
+
+@pytest.fixture(scope='module')
+def panel(extractor):
+    return extractor.extract_panel()
+
+
+@pytest.fixture(scope='module')
+def workbook(extractor):
+    # extract_all_data returns the sheet's own values, newest year first
+    kaynes, bel = extractor.extract_all_data()
+    return {'kaynes': kaynes, 'bel': bel}
+
+
+def _sheet(workbook, company, statement, metric):
+    block = workbook[company][statement]
+    return dict(zip(block['years'], block[metric]))
+
+
+def _derived(panel, values, company):
+    row = values[panel.company_index[company]]
+    return {year: row[panel.year_index[year]] for year in panel.company_years(company)}
+
+
+@pytest.mark.parametrize('company', ['kaynes', 'bel'])
+@pytest.mark.parametrize('ratio', SHEET_RATIOS)
+def test_ratios_match_sheet(panel, workbook, company, ratio):
+    sheet = _sheet(workbook, company, 'ratios', ratio)
+    derived = _derived(panel, panel.metric(ratio), company)
+    for year, value in sheet.items():
+        if value is not None:
+            assert derived[year] == pytest.approx(value, rel=1e-3), year
+
+
+def test_gross_margin_uses_direct_costs(panel, workbook):
+    # BEL's sheet GPM is (sales - raw materials - power - employees + stock adjustments) / sales
+    sheet = _sheet(workbook, 'bel', 'ratios', 'gross_profit_margin')
+    derived = _derived(panel, panel.metric('gross_profit_margin'), 'bel')
+    for year, value in sheet.items():
+        assert derived[year] == pytest.approx(value, rel=1e-3), year
+    # Kaynes: same cost basis; the sheet adds its stock adjustments instead, so allow the gap
+    kaynes = _derived(panel, panel.metric('gross_profit_margin'), 'kaynes')
+    assert kaynes[2025] == pytest.approx(19.48, abs=0.5)
+
+
+def test_reported_lines_are_preferred(panel, workbook):
+    lines = statement_lines(panel)
+    for metric, line in [('total_debt', 'debt'), ('total_assets', 'total_assets'),
+                         ('current_assets', 'current_assets'), ('networth', 'equity')]:
+        sheet = _sheet(workbook, 'kaynes', 'balance_sheet', metric)
+        derived = _derived(panel, lines[line], 'kaynes')
+        for year, value in sheet.items():
+            assert derived[year] == pytest.approx(value), (metric, year)
+    bel_assets = _sheet(workbook, 'bel', 'balance_sheet', 'total_assets')
+    for year, value in _derived(panel, lines['total_assets'], 'bel').items():
+        assert value == pytest.approx(bel_assets[year])
+
+
+def test_identities_fill_missing_lines(panel):
+    lines = statement_lines(panel)
+    c = panel.company_index['bel']
+    # BEL reports no debt line: capital employed less equity, which is zero for the debt-free BEL
+    assert np.allclose(lines['debt'][c], lines['capital_employed'][c] - lines['equity'][c], atol=1e-6)
+    assert np.allclose(lines['debt'][c], 0.0, atol=1e-6)
+
+
+def test_kaynes_leverage_matches_sheet(panel, workbook):
+    sheet = _sheet(workbook, 'kaynes', 'ratios', 'debt_to_equity')
+    derived = _derived(panel, panel.metric('debt_to_equity'), 'kaynes')
+    for year, value in sheet.items():
+        assert derived[year] == pytest.approx(value, rel=1e-3), year
+
+
+def test_dupont_identities_hold(panel):
+    ratios = derive_ratios(panel)
+    valid = panel.mask & ~np.isnan(ratios['roe_5point'])
+    roe = ratios['net_profit_margin'] / 100 * ratios['asset_turnover'] * ratios['equity_multiplier']
+    assert np.allclose(ratios['roe_3point'][valid], roe[valid])
+    assert np.allclose(ratios['roe_5point'][valid], ratios['roe_3point'][valid])
+
+
+def test_unreported_years_have_no_ratios(panel):
+    ratios = derive_ratios(panel)
+    for values in ratios.values():
+        assert np.isnan(values[~panel.mask]).all()
@@ -0,0 +1,70 @@
+"""
+Tests for the sliding-window kernels against hand-computed values
+Run with: python -m pytest test_rolling_analytics.py
+"""
+
+import numpy as np
+from rolling_analytics import (max_drawdown, rolling_cagr, rolling_mean, rolling_slope, rolling_std,
+                               rolling_window, trend_direction, yoy_change)
+
+NAN = np.nan
+
+
+def assert_same(actual, expected):
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12, equal_nan=True)
+
+
+def test_yoy_change():
+    assert_same(yoy_change([100, 110, 99, 120]), [NAN, 10, -10, 100 * 21 / 99])
+    # A loss shrinking from -50 to -25 is a 50% improvement
+    assert_same(yoy_change([-50, -25]), [NAN, 50])
+
+
+def test_yoy_change_nan_gaps_and_zero_base():
+    assert_same(yoy_change([100, NAN, 120, 0, 10]), [NAN, NAN, NAN, -100, NAN])
+    assert_same(yoy_change([100, NAN, 120], periods=2), [NAN, NAN, 20])
+
+
+def test_rolling_cagr():
+    assert_same(rolling_cagr([100, 110, 121, 133.1], 2), [NAN, NAN, 10, 10])
+    assert_same(rolling_cagr([100, 200, 400], 1), [NAN, 100, 100])
+
+
+def test_rolling_cagr_nan_gaps_and_non_positive_ends():
+    assert_same(rolling_cagr([100, NAN, 121, NAN], 2), [NAN, NAN, 10, NAN])
+    assert_same(rolling_cagr([-10, 20, 40, 0], 1), [NAN, NAN, 100, NAN])
+
+
+def test_kernels_run_along_the_last_axis_of_2d_arrays():
+    values = np.array([[100, 110, 121], [50, 25, 50]], dtype=float)
+    assert_same(rolling_cagr(values, 2), [[NAN, NAN, 10], [NAN, NAN, 0]])
+    assert_same(yoy_change(values), [[NAN, 10, 10], [NAN, -50, 100]])
+
+
+def test_rolling_mean_and_std():
+    assert_same(rolling_mean([1, 2, 3, 4], 2), [NAN, 1.5, 2.5, 3.5])
+    assert_same(rolling_std([1, 2, 3, 4], 3), [NAN, NAN, 1, 1])
+    # Centring keeps large magnitudes exact
+    assert_same(rolling_std(np.array([1, 2, 3]) + 1e9, 3), [NAN, NAN, 1])
+
+
+def test_rolling_std_skips_nan_with_min_periods():
+    assert_same(rolling_std([1, NAN, 3, 5], 3, min_periods=2), [NAN, NAN, np.sqrt(2), np.sqrt(2)])
+    assert_same(rolling_std([1, NAN, 3, 5], 3), [NAN, NAN, NAN, NAN])
+
+
+def test_rolling_slope_and_trend_direction():
+    assert_same(rolling_slope([1, 3, NAN, 7], 4, min_periods=2), [NAN, NAN, NAN, 2])
+    labels = trend_direction([[1, 2, 3], [3, 2, 1], [1, 1.01, 1]])
+    assert list(labels) == ['improving', 'declining', 'stable']
+
+
+def test_max_drawdown():
+    assert_same(max_drawdown([[100, 150, 75, 120], [1, 2, 3, 4], [NAN, NAN, NAN, NAN]]), [-0.5, 0, NAN])
+
+
+def test_rolling_window_is_a_view():
+    values = np.arange(5.0)
+    windows = rolling_window(values, 3)
+    assert windows.shape == (3, 3)
+    assert np.shares_memory(windows, values)
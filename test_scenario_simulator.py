@@ -0,0 +1,45 @@
+"""
+Tests for the batched Monte Carlo scenario simulator
+Run with: python -m pytest test_scenario_simulator.py
+"""
+
+import numpy as np
+import pytest
+from data_extractor import FinancialDataExtractor
+from scenario_simulator import PERCENTILES, SIMULATED_METRICS, run_scenarios, simulate
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return FinancialDataExtractor(EXCEL_FILE).extract_panel()
+
+
+def _same(first, second):
+    return all(np.array_equal(first.bands[m], second.bands[m], equal_nan=True) for m in SIMULATED_METRICS)
+
+
+def test_fixed_seed_is_deterministic(panel):
+    first = run_scenarios(panel, 'kaynes', n_paths=4000, batch_size=1000, seed=7)
+    second = run_scenarios(panel, 'kaynes', n_paths=4000, batch_size=1000, seed=7)
+    assert _same(first, second)
+    assert not _same(first, run_scenarios(panel, 'kaynes', n_paths=4000, batch_size=1000, seed=8))
+
+
+def test_worker_processes_match_in_process(panel):
+    in_process = run_scenarios(panel, 'bel', n_paths=3000, batch_size=1000, seed=3)
+    assert _same(in_process, run_scenarios(panel, 'bel', n_paths=3000, batch_size=1000, seed=3, workers=2))
+
+
+def test_bands_stream_at_doubling_batch_counts(panel):
+    results = list(simulate(panel, 'kaynes', n_paths=5500, batch_size=500))
+    assert [r.paths for r in results] == [500, 1000, 2000, 4000, 5500]
+    final = results[-1]
+    last_year = panel.company_years('kaynes')[-1]
+    assert final.years == (last_year + 1, last_year + 2, last_year + 3)
+    for metric in SIMULATED_METRICS:
+        band = final.bands[metric]
+        assert band.shape == (len(PERCENTILES), 3)
+        assert (np.diff(band, axis=0) >= 0).all(), metric
+
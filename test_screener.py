@@ -0,0 +1,78 @@
+"""
+Tests for query parsing, range predicates and ranking in the screener
+Run with: python -m pytest test_screener.py
+"""
+
+import numpy as np
+import pytest
+from screener import Condition, Screener, parse_query
+
+NAN = np.nan
+COMPANIES = ['a', 'b', 'c', 'd', 'e']
+
+
+@pytest.fixture
+def screener():
+    values = {
+        'current_ratio': np.array([[1.0, 1.2], [1.5, 2.0], [2.0, 1.5], [NAN, 3.0], [1.5, NAN]]),
+        'debt_to_equity': np.array([[0.2, 0.1], [0.8, 0.4], [0.4, 0.6], [0.1, 0.2], [0.3, 0.3]])
+    }
+    return Screener(values, COMPANIES, [2024, 2025])
+
+
+def test_parse_query_operators():
+    assert parse_query("current_ratio >= 1.5 and debt_to_equity < 0.5") == [
+        Condition('current_ratio', low=1.5, low_inclusive=True),
+        Condition('debt_to_equity', high=0.5)
+    ]
+    assert parse_query("x == -2") == [Condition('x', -2.0, -2.0, True, True)]
+    assert parse_query("revenue_cagr_3y > 20% AND y <= 3") == [
+        Condition('revenue_cagr_3y', low=20.0),
+        Condition('y', high=3.0, high_inclusive=True)
+    ]
+
+
+@pytest.mark.parametrize('expression', ['current_ratio > ', 'current_ratio => 1', '1.5 < current_ratio',
+                                        'current_ratio > 1 or x < 2', 'current_ratio > 1 and'])
+def test_parse_query_rejects_bad_clauses(expression):
+    with pytest.raises(ValueError):
+        parse_query(expression)
+
+
+def test_where_bounds(screener):
+    positions = lambda expression, year=2024: list(screener.where(parse_query(expression)[0], year))
+    assert positions("current_ratio > 1.5") == [2]
+    assert positions("current_ratio >= 1.5") == [1, 2, 4]
+    assert positions("current_ratio < 1.5") == [0]
+    assert positions("current_ratio <= 1.5") == [0, 1, 4]
+    assert positions("current_ratio == 1.5") == [1, 4]
+    # Missing values never match, and the latest year is the default
+    assert positions("current_ratio > 0", year=None) == [0, 1, 2, 3]
+
+
+def test_screen_intersects_conditions(screener):
+    assert screener.query("current_ratio >= 1.5 and debt_to_equity < 0.5", year=2024) == ['c', 'e']
+    assert screener.query("current_ratio > 10 and debt_to_equity < 0.5") == []
+    assert screener.query("", year=2024) == COMPANIES
+
+
+def test_top_and_query_ordering(screener):
+    assert [COMPANIES[i] for i in screener.top('current_ratio', 2)] == ['d', 'b']
+    assert [COMPANIES[i] for i in screener.top('debt_to_equity', 2, ascending=True)] == ['a', 'd']
+    # e passes the screen but has no 2025 current ratio to be ranked on
+    assert screener.query("debt_to_equity < 0.5", order_by='current_ratio') == ['d', 'b', 'a']
+    assert screener.query("debt_to_equity < 0.5", order_by='current_ratio', k=2, ascending=True) == ['a', 'b']
+    assert screener.query("", year=2024, order_by='current_ratio', k=3) == ['c', 'e', 'b']
+
+
+def test_indexes_are_built_up_front_and_read_only(screener):
+    order, ordered = screener.index('current_ratio', 2025)
+    assert list(order) == [0, 2, 1, 3] and list(ordered) == [1.2, 1.5, 2.0, 3.0]
+    assert not order.flags.writeable and not ordered.flags.writeable
+    with pytest.raises(KeyError):
+        screener.index('unknown_metric')
+
+
+def test_rejects_misshapen_metrics():
+    with pytest.raises(ValueError):
+        Screener({'x': np.zeros((2, 3))}, COMPANIES, [2024, 2025])
@@ -0,0 +1,77 @@
+"""
+Tests for the precomputed (year, company) dashboard bundles
+Run with: python -m pytest test_view_models.py
+"""
+
+import pickle
+import numpy as np
+import pytest
+from benchmark_profile import profiles_for_panel
+from data_extractor import FinancialDataExtractor
+from financial_calculator import FinancialCalculator
+from metric_graph import GRAPH_RATIOS
+from view_models import SCORECARD_ROWS, dashboard_views
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return FinancialDataExtractor(EXCEL_FILE).extract_panel()
+
+
+@pytest.fixture(scope='module')
+def views(panel):
+    return dashboard_views(panel)
+
+
+def test_unreported_year_raises_key_error(panel, views):
+    unreported = [y for y in panel.years if y not in panel.company_years('kaynes')]
+    assert unreported
+    with pytest.raises(KeyError, match=f"FY{unreported[0]}"):
+        views.get(unreported[0], 'kaynes')
+    assert 'kaynes' not in views.for_year(unreported[0])
+    assert 'bel' in views.for_year(unreported[0])
+
+
+def test_one_bundle_per_reported_year(panel, views):
+    assert len(views.views) == int(panel.mask.sum())
+
+
+def test_health_and_grades_match_the_calculator(panel, views):
+    profiles = profiles_for_panel(panel)
+    health = FinancialCalculator.calculate_health_scores(panel, profiles=profiles)['health']
+    for company in panel.companies:
+        c = panel.company_index[company]
+        for year in panel.company_years(company):
+            view = views.get(year, company)
+            assert view.health == round(float(health[c, panel.year_index[year]]), 2), (company, year)
+            for ratio in GRAPH_RATIOS:
+                grade = FinancialCalculator.grade_ratio(ratio, view.values[ratio], profile=profiles[c])
+                assert view.grades[ratio] == grade, (company, year, ratio)
+                assert view.colors[ratio] == FinancialCalculator.get_grade_color(grade)
+
+
+def test_deltas_and_scorecard_match_the_calculator(panel, views):
+    for company in panel.companies:
+        for year in panel.company_years(company):
+            view = views.get(year, company)
+            column = panel.year_column(year, newest_first=True)
+            for metric in ('sales_turnover', 'net_profit', 'current_ratio'):
+                newest_first = panel.series(company, metric)[::-1]
+                expected = FinancialCalculator.calculate_yoy_change(newest_first, column)
+                assert view.deltas[metric] == pytest.approx(expected, abs=1e-9), (company, year, metric)
+            for (_, metric, fmt), cell in zip(SCORECARD_ROWS, view.scorecard):
+                value = view.values.get(metric, np.nan)
+                assert cell == ("N/A" if np.isnan(value) else fmt.format(value))
+
+
+def test_bundles_are_read_only(views, panel):
+    view = views.get(panel.common_years[-1], 'bel')
+    with pytest.raises(TypeError):
+        view.values['sales_turnover'] = 0.0
+    assert not views.health.flags.writeable
+
+
+def test_cached_per_dataset_content(panel, views):
+    assert dashboard_views(pickle.loads(pickle.dumps(panel))) is views
@@ -0,0 +1,60 @@
+"""
+Tests for the streaming XLSX range reader against openpyxl
+Run with: python -m pytest test_xlsx_reader.py
+"""
+
+import io
+import openpyxl
+import pytest
+from workbook_layout import SHEET_NAME, required_cells
+from xlsx_reader import read_cells
+
+EXCEL_FILE = "Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx"
+
+
+@pytest.fixture(scope='module')
+def sheet():
+    workbook = openpyxl.load_workbook(EXCEL_FILE, data_only=True, read_only=True)
+    rows = {}
+    for row in workbook[SHEET_NAME].iter_rows():
+        for cell in row:
+            if getattr(cell, 'value', None) is not None:
+                rows[(cell.row, cell.column)] = cell.value
+    workbook.close()
+    return rows
+
+
+def _expected(value):
+    if isinstance(value, bool) or isinstance(value, str):
+        return value
+    return float(value)
+
+
+def test_layout_cells_match_openpyxl(sheet):
+    coordinates = required_cells()
+    cells = read_cells(EXCEL_FILE, SHEET_NAME, coordinates)
+    for coordinate in coordinates:
+        if coordinate in sheet:
+            assert cells[coordinate] == _expected(sheet[coordinate]), coordinate
+        else:
+            assert coordinate not in cells, coordinate
+
+
+def test_every_populated_cell_matches_openpyxl(sheet):
+    cells = read_cells(EXCEL_FILE, SHEET_NAME, sheet.keys())
+    assert cells.keys() == sheet.keys()
+    for coordinate, value in sheet.items():
+        assert cells[coordinate] == _expected(value), coordinate
+
+
+def test_file_object_source():
+    with open(EXCEL_FILE, 'rb') as stream:
+        upload = io.BytesIO(stream.read())
+    coordinates = [(10, 13), (97, 13), (7, 5)]
+    assert read_cells(upload, SHEET_NAME, coordinates) == read_cells(EXCEL_FILE, SHEET_NAME, coordinates)
+
+
+def test_empty_request_and_unknown_sheet():
+    assert read_cells(EXCEL_FILE, SHEET_NAME, []) == {}
+    with pytest.raises(KeyError):
+        read_cells(EXCEL_FILE, 'No Such Sheet', [(1, 1)])
@@ -0,0 +1,149 @@
+"""
+View Models
+Immutable per (year, company) display bundles, precomputed once per dataset
+"""
+
+import numpy as np
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+from benchmark_profile import BenchmarkProfile
+from financial_panel import FinancialPanel, cached_by_digest
+from metric_graph import GRAPH_RATIOS, build_metric_graph
+from narrative_engine import narrative_engine
+from rolling_analytics import yoy_change
+
+# Comparative scorecard rows: (label, metric, format); missing values show as N/A
+SCORECARD_ROWS = (
+    ('Current Ratio', 'current_ratio', '{:.2f}'),
+    ('Quick Ratio', 'quick_ratio', '{:.2f}'),
+    ('Debt-to-Equity', 'debt_to_equity', '{:.2f}'),
+    ('Times Interest Earned', 'times_interest_earned', '{:.2f}'),
+    ('Gross Profit Margin (%)', 'gross_profit_margin', '{:.2f}'),
+    ('Net Profit Margin (%)', 'net_profit_margin', '{:.2f}'),
+    ('Return on Assets (%)', 'return_on_assets', '{:.2f}'),
+    ('Asset Turnover', 'asset_turnover', '{:.2f}'),
+    ('Revenue (₹ Cr)', 'sales_turnover', '{:,.2f}'),
+    ('Net Profit (₹ Cr)', 'net_profit', '{:,.2f}'),
+    ('EPS (₹)', 'eps', '{:.2f}'),
+    ('Book Value (₹)', 'book_value', '{:.2f}')
+)
+
+# Metrics whose narrative sentences go into each bundle, in display order
+NARRATIVE_METRICS = ('current_ratio', 'debt_to_equity', 'net_profit_margin', 'asset_turnover')
+
+
+class CompanyYearView(NamedTuple):
+    """Everything the dashboard shows for one company in one fiscal year"""
+    company: str
+    year: int
+    # metric -> value (NaN when missing)
+    values: Mapping[str, float]
+    # metric -> YoY % change, 2 dp (0.0 without a prior value, as calculate_yoy_change)
+    deltas: Mapping[str, float]
+    # graded ratio -> A-F / N/A, and the grade's color
+    grades: Mapping[str, str]
+    colors: Mapping[str, str]
+    # Overall health score, 2 dp
+    health: float
+    # NARRATIVE_METRICS sentences (metrics without a prior year are skipped)
+    narratives: Tuple[str, ...]
+    # Formatted SCORECARD_ROWS cells
+    scorecard: Tuple[str, ...]
+
+
+def _format(fmt: str, value: float) -> str:
+    return "N/A" if np.isnan(value) else fmt.format(value)
+
+
+class DashboardViews:
+    """
+    Every reported (year, company) view of a panel, built in one pass
+
+    Deltas, grades, colors and health scores are computed over whole
+    (company, year) arrays first and then sliced into read-only bundles,
+    so a dashboard rerun only has to look one up. Grades and health come
+    from the metric graph with no what-if shocks; each company is graded
+    and scored on its sector's benchmark profile unless `profiles` (one
+    per company) says otherwise.
+    """
+
+    def __init__(self, panel: FinancialPanel, profiles: Optional[Sequence[BenchmarkProfile]] = None):
+        graph = build_metric_graph(panel, profiles)
+        results = graph.evaluate('profiles', 'health_score', *(f'grade:{ratio}' for ratio in GRAPH_RATIOS))
+        deltas = np.round(np.nan_to_num(yoy_change(panel.values)), 2)
+        graded = GRAPH_RATIOS
+        grades = {ratio: results[f'grade:{ratio}'] for ratio in graded}
+        colors = {ratio: BenchmarkProfile.color(grades[ratio]) for ratio in graded}
+        health = np.round(results['health_score'], 2)
+        health.setflags(write=False)
+        narratives = narrative_engine(panel)
+        narrative_metrics = [m for m in NARRATIVE_METRICS if m in panel.metric_index]
+
+        views: Dict[Tuple[int, str], CompanyYearView] = {}
+        for c, y in zip(*np.nonzero(panel.mask)):
+            company, year = panel.companies[c], panel.years[y]
+            values = dict(zip(panel.metrics, panel.values[c, :, y].tolist()))
+            views[(year, company)] = CompanyYearView(
+                company=company,
+                year=year,
+                values=MappingProxyType(values),
+                deltas=MappingProxyType(dict(zip(panel.metrics, deltas[c, :, y].tolist()))),
+                grades=MappingProxyType({ratio: grades[ratio][c, y] for ratio in graded}),
+                colors=MappingProxyType({ratio: colors[ratio][c, y] for ratio in graded}),
+                health=float(health[c, y]),
+                narratives=tuple(narratives.for_year(company, year, narrative_metrics)),
+                scorecard=tuple(_format(fmt, values.get(metric, np.nan)) for _, metric, fmt in SCORECARD_ROWS)
+            )
+
+        self.panel = panel
+        self.profiles = results['profiles']
+        # Overall health score per (company, year), 2 dp
+        self.health = health
+        self.views = MappingProxyType(views)
+
+    def get(self, year: int, company: str) -> CompanyYearView:
+        """Bundle for one company and fiscal year"""
+        try:
+            return self.views[(year, company)]
+        except KeyError:
+            raise KeyError(f"{company} did not report FY{year}") from None
+
+    def for_year(self, year: int) -> Mapping[str, CompanyYearView]:
+        """Company -> bundle for every company that reported a fiscal year"""
+        return MappingProxyType({
+            company: view for (y, company), view in self.views.items() if y == year
+        })
+
+
+@cached_by_digest()
+def dashboard_views(panel: FinancialPanel) -> DashboardViews:
+    """DashboardViews (sector profiles) cached per dataset content hash"""
+    return DashboardViews(panel)
+
+
+if __name__ == "__main__":
+    import time
+    from data_extractor import FinancialDataExtractor
+
+    panel = FinancialDataExtractor("Copy of Final_Financial_Data_Kaynes_Technology(1).xlsx").extract_panel()
+
+    start = time.perf_counter()
+    views = dashboard_views(panel)
+    build = (time.perf_counter() - start) * 1000
+    year = panel.common_years[-1]
+    start = time.perf_counter()
+    for _ in range(10000):
+        views.get(year, 'kaynes')
+    lookup = (time.perf_counter() - start) * 1000 / 10000
+
+    print("=" * 60)
+    print("VIEW MODELS")
+    print("=" * 60)
+    print(f"Built {len(views.views)} (year, company) bundles in {build:.1f} ms; "
+          f"lookup {lookup * 1000:.2f} µs")
+    for company, view in views.for_year(year).items():
+        print(f"\n{company} FY{year}: health {view.health}/100, "
+              f"revenue {view.values['sales_turnover']:,.2f} ({view.deltas['sales_turnover']:+.1f}% YoY)")
+        print(f"   Grades: {dict(view.grades)}")
+        for (label, _, _), cell in zip(SCORECARD_ROWS, view.scorecard):
+            print(f"   {label:25s} {cell}")
@@ -0,0 +1,315 @@
+"""
+Workbook Layout Map
+Declarative statement -> metric -> cell range map for the Moneycontrol 'Table 3' sheet
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, List, Tuple, Any
+
+# Bump whenever the extraction semantics change so cached datasets are rebuilt
+LAYOUT_VERSION = 1
+
+# Sheet holding both companies' statements
+SHEET_NAME = 'Table 3'
+
+# Multiplier applied to fraction-valued ratios so they match the dashboard's percent scale
+PERCENT = 100.0
+
+# Each metric maps to a single-row range ordered newest year first, e.g. 'E8:H8'.
+# A (range, scale) tuple multiplies every value in the range by scale.
+WORKBOOK_LAYOUT: Dict[str, Dict[str, Any]] = {
+    'kaynes': {
+        'company': 'Kaynes Technology India Ltd',
+        'ticker': 'KAYNES.NS',
+        'sector': 'Electronics Manufacturing',
+        'currency': 'INR',
+        # Fiscal year headers (Mar '25 ... Mar '22)
+        'years': 'E7:H7',
+        'statements': {
+            # Cash Flow Statement (Rows 8-14, Columns E-H)
+            'cash_flow': {
+                'net_profit_before_tax': 'E8:H8',
+                'operating_cash_flow': 'E9:H9',
+                'investing_cash_flow': 'E10:H10',
+                'financing_cash_flow': 'E11:H11',
+                'net_change_cash': 'E12:H12',
+                'opening_cash': 'E13:H13',
+                'closing_cash': 'E14:H14'
+            },
+            # Profit & Loss Statement (Rows 10-39, Columns M-P)
+            'income_statement': {
+                'total_income': 'M15:P15',
+                'sales_turnover': 'M10:P10',
+                'stock_adjustments': 'M14:P14',
+                'raw_materials': 'M17:P17',
+                'power_fuel': 'M18:P18',
+                'employee_cost': 'M19:P19',
+                'selling_admin': 'M21:P21',
+                'misc_expenses': 'M22:P22',
+                'total_expenses': 'M24:P24',
+                'operating_profit': 'M28:P28',
+                'pbdit': 'M29:P29',
+                'interest': 'M30:P30',
+                'pbdt': 'M31:P31',
+                'depreciation': 'M32:P32',
+                'profit_before_tax': 'M34:P34',
+                'tax': 'M37:P37',
+                'net_profit': 'M38:P38',
+                'total_value_addition': 'M39:P39'
+            },
+            # Balance Sheet (Rows 10-43, Columns T-W)
+            'balance_sheet': {
+                'secured_loans': 'T16:W16',
+                'reserves_surplus': 'T14:W14',
+                'total_share_capital': 'T10:W10',
+                'equity_share_capital': 'T11:W11',
+                'networth': 'T15:W15',
+                'total_debt': 'T18:W18',
+                'total_liabilities': 'T19:W19',
+                'gross_block': 'T23:W23',
+                'accumulated_depreciation': 'T25:W25',
+                'net_block': 'T26:W26',
+                'capital_wip': 'T27:W27',
+                'investments': 'T28:W28',
+                'inventories': 'T29:W29',
+                'sundry_debtors': 'T30:W30',
+                'cash_bank': 'T31:W31',
+                'current_assets': 'T32:W32',
+                'loans_advances': 'T33:W33',
+                'current_liabilities': 'T37:W37',
+                'provisions': 'T38:W38',
+                'net_current_assets': 'T40:W40',
+                'total_assets': 'T42:W42',
+                'contingent_liabilities': 'T43:W43'
+            },
+            # Per Share Data (Rows 44-47, Columns M-P)
+            'per_share': {
+                'shares_lakhs': 'M44:P44',
+                'eps': 'M45:P45',
+                'dividend_percent': 'M46:P46',
+                'book_value': 'M47:P47'
+            },
+            # Financial Ratios (Rows 58-78, Columns G-J; DuPont Rows 73-74, Columns N-Q)
+            'ratios': {
+                'current_ratio': 'G58:J58',
+                'quick_ratio': 'G59:J59',
+                'cash_ratio': 'G60:J60',
+                'debt_to_equity': 'G63:J63',
+                'debt_ratio': 'G64:J64',
+                'times_interest_earned': 'G65:J65',
+                'gross_profit_margin': ('G69:J69', PERCENT),
+                'operating_profit_margin': ('G70:J70', PERCENT),
+                'net_profit_margin': ('G71:J71', PERCENT),
+                'return_on_assets': ('G72:J72', PERCENT),
+                'inventory_turnover': 'G75:J75',
+                'receivables_turnover': 'G76:J76',
+                'payables_turnover': 'G77:J77',
+                'asset_turnover': 'G78:J78',
+                'tax_burden': 'N73:Q73',
+                'interest_burden': 'N74:Q74'
+            }
+        }
+    },
+    'bel': {
+        'company': 'Bharat Electronics Ltd',
+        'ticker': 'BEL.NS',
+        'sector': 'Defense Electronics',
+        'currency': 'INR',
+        # Fiscal year headers (Mar '25 ... Mar '21)
+        'years': 'F95:J95',
+        'statements': {
+            # Cash Flow Statement (Rows 133-139, Columns F-J)
+            'cash_flow': {
+                'net_profit_before_tax': 'F133:J133',
+                'operating_cash_flow': 'F134:J134',
+                'investing_cash_flow': 'F135:J135',
+                'financing_cash_flow': 'F136:J136',
+                'net_change_cash': 'F137:J137',
+                'opening_cash': 'F138:J138',
+                'closing_cash': 'F139:J139'
+            },
+            # Profit & Loss Statement (Rows 97-120, Columns M-Q)
+            'income_statement': {
+                'sales_turnover': 'M97:Q97',
+                'stock_adjustments': 'M100:Q100',
+                'raw_materials': 'M103:Q103',
+                'power_fuel': 'M104:Q104',
+                'employee_cost': 'M105:Q105',
+                'selling_admin': 'M106:Q106',
+                'misc_expenses': 'M107:Q107',
+                'total_expenses': 'M108:Q108',
+                'operating_profit': 'M110:Q110',
+                'pbdit': 'M111:Q111',
+                'interest': 'M112:Q112',
+                'pbdt': 'M113:Q113',
+                'depreciation': 'M114:Q114',
+                'profit_before_tax': 'M115:Q115',
+                'tax': 'M117:Q117',
+                'net_profit': 'M118:Q118',
+                'total_value_addition': 'M119:Q119',
+                'equity_dividend': 'M120:Q120'
+            },
+            # Balance Sheet (Rows 98-122, Columns F-J)
+            'balance_sheet': {
+                'total_share_capital': 'F98:J98',
+                'equity_share_capital': 'F99:J99',
+                'reserves': 'F100:J100',
+                'networth': 'F101:J101',
+                'total_liabilities': 'F102:J102',
+                'gross_block': 'F106:J106',
+                'accumulated_depreciation': 'F107:J107',
+                'net_block': 'F108:J108',
+                'capital_wip': 'F109:J109',
+                'investments': 'F110:J110',
+                'inventories': 'F111:J111',
+                'sundry_debtors': 'F112:J112',
+                'cash_bank': 'F113:J113',
+                'current_assets': 'F114:J114',
+                'loans_advances': 'F115:J115',
+                'current_liabilities': 'F117:J117',
+                'provisions': 'F118:J118',
+                'total_cl_provisions': 'F119:J119',
+                'net_current_assets': 'F120:J120',
+                'total_assets': 'F121:J121',
+                'contingent_liabilities': 'F122:J122'
+            },
+            # Per Share Data (Rows 122-125, Columns M-Q)
+            'per_share': {
+                'shares_lakhs': 'M122:Q122',
+                'eps': 'M123:Q123',
+                'dividend_percent': 'M124:Q124',
+                'book_value': 'M125:Q125'
+            },
+            # Financial Ratios (Rows 152-172, Columns F-J; DuPont Rows 150-167, Columns N-R)
+            'ratios': {
+                'current_ratio': 'F152:J152',
+                'quick_ratio': 'F153:J153',
+                'cash_ratio': 'F154:J154',
+                'debt_to_equity': 'F157:J157',
+                'debt_ratio': 'F158:J158',
+                'times_interest_earned': 'F159:J159',
+                'gross_profit_margin': ('F163:J163', PERCENT),
+                'operating_profit_margin': ('F164:J164', PERCENT),
+                'net_profit_margin': ('F165:J165', PERCENT),
+                'return_on_assets': ('F166:J166', PERCENT),
+                'inventory_turnover': 'F169:J169',
+                'receivables_turnover': 'F170:J170',
+                'payables_turnover': 'F171:J171',
+                'asset_turnover': 'F172:J172',
+                'equity_multiplier': 'N165:R165',
+                'tax_burden': 'N166:R166',
+                'interest_burden': 'N167:R167',
+                'roe_3point': 'N150:R150',
+                'roe_5point': 'N154:R154'
+            }
+        }
+    }
+}
+
+_RANGE_PATTERN = re.compile(r'^([A-Z]+)(\d+):([A-Z]+)(\d+)$')
+_NUMBER_PATTERN = re.compile(r'-?\d[\d,]*(?:\.\d+)?|-?\.\d+')
+_YEAR_PATTERN = re.compile(r'(\d{2}|\d{4})\s*$')
+
+
+def column_index(letters: str) -> int:
+    """Convert a column reference ('A', 'AB') to a 1-based index"""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - 64)
+    return index
+
+
+def parse_range(cell_range: str) -> Tuple[int, int, int]:
+    """Parse a single-row range like 'E8:H8' into (row, first_col, last_col)"""
+    match = _RANGE_PATTERN.match(cell_range.strip().upper())
+    if not match:
+        raise ValueError(f"Invalid cell range: {cell_range}")
+
+    first_col, first_row, last_col, last_row = match.groups()
+    if first_row != last_row:
+        raise ValueError(f"Layout ranges must span a single row: {cell_range}")
+
+    return int(first_row), column_index(first_col), column_index(last_col)
+
+
+def parse_spec(spec: Any) -> Tuple[str, float]:
+    """Normalize a metric spec to (range, scale)"""
+    if isinstance(spec, tuple):
+        return spec[0], float(spec[1])
+    return spec, 1.0
+
+
+def range_cells(cell_range: str) -> List[Tuple[int, int]]:
+    """List the (row, col) coordinates covered by a single-row range"""
+    row, first_col, last_col = parse_range(cell_range)
+    return [(row, col) for col in range(first_col, last_col + 1)]
+
+
+def required_cells(layout: Dict[str, Dict[str, Any]] = None) -> List[Tuple[int, int]]:
+    """Every (row, col) coordinate the layout reads, sorted in sheet order"""
+    if layout is None:
+        layout = WORKBOOK_LAYOUT
+
+    cells = set()
+    for company_layout in layout.values():
+        cells.update(range_cells(company_layout['years']))
+        for metrics in company_layout['statements'].values():
+            for spec in metrics.values():
+                cells.update(range_cells(parse_spec(spec)[0]))
+
+    return sorted(cells)
+
+
+def to_number(value: Any) -> Any:
+    """Coerce a raw cell value to float, or None when it holds no number"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    # Text cells such as "17,701.25\nMar'25" keep their leading number
+    match = _NUMBER_PATTERN.search(str(value))
+    if not match:
+        return None
+    return float(match.group(0).replace(',', ''))
+
+
+def to_fiscal_year(value: Any) -> int:
+    """Convert a year header such as "Mar '25" or 'Mar ’25' to 2025"""
+    if hasattr(value, 'year'):
+        return int(value.year)
+    if isinstance(value, (int, float)):
+        year = int(value)
+    else:
+        match = _YEAR_PATTERN.search(str(value).strip())
+        if not match:
+            raise ValueError(f"Unrecognized fiscal year header: {value!r}")
+        year = int(match.group(1))
+    return year + 2000 if year < 100 else year
+
+
+def validate_layout(layout: Dict[str, Dict[str, Any]] = None) -> None:
+    """Check that every metric range spans exactly one cell per fiscal year"""
+    if layout is None:
+        layout = WORKBOOK_LAYOUT
+
+    for company_key, company_layout in layout.items():
+        n_years = len(range_cells(company_layout['years']))
+        for statement, metrics in company_layout['statements'].items():
+            for metric, spec in metrics.items():
+                width = len(range_cells(parse_spec(spec)[0]))
+                if width != n_years:
+                    raise ValueError(
+                        f"{company_key}.{statement}.{metric} spans {width} cells, expected {n_years}"
+                    )
+
+
+def layout_fingerprint(layout: Dict[str, Dict[str, Any]] = None) -> str:
+    """Stable identifier for a layout: LAYOUT_VERSION plus a hash of its contents"""
+    if layout is None:
+        layout = WORKBOOK_LAYOUT
+
+    digest = hashlib.sha256(json.dumps(layout, sort_keys=True).encode('utf-8')).hexdigest()
+    return f"v{LAYOUT_VERSION}-{digest[:12]}"
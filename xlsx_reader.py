@@ -0,0 +1,162 @@
+"""
+Streaming XLSX Range Reader
+Decodes only the requested cells of one worksheet using iterparse,
+without loading the workbook through pandas/openpyxl
+"""
+
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse, parse
+from typing import Any, BinaryIO, Dict, Iterable, Tuple, Union
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_DOC_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_CELL_REF = re.compile(r'^([A-Z]+)(\d+)$')
+
+Cell = Tuple[int, int]
+
+
+def _split_ref(ref: str) -> Cell:
+    """Split an 'E8' style reference into 1-based (row, col)"""
+    match = _CELL_REF.match(ref)
+    if not match:
+        raise ValueError(f"Invalid cell reference: {ref}")
+    col = 0
+    for char in match.group(1):
+        col = col * 26 + (ord(char) - 64)
+    return int(match.group(2)), col
+
+
+def _resolve_parts(archive: zipfile.ZipFile, sheet_name: str) -> Tuple[str, str]:
+    """Locate the worksheet and shared strings parts for a sheet name"""
+    workbook = parse(archive.open('xl/workbook.xml')).getroot()
+    rels = parse(archive.open('xl/_rels/workbook.xml.rels')).getroot()
+
+    targets = {}
+    shared_strings = 'xl/sharedStrings.xml'
+    for rel in rels.iter(f'{NS_PKG_REL}Relationship'):
+        target = rel.get('Target')
+        target = target.lstrip('/') if target.startswith('/') else posixpath.join('xl', target)
+        targets[rel.get('Id')] = target
+        if rel.get('Type', '').endswith('/sharedStrings'):
+            shared_strings = target
+
+    for sheet in workbook.iter(f'{NS_MAIN}sheet'):
+        if sheet.get('name') == sheet_name:
+            return targets[sheet.get(f'{NS_DOC_REL}id')], shared_strings
+
+    raise KeyError(f"Worksheet '{sheet_name}' not found")
+
+
+def _shared_string_text(si) -> str:
+    """Concatenate the plain and rich-text runs of an <si> entry, skipping phonetic hints"""
+    parts = []
+    for child in si:
+        if child.tag == f'{NS_MAIN}t':
+            parts.append(child.text or '')
+        elif child.tag == f'{NS_MAIN}r':
+            parts.extend(t.text or '' for t in child.iter(f'{NS_MAIN}t'))
+    return ''.join(parts)
+
+
+def _load_shared_strings(archive: zipfile.ZipFile, part: str, indices: Iterable[int]) -> Dict[int, str]:
+    """Stream sharedStrings.xml only as far as the highest index actually referenced"""
+    wanted = set(indices)
+    if not wanted or part not in archive.namelist():
+        return {}
+
+    last = max(wanted)
+    strings = {}
+    index = 0
+    with archive.open(part) as stream:
+        for _, elem in iterparse(stream, events=('end',)):
+            if elem.tag != f'{NS_MAIN}si':
+                continue
+            if index in wanted:
+                strings[index] = _shared_string_text(elem)
+            elem.clear()
+            if index >= last:
+                break
+            index += 1
+
+    return strings
+
+
+def read_cells(source: Union[str, BinaryIO], sheet_name: str,
+               coordinates: Iterable[Cell]) -> Dict[Cell, Any]:
+    """
+    Read selected (row, col) cells from one worksheet of an .xlsx file
+
+    `source` may be a path or a binary file object (e.g. an uploaded file).
+    Parsing stops as soon as the last requested row has been passed, and
+    shared strings are only decoded for text cells that were requested.
+    Numbers come back as float, booleans as bool, text as str; empty or
+    error cells are omitted from the result.
+    """
+    wanted = set(coordinates)
+    if not wanted:
+        return {}
+    last_row = max(row for row, _ in wanted)
+
+    cells: Dict[Cell, Any] = {}
+    pending_strings: Dict[Cell, int] = {}
+
+    with zipfile.ZipFile(source) as archive:
+        sheet_part, strings_part = _resolve_parts(archive, sheet_name)
+
+        with archive.open(sheet_part) as stream:
+            row = 0
+            col = 0
+            for event, elem in iterparse(stream, events=('start', 'end')):
+                tag = elem.tag
+
+                if tag == f'{NS_MAIN}row':
+                    if event == 'start':
+                        row = int(elem.get('r', row + 1))
+                        col = 0
+                        if row > last_row:
+                            break
+                    else:
+                        elem.clear()
+                    continue
+
+                if tag != f'{NS_MAIN}c' or event != 'end':
+                    continue
+
+                ref = elem.get('r')
+                if ref is not None:
+                    row, col = _split_ref(ref)
+                else:
+                    col += 1
+
+                if (row, col) not in wanted:
+                    continue
+
+                cell_type = elem.get('t', 'n')
+                if cell_type == 'inlineStr':
+                    text = ''.join(t.text or '' for t in elem.iter(f'{NS_MAIN}t'))
+                    cells[(row, col)] = text
+                    continue
+
+                value = elem.findtext(f'{NS_MAIN}v')
+                if value is None or cell_type == 'e':
+                    continue
+                if cell_type == 's':
+                    pending_strings[(row, col)] = int(value)
+                elif cell_type == 'b':
+                    cells[(row, col)] = value == '1'
+                elif cell_type in ('str', 'd'):
+                    cells[(row, col)] = value
+                else:
+                    cells[(row, col)] = float(value)
+
+        strings = _load_shared_strings(archive, strings_part, pending_strings.values())
+
+    for cell, index in pending_strings.items():
+        if index in strings:
+            cells[cell] = strings[index]
+
+    return cells